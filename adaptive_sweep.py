@@ -0,0 +1,308 @@
+"""
+Varredura adaptativa de domínio: refina só onde os resultados mudam
+Autor: Script automatizado
+Data: 2025
+
+Em vez de resolver todas as listas fixas do generate_meshes (20 valores de
+x_inlet, 18 de H_dom), começa com poucos casos e adiciona novos por bisseção
+apenas nos intervalos em que Cd / Cf / pressões de prova variam mais que um
+limite. Para quando o critério de independência de domínio
+(domain_convergence) é atendido e o intervalo em torno do domínio mínimo
+já está resolvido.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from domain_convergence import extract_quantities, convergence_error
+
+# Conjuntos iniciais (grossos) e parâmetro fixo de cada modo
+COARSE_X_INLET = [0.02, 0.08, 0.20, 0.40]
+COARSE_H_DOM = [0.03, 0.08, 0.16, 0.30]
+FIXED_H_DOM = 0.03
+FIXED_X_INLET = -0.07
+
+# Menor intervalo que ainda é dividido (mesma unidade dos tamanhos, m)
+MIN_STEP = 1e-3
+# Resolução do mesh_id (d[XXX]_H[YY] em cm): abaixo disso os casos colidem
+MESH_ID_STEP = 0.01
+
+
+def mesh_id_for(x_inlet, H_dom):
+    """Identificador de malha no padrão dos scripts (d[XXX]_H[YY])"""
+    return f"d{int(abs(x_inlet)*100):03d}_H{int(H_dom*100):02d}"
+
+
+def _relative_metrics(sizes, results, tol):
+    """
+    Variação relativa entre casos consecutivos e erro relativo de cada caso
+
+    O erro é o de convergence_error: em relação ao valor extrapolado ou, sem
+    extrapolação, ao caso maior seguinte. O maior caso só conta como dentro
+    da tolerância se a extrapolação funcionou ou se o último intervalo já
+    varia menos que tol.
+
+    Returns:
+        change: [intervalo] maior variação relativa entre os casos k e k+1
+        error: [caso] maior erro relativo
+        first_ok: índice do menor caso a partir do qual todos estão na
+                  tolerância (None se nenhum)
+    """
+    change = np.zeros(len(sizes) - 1)
+    error = np.zeros(len(sizes))
+
+    for name in results[0]:
+        Q = np.array([np.ravel(r[name]) for r in results], dtype=float)
+        usable = np.all(np.isfinite(Q), axis=0)
+        if not np.any(usable):
+            continue
+        Q = Q[:, usable]
+
+        err, scale = convergence_error(sizes, Q)
+        change = np.maximum(change, np.max(np.abs(np.diff(Q, axis=0)) / scale, axis=1))
+        error = np.maximum(error, np.max(err, axis=1))
+
+    ok = np.flip(np.logical_and.accumulate(np.flip(error <= tol)))
+    first_ok = int(np.argmax(ok)) if np.any(ok) else None
+    return change, error, first_ok
+
+
+def adaptive_sweep(evaluate, initial_sizes, threshold=0.01, tol=1e-3,
+                   max_cases=20, size_max=None, min_step=MIN_STEP, log=print):
+    """
+    Executa a varredura adaptativa
+
+    Args:
+        evaluate: função size -> (size_real, id, grandezas); grandezas é um
+                  dict nome -> array (ex.: {'Cd': ..., 'Cf': ..., 'P_probe': ...}).
+                  size_real é o tamanho efetivamente usado (após o ajuste à
+                  progressão geométrica) e id identifica casos repetidos.
+                  Retorna None se o caso falhou (malha ou solver); o
+                  tamanho é descartado.
+        initial_sizes: tamanhos de domínio iniciais (grossos)
+        threshold: variação relativa máxima aceita entre casos vizinhos
+        tol: tolerância do critério de independência de domínio
+        max_cases: número máximo de casos resolvidos
+        size_max: limite para estender o domínio se nenhum caso convergir
+        min_step: resolução dos tamanhos; intervalos mais estreitos que
+                  isso não são mais divididos (contam como resolvidos)
+        log: função de saída das mensagens
+
+    Returns:
+        dict com 'sizes', 'ids', 'results' (ordenados por tamanho),
+        'minimal_size', 'converged' e 'n_evaluations'
+    """
+    cases = {}
+
+    def run(size):
+        case = evaluate(size)
+        if case is None:
+            log(f"  ✗ tamanho {size:.4f}: caso falhou, descartado")
+            return None
+        size_real, case_id, quantities = case
+        if case_id in cases:
+            return False
+        cases[case_id] = (size_real, quantities)
+        log(f"  [{len(cases)}] {case_id}: tamanho = {size_real:.4f}")
+        return True
+
+    for size in initial_sizes:
+        if len(cases) >= max_cases:
+            break
+        run(size)
+
+    converged = False
+    tried = set()
+
+    while len(cases) < max_cases:
+        ordered = sorted(cases.items(), key=lambda item: item[1][0])
+        sizes = np.array([value[0] for _, value in ordered])
+        results = [value[1] for _, value in ordered]
+
+        if len(sizes) < 2:
+            break
+
+        change, error, first_ok = _relative_metrics(sizes, results, tol)
+
+        # Intervalos candidatos: o que contém a transição para "dentro da
+        # tolerância" e todos acima dela que ainda variam mais que o limite
+        candidates = []
+        if first_ok is None:
+            if size_max is not None and sizes[-1] < size_max:
+                candidates.append(('extend', min(size_max, sizes[-1] * 1.5)))
+        else:
+            if first_ok > 0:
+                candidates.append(('bisect', first_ok - 1))
+            for k in range(max(first_ok, 0), len(change)):
+                if change[k] > threshold:
+                    candidates.append(('bisect', k))
+
+        new_case = False
+        failed = False
+        for kind, value in candidates:
+            if kind == 'extend':
+                target = value
+            elif sizes[value + 1] - sizes[value] <= min_step:
+                continue  # intervalo já na resolução mínima
+            else:
+                target = 0.5 * (sizes[value] + sizes[value + 1])
+            key = round(float(target), 9)
+            if key in tried:
+                continue
+            tried.add(key)
+            added = run(target)
+            if added is None:
+                failed = True
+            elif added:
+                new_case = True
+                break
+
+        if not new_case:
+            # Intervalo que não pôde ser resolvido (caso falhou): não convergiu
+            converged = first_ok is not None and not failed
+            break
+
+    ordered = sorted(cases.items(), key=lambda item: item[1][0])
+    sizes = np.array([value[0] for _, value in ordered])
+    results = [value[1] for _, value in ordered]
+
+    minimal = None
+    if len(sizes) >= 2:
+        _, _, first_ok = _relative_metrics(sizes, results, tol)
+        if first_ok is not None:
+            minimal = float(sizes[first_ok])
+
+    return {
+        'sizes': sizes,
+        'ids': [case_id for case_id, _ in ordered],
+        'results': results,
+        'minimal_size': minimal,
+        'converged': converged and minimal is not None,
+        'n_evaluations': len(cases),
+    }
+
+
+def make_su2_evaluator(parameter, fixed_value, work_dir, gmsh_path):
+    """
+    Cria a função evaluate que gera a malha (GMSH), roda o SU2 e extrai as grandezas
+
+    Args:
+        parameter: 'x_inlet' (choice '1' do generate_meshes) ou 'H_dom' (choice '2')
+        fixed_value: valor do outro parâmetro
+        work_dir: diretório das malhas e resultados
+        gmsh_path: executável do GMSH
+
+    A função retorna None quando a malha não é gerada ou o SU2 falha.
+    """
+    from generate_meshes import create_geo_file, generate_mesh
+    from run_su2_batch import process_single_mesh
+    from artifact_store import artifact_exists
+
+    choice = '1' if parameter == 'x_inlet' else '2'
+    geo_file = os.path.join(work_dir, 'placa_adaptive.geo')
+
+    def evaluate(size):
+        if parameter == 'x_inlet':
+            x_inlet, H_dom = -abs(size), fixed_value
+        else:
+            x_inlet, H_dom = fixed_value, size
+
+        x_final, H_final = create_geo_file(x_inlet, H_dom, geo_file, choice)
+        case_id = mesh_id_for(x_final, H_final)
+        size_real = abs(x_final) if parameter == 'x_inlet' else H_final
+
+        history = os.path.join(work_dir, f'history_{case_id}.csv')
+        if not artifact_exists(history):
+            mesh_file = os.path.join(work_dir, f'mesh_{case_id}.su2')
+            if not os.path.exists(mesh_file) and not generate_mesh(geo_file, mesh_file, gmsh_path):
+                return None
+            if not process_single_mesh((mesh_file, work_dir))['success']:
+                return None
+
+        surface = os.path.join(work_dir, f'surface_flow_{case_id}.vtu')
+        flow = os.path.join(work_dir, f'flow_{case_id}.vtu')
+        catalog = [{
+            'mesh_id': case_id,
+            'x_inlet': x_final,
+            'H_dom': H_final,
+            'history': history,
+            'surface': surface if artifact_exists(surface) else None,
+            'flow': flow if artifact_exists(flow) else None,
+        }]
+        quantities = {name: values[0] for name, values in extract_quantities(catalog).items()}
+        return size_real, case_id, quantities
+
+    return evaluate
+
+
+def main():
+    """Função principal - varredura adaptativa de x_inlet ou H_dom"""
+    from generate_meshes import find_gmsh, DIR_HORIZONTAL, DIR_VERTICAL
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "VARREDURA ADAPTATIVA DE DOMÍNIO")
+    print("=" * 70 + "\n")
+
+    gmsh_path = find_gmsh()
+    if gmsh_path is None:
+        print("✗ GMSH não encontrado! Forneça o caminho:")
+        gmsh_path = input("Caminho do gmsh.exe: ").strip().strip('"')
+        if not os.path.exists(gmsh_path):
+            print("Arquivo não encontrado!")
+            return
+
+    print("Escolha o parâmetro:")
+    print(f"1. Variar x_inlet (H_dom fixo em {FIXED_H_DOM})")
+    print(f"2. Variar H_dom (x_inlet fixo em {FIXED_X_INLET})")
+    choice = input("\nEscolha (1-2): ").strip()
+
+    if choice == '1':
+        parameter, fixed, initial, work_dir = 'x_inlet', FIXED_H_DOM, COARSE_X_INLET, DIR_HORIZONTAL
+    elif choice == '2':
+        parameter, fixed, initial, work_dir = 'H_dom', FIXED_X_INLET, COARSE_H_DOM, DIR_VERTICAL
+    else:
+        print("Opção inválida!")
+        return
+
+    threshold_str = input("Variação relativa máxima entre vizinhos [padrão: 0.01]: ").strip()
+    tol_str = input("Tolerância de independência [padrão: 0.001]: ").strip()
+    threshold = float(threshold_str) if threshold_str else 0.01
+    tol = float(tol_str) if tol_str else 1e-3
+
+    if not os.path.exists(work_dir):
+        os.makedirs(work_dir)
+
+    print(f"\nCasos iniciais: {initial}")
+    print(f"Diretório de trabalho: {work_dir}")
+    response = input("\nIniciar varredura adaptativa? (s/n): ").strip().lower()
+    if response != 's':
+        print("Operação cancelada.")
+        return
+
+    start_time = time.time()
+    evaluate = make_su2_evaluator(parameter, fixed, work_dir, gmsh_path)
+    result = adaptive_sweep(evaluate, initial, threshold=threshold, tol=tol,
+                            size_max=max(initial) * 2, min_step=MESH_ID_STEP)
+    total_time = time.time() - start_time
+
+    print(f"\n{'='*70}")
+    print("RELATÓRIO FINAL")
+    print(f"{'='*70}")
+    print(f"Casos resolvidos: {result['n_evaluations']}")
+    for case_id, size in zip(result['ids'], result['sizes']):
+        print(f"  • {case_id}: {size:.4f}")
+
+    if result['minimal_size'] is not None:
+        status = "✓" if result['converged'] else "⚠"
+        print(f"\n{status} Domínio mínimo: |{parameter}| = {result['minimal_size']:.4f} m")
+    else:
+        print("\n✗ Critério de independência não atendido: aumente o domínio")
+
+    print(f"Tempo total: {total_time:.1f}s ({total_time/60:.1f} minutos)")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Ponto de entrada único dos scripts do estudo paramétrico
+Autor: Script automatizado
+Data: 2025
+
+Mostra um menu com todas as operações (ou executa direto a que for passada
+na linha de comando). Nenhuma biblioteca pesada (pandas, matplotlib, scipy,
+vtk) é importada aqui: o módulo da operação escolhida só é carregado depois
+da escolha, e os próprios scripts importam essas bibliotecas dentro das
+funções que as usam. Sair do menu é instantâneo.
+
+Uso:
+    python aed_cli.py                      # menu
+    python aed_cli.py pressao              # executa direto
+    python aed_cli.py estatisticas flow_d016_H03.vtu --columns Pressure
+    python aed_cli.py lote simular --dir malhas/ --workers 4   # sem interação
+"""
+
+import sys
+import importlib
+
+# Operação -> (módulo:função, descrição); os argumentos seguintes são
+# repassados ao script como se ele tivesse sido chamado diretamente
+COMMANDS = {
+    'malhas': ('generate_meshes:main', "Gerar malhas (GMSH)"),
+    'qualidade': ('mesh_quality:main', "Verificar qualidade das malhas"),
+    'simular': ('run_su2_batch:main', "Executar SU2 em lote"),
+    'estudo': ('run_parametric_study:main', "Estudo paramétrico completo"),
+    'adaptativo': ('adaptive_sweep:main', "Varredura adaptativa (surrogate)"),
+    'solver': ('solver_sweep:main', "Varredura de parâmetros do solver"),
+    'fila': ('work_queue:main', "Fila de trabalho compartilhada"),
+    'analisar': ('analyze_results:main', "Análise de convergência"),
+    'pressao': ('compare_pressure:main', "Comparação de pressão entre casos"),
+    'exemplos': ('exemplo_comparacao:main', "Exemplos de comparação"),
+    'blasius': ('blasius:main', "Comparação do Cf com Blasius"),
+    'perfis': ('velocity_profiles:main', "Perfis de velocidade"),
+    'dominio': ('domain_convergence:main', "Convergência com o domínio"),
+    'estatisticas': ('vtu_stream:main', "Estatísticas em blocos de um VTU"),
+    'desempenho': ('solver_profiler:main', "Relatório de desempenho do SU2"),
+    'arquivar': ('artifact_store:main', "Arquivar/extrair resultados"),
+    'executaveis': ('find_executables:main', "Localizar GMSH e SU2"),
+    'ferramentas': ('tool_registry:main', "Registro de executáveis (GMSH, SU2, mpirun)"),
+    'lote': ('batch_cli:main', "Etapas sem interação (JSON-lines)"),
+}
+
+
+def resolve(command):
+    """Função main do script de uma operação (importa o módulo só agora)"""
+    module_name, func_name = COMMANDS[command][0].split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def run(command, args=()):
+    """Executa uma operação com os argumentos dados (sys.argv do script)"""
+    module_name = COMMANDS[command][0].split(':')[0]
+    sys.argv = [f"{module_name}.py"] + list(args)
+    return resolve(command)()
+
+
+def menu():
+    """Menu interativo; retorna a operação escolhida ou None"""
+    print("\n" + "=" * 70)
+    print(" " * 15 + "ESTUDO PARAMÉTRICO - PLACA PLANA (SU2)")
+    print("=" * 70 + "\n")
+
+    names = list(COMMANDS)
+    for k, name in enumerate(names, 1):
+        print(f"  {k:2d}. {COMMANDS[name][1]:<40} ({name})")
+    print("   0. Sair")
+
+    choice = input(f"\nEscolha (0-{len(names)}): ").strip()
+    if choice in ('0', ''):
+        return None
+    if choice in COMMANDS:
+        return choice
+    if choice.isdigit() and 1 <= int(choice) <= len(names):
+        return names[int(choice) - 1]
+    print("Opção inválida!")
+    return None
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] in ('-h', '--help'):
+        print(__doc__)
+        return
+
+    if args:
+        command = args[0]
+        if command not in COMMANDS:
+            print(f"✗ Operação desconhecida: {command}")
+            print(f"  Disponíveis: {', '.join(COMMANDS)}")
+            sys.exit(2)
+        args = args[1:]
+    else:
+        command = menu()
+        if command is None:
+            print("Encerrando...")
+            return
+
+    run(command, args)
+
+
+if __name__ == "__main__":
+    main()
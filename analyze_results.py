@@ -11,16 +11,15 @@ Funções:
 """
 
 import os
-import glob
-import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
 
+from sweep_journal import journal_path, load_journal, record_state
+
 def find_history_files():
-    """Encontra todos os arquivos de histórico"""
-    history_files = glob.glob('history_d*.csv')
-    history_files.sort()
-    return history_files
+    """Encontra todos os arquivos de histórico (inclusive os arquivados em .aedz)"""
+    from artifact_store import find_artifacts
+
+    return find_artifacts('history_d*.csv')
 
 def parse_mesh_id(filename):
     """Extrai parâmetros do nome do arquivo"""
@@ -41,9 +40,13 @@ def parse_mesh_id(filename):
 
 def load_history(filename):
     """Carrega arquivo de histórico do SU2"""
+    import pandas as pd
+    from artifact_store import open_artifact
+
     try:
         # SU2 CSV pode ter diferentes formatos
-        df = pd.read_csv(filename)
+        with open_artifact(filename) as f:
+            df = pd.read_csv(f)
         
         # Remove espaços nos nomes das colunas
         df.columns = df.columns.str.strip()
@@ -55,7 +58,8 @@ def load_history(filename):
 
 def plot_convergence_individual(history_files):
     """Plota convergência individual de cada caso"""
-    
+    import matplotlib.pyplot as plt
+
     print("\n" + "="*70)
     print("GRÁFICOS DE CONVERGÊNCIA INDIVIDUAL")
     print("="*70 + "\n")
@@ -134,7 +138,8 @@ def plot_convergence_individual(history_files):
 
 def compare_cases(history_files, parameter='d_inlet'):
     """Compara diferentes casos variando um parâmetro"""
-    
+    import matplotlib.pyplot as plt
+
     print("\n" + "="*70)
     print(f"COMPARAÇÃO DE CASOS - Variando {parameter}")
     print("="*70 + "\n")
@@ -234,7 +239,8 @@ def compare_cases(history_files, parameter='d_inlet'):
 
 def generate_summary_table(history_files):
     """Gera tabela resumo com resultados finais"""
-    
+    import pandas as pd
+
     print("\n" + "="*70)
     print("TABELA RESUMO DOS RESULTADOS")
     print("="*70 + "\n")
@@ -266,6 +272,13 @@ def generate_summary_table(history_files):
             'Iterações': int(last_row[df.columns[0]]) if len(df.columns) > 0 else "N/A"
         })
     
+    # Casos resumidos passam a 'analysed' no diário da varredura (se houver)
+    if os.path.exists(journal_path('.')):
+        journal = load_journal('.')
+        for row in summary:
+            if journal.get(row['Caso'], {}).get('state') == 'solved':
+                record_state('.', row['Caso'], 'analysed')
+    
     # Cria DataFrame e exibe
     df_summary = pd.DataFrame(summary)
     print(df_summary.to_string(index=False))
@@ -277,6 +290,38 @@ def generate_summary_table(history_files):
     
     return df_summary
 
+# Análises disponíveis (na ordem em que são executadas) e opções do menu
+ACTIONS = ('convergencia', 'd_inlet', 'H_dom', 'tabela')
+MENU = {'1': ('convergencia',), '2': ('d_inlet',), '3': ('H_dom',), '4': ('tabela',), '5': ACTIONS}
+
+def run_analyses(history_files, actions=ACTIONS):
+    """
+    Executa as análises pedidas sobre os históricos
+    
+    Args:
+        actions: nomes de ACTIONS ('convergencia', 'd_inlet', 'H_dom', 'tabela')
+    
+    Returns:
+        DataFrame da tabela resumo ('tabela'), ou None
+    """
+    unknown = set(actions) - set(ACTIONS)
+    if unknown:
+        raise ValueError(f"Análise desconhecida: {', '.join(sorted(unknown))} "
+                         f"(disponíveis: {', '.join(ACTIONS)})")
+    
+    if 'convergencia' in actions:
+        plot_convergence_individual(history_files)
+    
+    if 'd_inlet' in actions:
+        compare_cases(history_files, parameter='d_inlet')
+    
+    if 'H_dom' in actions:
+        compare_cases(history_files, parameter='H_dom')
+    
+    if 'tabela' in actions:
+        return generate_summary_table(history_files)
+    return None
+
 def main():
     """Função principal"""
     
@@ -306,17 +351,7 @@ def main():
     
     choice = input("\nEscolha (1-5): ").strip()
     
-    if choice == '1' or choice == '5':
-        plot_convergence_individual(history_files)
-    
-    if choice == '2' or choice == '5':
-        compare_cases(history_files, parameter='d_inlet')
-    
-    if choice == '3' or choice == '5':
-        compare_cases(history_files, parameter='H_dom')
-    
-    if choice == '4' or choice == '5':
-        generate_summary_table(history_files)
+    run_analyses(history_files, MENU.get(choice, ()))
     
     print("\n" + "="*70)
     print("✓ Análise concluída!")
@@ -0,0 +1,503 @@
+"""
+Arquivamento comprimido dos resultados dos casos (flow, surface, restart, history)
+Autor: Script automatizado
+Data: 2025
+
+Cada arquivo de resultado vira um único arquivo [nome].aedz, dividido em
+blocos comprimidos independentes (zstd se o pacote 'zstandard' estiver
+instalado, senão zlib; lzma opcional). O índice no fim do arquivo diz onde
+está cada bloco, então a leitura descomprime só o que foi pedido:
+
+- VTU no formato "appended" raw (SU2): cada DataArray é uma entrada
+  separada, com tipo e forma. O read_vtu.py lê o .aedz diretamente e
+  descomprime só as colunas pedidas. Arrays de ponto flutuante passam por
+  "byte shuffle" antes da compressão (bytes de mesma significância juntos),
+  o que melhora bastante a razão de compressão.
+- Outros arquivos (restart, history): blocos do conteúdo original.
+
+O conteúdo original é recuperado byte a byte (verificado por sha1), com a
+mesma data de modificação, pelo extract.
+
+Uso:
+    python artifact_store.py archive <diretório> [--remove] [--codec zlib|lzma|zstd]
+    python artifact_store.py extract <arquivo.aedz> [...]
+    python artifact_store.py list <arquivo.aedz>
+"""
+
+import os
+import io
+import sys
+import json
+import lzma
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_SUFFIX = ".aedz"
+CHUNK_SIZE = 1 << 22  # 4 MiB (múltiplo de 8: os blocos não cortam valores)
+DEFAULT_LEVELS = {'zstd': 3, 'zlib': 6, 'lzma': 6}
+
+_MAGIC = b'AEDZ1\n'
+_END = b'AEDZEND\n'
+_TRAILER = struct.Struct('<Q8s')  # tamanho do índice + marcador final
+
+
+# ============================================================================
+# CODECS
+# ============================================================================
+
+def available_codecs():
+    return ('zstd', 'zlib', 'lzma') if zstandard is not None else ('zlib', 'lzma')
+
+
+def default_codec():
+    return 'zstd' if zstandard is not None else 'zlib'
+
+
+def _compressor(codec, level):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("codec zstd requer o pacote 'zstandard' (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=level).compress
+    if codec == 'zlib':
+        return lambda data: zlib.compress(data, level)
+    if codec == 'lzma':
+        return lambda data: lzma.compress(data, preset=level)
+    raise ValueError(f"Codec desconhecido: {codec}")
+
+
+def _decompressor(codec):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("arquivo comprimido com zstd: instale o pacote 'zstandard'")
+        decompressor = zstandard.ZstdDecompressor()
+        return lambda data, size: decompressor.decompress(data, max_output_size=size)
+    if codec == 'zlib':
+        return lambda data, size: zlib.decompress(data)
+    if codec == 'lzma':
+        return lambda data, size: lzma.decompress(data)
+    raise ValueError(f"Codec desconhecido: {codec}")
+
+
+def _shuffle(data, itemsize):
+    """Agrupa os bytes de mesma posição de cada valor (byte 0 de todos, byte 1...)"""
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(data, itemsize):
+    return np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1).T.tobytes()
+
+
+# ============================================================================
+# GRAVAÇÃO
+# ============================================================================
+
+class _Writer:
+    """Grava entradas em blocos comprimidos e monta o índice"""
+
+    def __init__(self, f, codec, level):
+        self.f = f
+        self.codec = codec
+        self.compress = _compressor(codec, level)
+        self.entries = {}
+        self.order = []
+
+    def add(self, name, data, dtype=None, shape=None, shuffle=False):
+        itemsize = np.dtype(dtype).itemsize if shuffle else 1
+        chunks = []
+        for start in range(0, len(data), CHUNK_SIZE):
+            raw = bytes(data[start:start + CHUNK_SIZE])
+            if itemsize > 1:
+                raw = _shuffle(raw, itemsize)
+            packed = self.compress(raw)
+            stored = len(packed) >= len(raw)
+            if stored:
+                packed = raw  # incompressível: guarda sem compressão
+            chunks.append([self.f.tell(), len(packed), len(raw), int(stored)])
+            self.f.write(packed)
+        self.entries[name] = {'size': len(data), 'dtype': dtype, 'shape': shape,
+                              'shuffle': itemsize, 'chunks': chunks}
+        self.order.append(name)
+
+
+def _vtu_segments(data, layout):
+    """
+    Divide um VTU appended raw em cabeçalho, blocos dos arrays e final
+
+    Returns:
+        lista de (nome, início, fim, array ou None) cobrindo o arquivo
+        inteiro, ou None se os blocos não forem contíguos
+    """
+    from read_vtu import array_key
+
+    header_bytes = layout['header_bytes']
+    size_dtype = '<u8' if header_bytes == 8 else '<u4'
+    segments = [('__prefix__', 0, layout['appended'], None)]
+    position = layout['appended']
+
+    for array in sorted(layout['arrays'], key=lambda a: a['offset']):
+        start = layout['appended'] + array['offset']
+        if start != position:
+            return None
+        nbytes = int(np.frombuffer(data, dtype=size_dtype, count=1, offset=start)[0])
+        segments.append((array_key(array), start + header_bytes,
+                         start + header_bytes + nbytes, array))
+        position = start + header_bytes + nbytes
+
+    segments.append(('__suffix__', position, len(data), None))
+    return segments
+
+
+def archive_file(path, codec=None, level=None, remove=False):
+    """
+    Comprime um arquivo de resultado em path + '.aedz'
+
+    Args:
+        codec: 'zstd', 'zlib' ou 'lzma' (padrão: zstd se disponível, senão zlib)
+        remove: apaga o original depois de conferir que o arquivo comprimido
+                reproduz o conteúdo byte a byte
+
+    Returns:
+        dict com archive, size, archived_size, ratio e time (s)
+    """
+    from read_vtu import parse_vtu_layout
+
+    codec = codec or default_codec()
+    level = DEFAULT_LEVELS[codec] if level is None else level
+    archive = path + ARCHIVE_SUFFIX
+    tmp = archive + '.tmp'
+    start_time = time.perf_counter()
+
+    st = os.stat(path)
+    with open(path, 'rb') as source, open(tmp, 'wb') as f:
+        data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b''
+        try:
+            layout = parse_vtu_layout(data) if path.endswith('.vtu') and st.st_size else None
+            segments = _vtu_segments(data, layout) if layout is not None else None
+            if segments is None:
+                layout = None
+
+            f.write(_MAGIC)
+            writer = _Writer(f, codec, level)
+            if layout is None:
+                writer.add('__data__', data)
+            else:
+                for name, begin, end, array in segments:
+                    if array is None:
+                        writer.add(name, data[begin:end])
+                        continue
+                    dtype = np.dtype(array['dtype'])
+                    count = (end - begin) // dtype.itemsize
+                    shape = [count // array['components'], array['components']] \
+                        if array['components'] > 1 else [count]
+                    writer.add(name, data[begin:end], dtype=array['dtype'], shape=shape,
+                               shuffle=dtype.kind == 'f')
+
+            index = {
+                'version': 1,
+                'codec': codec,
+                'level': level,
+                'source': os.path.basename(path),
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha1': hashlib.sha1(data).hexdigest(),
+                'layout': layout,
+                'entries': writer.entries,
+                'order': writer.order,
+            }
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+        encoded = zlib.compress(json.dumps(index).encode())
+        f.write(encoded)
+        f.write(_TRAILER.pack(len(encoded), _END))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, archive)
+
+    if remove:
+        with open_archive(archive) as check:
+            check.verify()
+        os.remove(path)
+
+    archived_size = os.path.getsize(archive)
+    return {
+        'archive': archive,
+        'size': st.st_size,
+        'archived_size': archived_size,
+        'ratio': st.st_size / archived_size if archived_size else np.nan,
+        'time': time.perf_counter() - start_time,
+    }
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+class ArtifactArchive:
+    """
+    Arquivo .aedz aberto para leitura sob demanda
+
+    Uso:
+        with open_archive('flow_d016_H03.vtu.aedz') as archive:
+            pressure = archive.array('PointData/Pressure')
+    """
+
+    __slots__ = ('path', 'index', '_file', '_decompress')
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            if self._file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} não é um arquivo {ARCHIVE_SUFFIX}")
+            self._file.seek(-_TRAILER.size, os.SEEK_END)
+            length, end = _TRAILER.unpack(self._file.read(_TRAILER.size))
+            if end != _END:
+                raise ValueError(f"{path} está incompleto (sem índice)")
+            self._file.seek(-_TRAILER.size - length, os.SEEK_END)
+            self.index = json.loads(zlib.decompress(self._file.read(length)))
+        except Exception:
+            self._file.close()
+            raise
+        self._decompress = _decompressor(self.index['codec'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def layout(self):
+        """Layout do VTU (read_vtu.parse_vtu_layout) ou None"""
+        return self.index['layout']
+
+    def names(self):
+        return [name for name in self.index['order'] if not name.startswith('__')]
+
+    def _chunks(self, name):
+        entry = self.index['entries'][name]
+        for offset, packed_size, size, stored in entry['chunks']:
+            self._file.seek(offset)
+            packed = self._file.read(packed_size)
+            raw = packed if stored else self._decompress(packed, size)
+            if entry['shuffle'] > 1:
+                raw = _unshuffle(raw, entry['shuffle'])
+            yield raw
+
+    def read_bytes(self, name):
+        """Conteúdo descomprimido de uma entrada"""
+        return b''.join(self._chunks(name))
+
+    def array(self, name):
+        """Array numpy de uma entrada com tipo (ex.: 'PointData/Pressure')"""
+        entry = self.index['entries'][name]
+        if entry['dtype'] is None:
+            raise KeyError(f"{name} não é um array")
+        return np.frombuffer(self.read_bytes(name), dtype=entry['dtype']).reshape(entry['shape'])
+
+    def iter_array(self, name, rows):
+        """
+        Array de uma entrada em blocos de `rows` linhas (o último pode ser menor)
+
+        Só um bloco de compressão (CHUNK_SIZE) e um bloco de linhas ficam em
+        memória; linhas cortadas entre blocos de compressão são emendadas.
+        """
+        entry = self.index['entries'][name]
+        if entry['dtype'] is None:
+            raise KeyError(f"{name} não é um array")
+        dtype = np.dtype(entry['dtype'])
+        shape = list(entry['shape'])
+        row_bytes = dtype.itemsize * int(np.prod(shape[1:], dtype=np.int64))
+        block_bytes = rows * row_bytes
+
+        pending = bytearray()
+        for raw in self._chunks(name):
+            pending += raw
+            while len(pending) >= block_bytes:
+                block = np.frombuffer(bytes(pending[:block_bytes]), dtype=dtype)
+                del pending[:block_bytes]
+                yield block.reshape([rows] + shape[1:])
+        if pending:
+            block = np.frombuffer(bytes(pending), dtype=dtype)
+            yield block.reshape([len(pending) // row_bytes] + shape[1:])
+
+    def iter_original(self):
+        """Conteúdo do arquivo original, em pedaços, na ordem"""
+        layout = self.layout
+        size_dtype = np.dtype('<u8' if layout and layout['header_bytes'] == 8 else '<u4')
+        for name in self.index['order']:
+            entry = self.index['entries'][name]
+            if entry['dtype'] is not None:
+                yield np.array([entry['size']], dtype=size_dtype).tobytes()
+            yield from self._chunks(name)
+
+    def verify(self):
+        """Confere o sha1 do conteúdo reconstruído (ValueError se diferente)"""
+        h = hashlib.sha1()
+        for piece in self.iter_original():
+            h.update(piece)
+        if h.hexdigest() != self.index['sha1']:
+            raise ValueError(f"{self.path}: conteúdo reconstruído difere do original")
+
+    def extract(self, output=None):
+        """Recria o arquivo original (mesmo conteúdo e data de modificação)"""
+        output = output or self.path[:-len(ARCHIVE_SUFFIX)]
+        h = hashlib.sha1()
+        tmp = output + '.tmp'
+        with open(tmp, 'wb') as f:
+            for piece in self.iter_original():
+                h.update(piece)
+                f.write(piece)
+        if h.hexdigest() != self.index['sha1']:
+            os.remove(tmp)
+            raise ValueError(f"{self.path}: conteúdo reconstruído difere do original")
+        os.replace(tmp, output)
+        os.utime(output, ns=(self.index['mtime_ns'], self.index['mtime_ns']))
+        return output
+
+
+def open_archive(path):
+    return ArtifactArchive(path)
+
+
+def archived_signature(path):
+    """(tamanho, mtime_ns) do original se path estiver arquivado, senão None"""
+    archive = path + ARCHIVE_SUFFIX
+    if not os.path.exists(archive):
+        return None
+    try:
+        with open_archive(archive) as a:
+            return a.index['size'], a.index['mtime_ns']
+    except (OSError, ValueError):
+        return None
+
+
+def artifact_exists(path):
+    """True se o arquivo existir, original ou arquivado ([nome].aedz)"""
+    return os.path.exists(path) or os.path.exists(path + ARCHIVE_SUFFIX)
+
+
+def find_artifacts(pattern):
+    """
+    Arquivos que casam com um padrão glob, originais ou arquivados
+
+    Returns:
+        nomes originais (sem .aedz), ordenados e sem repetição; os leitores
+        (open_artifact, read_vtu, read_restart) abrem o .aedz por esse nome
+    """
+    import glob
+
+    found = set(glob.glob(pattern))
+    found.update(path[:-len(ARCHIVE_SUFFIX)] for path in glob.glob(pattern + ARCHIVE_SUFFIX))
+    return sorted(found)
+
+
+def open_artifact(path):
+    """Arquivo binário para leitura: o original ou o conteúdo do .aedz"""
+    if os.path.exists(path):
+        return open(path, 'rb')
+    with open_archive(path + ARCHIVE_SUFFIX) as archive:
+        return io.BytesIO(b''.join(archive.iter_original()))
+
+
+# ============================================================================
+# CASOS E DIRETÓRIOS
+# ============================================================================
+
+def archive_case(output_dir, case_id, codec=None, remove=False):
+    """Arquiva os resultados existentes de um caso (nomes do sweep_journal.case_outputs)"""
+    from sweep_journal import case_outputs
+    return [archive_file(path, codec=codec, remove=remove)
+            for path in case_outputs(output_dir, case_id) if os.path.exists(path)]
+
+
+def completed_cases(directory):
+    """
+    Casos concluídos em um diretório
+
+    Usa o sweep_journal.jsonl quando existir (só casos com resultado
+    íntegro); senão, os IDs dos history_*.csv completos.
+    """
+    from sweep_journal import load_journal, resume_status, looks_complete
+
+    journal = load_journal(directory)
+    if journal:
+        status = resume_status(directory, sorted(journal))
+        return [case_id for case_id, (state, _) in status.items() if state == 'done']
+
+    cases = []
+    for path in find_artifacts(os.path.join(directory, 'history_*.csv')):
+        # Só casos concluídos são arquivados: o .aedz basta
+        if not os.path.exists(path) or looks_complete(path):
+            name = os.path.basename(path)
+            cases.append(name[len('history_'):-len('.csv')])
+    return cases
+
+
+def main():
+    """Linha de comando: archive / extract / list"""
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args or args[0] not in ('archive', 'extract', 'list'):
+        print(__doc__)
+        return
+
+    command = args[0]
+
+    if command == 'archive':
+        directory = args[1] if len(args) > 1 else '.'
+        codec = None
+        if '--codec' in sys.argv:
+            codec = sys.argv[sys.argv.index('--codec') + 1]
+            args = [a for a in args if a != codec]
+        remove = '--remove' in sys.argv
+
+        cases = completed_cases(directory)
+        print(f"Arquivando {len(cases)} caso(s) concluído(s) em {directory} "
+              f"(codec: {codec or default_codec()}, remover originais: {'sim' if remove else 'não'})")
+        total, archived = 0, 0
+        for case_id in cases:
+            for r in archive_case(directory, case_id, codec=codec, remove=remove):
+                total += r['size']
+                archived += r['archived_size']
+                print(f"  ✓ {os.path.basename(r['archive']):<40} {r['size'] / 1024**2:8.2f} MB → "
+                      f"{r['archived_size'] / 1024**2:8.2f} MB  ({r['ratio']:.1f}x)")
+        if total:
+            print(f"\n✓ Total: {total / 1024**2:.1f} MB → {archived / 1024**2:.1f} MB "
+                  f"({total / archived:.1f}x)")
+        else:
+            print("\n⚠ Nenhum arquivo para arquivar")
+
+    elif command == 'extract':
+        for path in args[1:]:
+            with open_archive(path) as archive:
+                print(f"  ✓ {archive.extract()}")
+
+    elif command == 'list':
+        with open_archive(args[1]) as archive:
+            index = archive.index
+            print(f"{index['source']}: {index['size'] / 1024**2:.2f} MB, codec {index['codec']}")
+            for name in index['order']:
+                entry = index['entries'][name]
+                packed = sum(c[1] for c in entry['chunks'])
+                print(f"  {name:<40} {entry['size']:>12} → {packed:>12} bytes"
+                      f"  {entry['dtype'] or ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""
+Execução em lote (sem interação) de todas as etapas do estudo
+Autor: Script automatizado
+Data: 2025
+
+Os scripts principais param em menus e confirmações (input()), o que
+impede encadeá-los em scripts ou rodá-los em filas de cluster. Aqui cada
+etapa é um subcomando com tudo dado por argumentos (varredura, diretório,
+número de processos, formato de saída) e o progresso sai como registros
+JSON-lines, um objeto por linha:
+
+    {"stage": "simular", "event": "start", "time": ..., "n_cases": 8, ...}
+    {"stage": "simular", "event": "case", "case_id": "d016_H03", "success": true, ...}
+    {"stage": "simular", "event": "summary", "n_cases": 8, "n_failed": 0, ...}
+    {"stage": "simular", "event": "error", "message": "..."}
+
+Com --format jsonl (padrão) e sem --output, stdout contém só os registros:
+as mensagens dos scripts e a saída do GMSH/SU2 vão para stderr.
+
+Código de saída: 0 se tudo deu certo, 1 se algum caso falhou ou a etapa não
+pôde rodar, 2 para argumentos inválidos.
+
+Uso:
+    python batch_cli.py malhas --mode horizontal [--x-inlet=-0.02,-0.04] [--h-dom 0.03] [--dir D]
+    python batch_cli.py simular --dir D [--workers 4] [--resume] [--archive]
+    python batch_cli.py estudo --mode matriz [--x-inlet=...] [--h-dom ...] [--dir D] [--resume]
+    python batch_cli.py analisar --dir D [--actions tabela,convergencia]
+    python batch_cli.py pressao --dir D [--no-plots]
+    (opções comuns: --format jsonl|text, --output registros.jsonl)
+
+Listas com valores negativos vão com '=' (--x-inlet=-0.02,-0.04), senão o
+argparse as confunde com uma opção.
+
+    python batch_cli.py malhas --mode vertical --dir malhas/ | python -c "..."
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import traceback
+
+MODES = ('horizontal', 'vertical', 'matriz')
+ANALYSES = ('convergencia', 'd_inlet', 'H_dom', 'tabela')
+
+
+# ============================================================================
+# REGISTROS
+# ============================================================================
+
+def _clean(value):
+    """Valor serializável em JSON estrito (numpy -> Python, NaN/inf -> null)"""
+    if isinstance(value, dict):
+        return {str(k): _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class RecordWriter:
+    """Escreve os registros de uma etapa (JSON-lines ou texto), um por linha"""
+
+    __slots__ = ('stage', 'format', 'stream')
+
+    def __init__(self, stage, fmt, stream):
+        self.stage = stage
+        self.format = fmt
+        self.stream = stream
+
+    def emit(self, event, **fields):
+        record = {'stage': self.stage, 'event': event, 'time': round(time.time(), 3)}
+        record.update(_clean(fields))
+        if self.format == 'jsonl':
+            line = json.dumps(record, ensure_ascii=False)
+        else:
+            line = f"[{self.stage}] {event}: " + ' '.join(
+                f"{k}={v}" for k, v in record.items() if k not in ('stage', 'event', 'time'))
+        self.stream.write(line + '\n')
+        self.stream.flush()
+        return record
+
+
+def open_records(args):
+    """
+    Destino dos registros
+
+    Com --output, o arquivo (acrescentando). Com jsonl em stdout, uma cópia
+    do stdout original; o descritor 1 passa a apontar para stderr, de modo
+    que prints dos scripts e processos filhos (GMSH, SU2, workers) não se
+    misturam aos registros.
+    """
+    if args.output:
+        return open(args.output, 'a', encoding='utf-8', buffering=1)
+    if args.format != 'jsonl':
+        return sys.stdout
+    sys.stdout.flush()
+    stream = os.fdopen(os.dup(1), 'w', encoding='utf-8', buffering=1)
+    os.dup2(2, 1)
+    return stream
+
+
+def _summary(out, results, start, **fields):
+    """Registro final da etapa; retorna o código de saída"""
+    n_failed = sum(1 for r in results if not r)
+    out.emit('summary', n_cases=len(results), n_success=len(results) - n_failed,
+             n_failed=n_failed, elapsed_s=round(time.time() - start, 3), **fields)
+    return 1 if n_failed else 0
+
+
+# ============================================================================
+# ETAPAS
+# ============================================================================
+
+def run_meshes(args, out):
+    """malhas: gera as malhas de uma varredura com o GMSH"""
+    import generate_meshes as gm
+    from mesh_planner import plan_meshes, final_plan, print_plan
+
+    gmsh_path = gm.find_gmsh()
+    if gmsh_path is None:
+        out.emit('error', message="GMSH não encontrado (python tool_registry.py set gmsh <caminho>)")
+        return 1
+
+    choice = gm.MODES[args.mode]
+    parameters = gm.sweep_parameters(choice, args.x_inlet, args.h_dom)
+    plan = plan_meshes(parameters, choice)
+    to_generate = final_plan(plan)
+    print_plan(plan)
+    if len(to_generate) == 0:
+        out.emit('error', message="Nenhuma malha válida no plano")
+        return 1
+
+    output_dir = args.dir or gm.output_directory(choice)[0]
+    start = time.time()
+    out.emit('start', mode=args.mode, n_requested=len(parameters), n_cases=len(to_generate),
+             n_id_conflicts=int(plan['id_conflict'].sum()), dir=os.path.abspath(output_dir),
+             gmsh=gmsh_path)
+
+    def on_result(r):
+        out.emit('case', case_id=r['mesh_id_final'], requested=r['mesh_id'], x_inlet=r['x_inlet'],
+                 H_dom=r['H_dom'], file=os.path.abspath(r['file']), success=r['success'])
+
+    results = gm.generate_all(to_generate, choice, output_dir, gmsh_path, on_result=on_result)
+    return _summary(out, [r['success'] for r in results], start, dir=os.path.abspath(output_dir))
+
+
+def run_simulations(args, out):
+    """simular: executa o SU2 em todas as malhas de um diretório"""
+    import run_su2_batch as batch
+    from multiprocessing import cpu_count
+
+    if not os.path.isdir(args.dir):
+        out.emit('error', message=f"Diretório não encontrado: {args.dir}")
+        return 1
+    su2_path = batch.find_su2()
+    if su2_path is None:
+        out.emit('error', message="SU2_CFD não encontrado (python tool_registry.py set su2 <caminho>)")
+        return 1
+    if not os.path.exists(batch.CONFIG_FILE):
+        out.emit('error', message=f"Arquivo de configuração não encontrado: {batch.CONFIG_FILE}")
+        return 1
+
+    plan = batch.plan_batch(args.dir, args.resume)
+    if plan is None:
+        out.emit('error', message=f"Nenhuma malha encontrada em {args.dir}")
+        return 1
+
+    workers = args.workers or max(1, cpu_count() - 1)
+    start = time.time()
+    out.emit('start', dir=os.path.abspath(args.dir), n_cases=len(plan['mesh_files']),
+             n_rejected=len(plan['rejected']), workers=workers, resume=args.resume, su2=su2_path)
+    if not plan['mesh_files'] and not plan['rejected']:
+        return _summary(out, [], start, message="Todos os casos já foram concluídos")
+
+    def on_result(r):
+        case_id = r.get('case_id') or os.path.basename(r['mesh']).replace('mesh_', '').replace('.su2', '')
+        out.emit('case', case_id=case_id, mesh=os.path.abspath(r['mesh']), success=r['success'],
+                 time_s=round(r['time'], 3), message=r['message'], profile=r.get('profile'))
+
+    results, total_time = batch.execute_batch(plan, args.dir, workers, args.archive,
+                                              on_result=on_result)
+    return _summary(out, [r['success'] for r in results], start, dir=os.path.abspath(args.dir))
+
+
+def run_study(args, out):
+    """estudo: malha + verificação + SU2 caso a caso (run_parametric_study)"""
+    import run_parametric_study as study
+
+    gmsh_path, su2_path = study.find_gmsh(), study.find_su2()
+    if gmsh_path is None or su2_path is None:
+        missing = 'GMSH' if gmsh_path is None else 'SU2_CFD'
+        out.emit('error', message=f"{missing} não encontrado (python tool_registry.py)")
+        return 1
+    if not os.path.exists(study.CONFIG_FILE):
+        out.emit('error', message=f"Arquivo de configuração não encontrado: {study.CONFIG_FILE}")
+        return 1
+
+    if args.mode:
+        parameters = study.study_parameters(study.MODES[args.mode], args.x_inlet, args.h_dom)
+    else:
+        parameters = study.journaled_parameters()
+    if not parameters:
+        out.emit('error', message="Nenhum caso: use --mode ou --resume com um diário existente")
+        return 1
+
+    status = study.case_status(parameters, args.resume)
+    inputs = {mesh_id: (d, h) for d, h, mesh_id in parameters}
+    start = time.time()
+    out.emit('start', mode=args.mode or 'diario', dir=os.getcwd(), n_cases=len(parameters),
+             resume=args.resume, gmsh=gmsh_path, su2=su2_path)
+
+    def on_result(r):
+        mesh_id, success, message, case_time = r
+        out.emit('case', case_id=mesh_id, d_inlet=inputs[mesh_id][0], H_dom=inputs[mesh_id][1],
+                 success=success, time_s=round(case_time, 3), message=message)
+
+    results, total_time = study.run_study(parameters, gmsh_path, status, on_result=on_result)
+    return _summary(out, [r[1] for r in results], start, dir=os.getcwd())
+
+
+def run_analysis(args, out):
+    """analisar: gráficos de convergência, comparações e tabela resumo"""
+    from analyze_results import find_history_files, run_analyses
+
+    history_files = find_history_files()
+    if not history_files:
+        out.emit('error', message=f"Nenhum history_d*.csv em {os.getcwd()}")
+        return 1
+
+    start = time.time()
+    out.emit('start', dir=os.getcwd(), n_files=len(history_files), actions=args.actions)
+    df_summary = run_analyses(history_files, args.actions)
+
+    rows = [] if df_summary is None else df_summary.to_dict('records')
+    for row in rows:
+        numbers = {key: (float(row[column]) if row.get(column, 'N/A') != 'N/A' else None)
+                   for key, column in (('d_inlet', 'd_inlet (m)'), ('H_dom', 'H_dom (m)'),
+                                       ('Cd', 'Cd'), ('Cl', 'Cl'))}
+        out.emit('case', case_id=row['Caso'], iterations=row.get('Iterações'), **numbers)
+    out.emit('summary', n_files=len(history_files), n_cases=len(rows),
+             elapsed_s=round(time.time() - start, 3), dir=os.getcwd())
+    return 0
+
+
+def run_pressure(args, out):
+    """pressao: comparação de pressão na linha (-0.02, 0) → (0, 0) e do campo"""
+    from compare_pressure import compare_directory
+
+    if not os.path.isdir(args.dir):
+        out.emit('error', message=f"Diretório não encontrado: {args.dir}")
+        return 1
+
+    start = time.time()
+    out.emit('start', dir=os.path.abspath(args.dir), plots=not args.no_plots)
+    comparison = compare_directory(args.dir, plot=not args.no_plots)
+    if comparison is None:
+        out.emit('error', message=f"Nenhum flow_d*.vtu em {args.dir}")
+        return 1
+
+    df_results, dataframes = comparison
+    labels = [c.split('_', 3)[3] for c in df_results.columns if c.startswith('P_caso_')]
+    for i in range(1, len(labels)):
+        diff = df_results[f'Delta_P_{i-1}→{i}']
+        out.emit('pair', case_from=labels[i - 1], case_to=labels[i], mean=diff.mean(),
+                 std=diff.std(ddof=0), min=diff.min(), max=diff.max())
+    out.emit('summary', n_cases=len(dataframes), n_points=len(df_results),
+             elapsed_s=round(time.time() - start, 3),
+             csv=os.path.abspath(os.path.join(args.dir, 'pressure_comparison_line.csv')))
+    return 0
+
+
+# ============================================================================
+# LINHA DE COMANDO
+# ============================================================================
+
+def _float_list(text):
+    try:
+        return [float(v) for v in text.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"lista de números inválida: {text}")
+
+
+def _actions(text):
+    actions = [a.strip() for a in text.split(',') if a.strip()]
+    unknown = [a for a in actions if a not in ANALYSES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"análise desconhecida: {', '.join(unknown)} "
+                                         f"(disponíveis: {', '.join(ANALYSES)})")
+    return actions
+
+
+def _positive(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("deve ser >= 1")
+    return value
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--format', choices=('jsonl', 'text'), default='jsonl',
+                        help="formato dos registros (padrão: jsonl)")
+    common.add_argument('--output', metavar='ARQUIVO',
+                        help="acrescenta os registros a este arquivo em vez do stdout")
+
+    sweep = argparse.ArgumentParser(add_help=False)
+    sweep.add_argument('--mode', choices=MODES,
+                       help="horizontal (varia x_inlet), vertical (varia H_dom) ou matriz")
+    sweep.add_argument('--x-inlet', type=_float_list, metavar='X1,X2,...',
+                       help="valores de x_inlet/d_inlet, com '=' (--x-inlet=-0.02,-0.04; padrão: os do modo)")
+    sweep.add_argument('--h-dom', type=_float_list, metavar='H1,H2,...',
+                       help="valores de H_dom (padrão: os do modo)")
+
+    parser = argparse.ArgumentParser(
+        prog='batch_cli.py', description="Etapas do estudo sem interação, com registros JSON-lines")
+    stages = parser.add_subparsers(dest='stage', required=True, metavar='etapa')
+
+    p = stages.add_parser('malhas', parents=[common, sweep], help="gerar malhas (GMSH)")
+    p.add_argument('--dir', help="diretório de saída (padrão: o do modo)")
+    p.set_defaults(func=run_meshes)
+
+    p = stages.add_parser('simular', parents=[common], help="executar o SU2 nas malhas de um diretório")
+    p.add_argument('--dir', required=True, help="diretório com as malhas mesh_d*.su2")
+    p.add_argument('--workers', type=_positive, help="casos simultâneos (padrão: CPUs - 1)")
+    p.add_argument('--resume', action='store_true', help="pula casos concluídos (diário)")
+    p.add_argument('--archive', action='store_true', help="comprime os resultados em .aedz")
+    p.set_defaults(func=run_simulations)
+
+    p = stages.add_parser('estudo', parents=[common, sweep], help="estudo paramétrico completo")
+    p.add_argument('--dir', help="diretório de trabalho (padrão: o atual)")
+    p.add_argument('--resume', action='store_true',
+                   help="continua do diário (sem --mode, retoma os casos planejados)")
+    p.set_defaults(func=run_study)
+
+    p = stages.add_parser('analisar', parents=[common], help="análise dos históricos de convergência")
+    p.add_argument('--dir', help="diretório com os history_d*.csv (padrão: o atual)")
+    p.add_argument('--actions', type=_actions, default=['tabela'], metavar='A1,A2',
+                   help=f"análises: {', '.join(ANALYSES)} (padrão: tabela)")
+    p.set_defaults(func=run_analysis)
+
+    p = stages.add_parser('pressao', parents=[common], help="comparação de pressão entre casos")
+    p.add_argument('--dir', required=True, help="diretório com os flow_d*.vtu")
+    p.add_argument('--no-plots', action='store_true', help="não gera os gráficos PNG")
+    p.set_defaults(func=run_pressure)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.stage == 'malhas' and not args.mode:
+        build_parser().error("malhas: --mode é obrigatório")
+    if args.stage == 'estudo' and not (args.mode or args.resume):
+        build_parser().error("estudo: use --mode ou --resume")
+
+    # Gráficos só em arquivo: sem janela nem servidor gráfico
+    if not os.environ.get('MPLBACKEND'):
+        os.environ['MPLBACKEND'] = 'Agg'
+
+    out = RecordWriter(args.stage, args.format, open_records(args))
+    # estudo e analisar trabalham no diretório atual (como os scripts)
+    if args.stage in ('estudo', 'analisar') and args.dir:
+        if not os.path.isdir(args.dir):
+            out.emit('error', message=f"Diretório não encontrado: {args.dir}")
+            sys.exit(1)
+        os.chdir(args.dir)
+
+    try:
+        code = args.func(args, out)
+    except Exception as e:
+        traceback.print_exc()
+        out.emit('error', message=f"{type(e).__name__}: {e}")
+        code = 1
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
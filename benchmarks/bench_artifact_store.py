@@ -0,0 +1,169 @@
+"""
+Benchmark: arquivos de resultado brutos vs arquivados (.aedz)
+Autor: Script automatizado
+Data: 2025
+
+Para um VTU do SU2 (ou um VTU sintético de placa plana, se nenhum for
+dado) mede, para cada codec disponível:
+- razão de compressão e tempo de arquivamento
+- leitura completa (read_vtu) do arquivo bruto e do arquivado, em MB/s
+- leitura de uma única coluna (Pressure), em que o arquivado só
+  descomprime os arrays pedidos
+e, como referência, a leitura pelo VTK.
+
+Uso:
+    python benchmarks/bench_artifact_store.py [arquivo.vtu] [n_repeticoes]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from artifact_store import available_codecs, archive_file, ARCHIVE_SUFFIX
+from read_vtu import read_vtu, _read_vtu_vtk
+
+
+def write_synthetic_vtu(filename, nx=400, ny=200):
+    """
+    VTU appended raw no formato do SU2 com campos suaves de camada limite
+
+    Pontos Float32, quadriláteros Int32 e campos Float32 com os mesmos
+    nomes do SU2 (compressibilidade parecida com a de um caso real). Cada
+    array é calculado e gravado por vez, para caber malhas de 10⁷ pontos.
+    """
+    n_points, n_cells = nx * ny, (nx - 1) * (ny - 1)
+    x = np.linspace(-0.16, 0.3048, nx)
+    y = 0.03 * (np.geomspace(1, 101, ny) - 1) / 100
+    X, Y = np.meshgrid(x, y, indexing='ij')
+    X, Y = X.ravel(), Y.ravel()
+    eta = Y / np.sqrt(np.maximum(X, 1e-3) * 1.5e-5 / 69.4 + 1e-8)
+    u = np.tanh(0.6 * eta) * (X > 0) + (X <= 0)
+    del eta
+
+    def connectivity():
+        i, j = np.meshgrid(np.arange(nx - 1), np.arange(ny - 1), indexing='ij')
+        base = (i * ny + j).ravel()
+        return np.column_stack([base, base + ny, base + ny + 1, base + 1])
+
+    def vector(scale_x, scale_y):
+        return lambda: np.column_stack([scale_x * u, scale_y * u, np.zeros(n_points)])
+
+    # (seção, nome, tipo, componentes, número de tuplas, função que calcula os valores)
+    arrays = [
+        ('Points', '', '<f4', 3, n_points, lambda: np.column_stack([X, Y, np.zeros(n_points)])),
+        ('Cells', 'connectivity', '<i4', 4, n_cells, connectivity),
+        ('Cells', 'offsets', '<i4', 1, n_cells, lambda: 4 * np.arange(1, n_cells + 1)),
+        ('Cells', 'types', 'u1', 1, n_cells, lambda: np.full(n_cells, 9)),
+        ('PointData', 'Density', '<f4', 1, n_points, lambda: 1.0 + 1e-3 * (1 - u)),
+        ('PointData', 'Momentum', '<f4', 3, n_points, vector(69.4, 0.01)),
+        ('PointData', 'Pressure', '<f4', 1, n_points, lambda: 101325.0 + 10.0 * np.exp(-X ** 2 / 0.01)),
+        ('PointData', 'Temperature', '<f4', 1, n_points, lambda: 297.6 + 0.5 * (1 - u)),
+        ('PointData', 'Mach', '<f4', 1, n_points, lambda: 0.2 * u),
+        ('PointData', 'Velocity', '<f4', 3, n_points, vector(69.4, 0.01)),
+        ('PointData', 'Skin_Friction_Coefficient', '<f4', 3, n_points, lambda: np.zeros((n_points, 3))),
+        ('PointData', 'Y_Plus', '<f4', 1, n_points, lambda: Y * 69.4 / 1.5e-5 * 0.01),
+    ]
+
+    vtk_types = {'<f4': 'Float32', '<i4': 'Int32', 'u1': 'UInt8'}
+    lines = ['<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" '
+             'header_type="UInt64">', '<UnstructuredGrid>',
+             f'<Piece NumberOfPoints="{n_points}" NumberOfCells="{n_cells}">']
+    offset = 0
+    section = None
+    for sec, name, dtype, ncomp, n_tuples, _ in arrays:
+        if sec != section:
+            if section:
+                lines.append(f'</{section}>')
+            lines.append(f'<{sec}>')
+            section = sec
+        # Connectivity: 4 índices por célula, declarados como 1 componente
+        lines.append(f'<DataArray type="{vtk_types[dtype]}" Name="{name}" '
+                     f'NumberOfComponents= "{1 if sec == "Cells" else ncomp}" offset="{offset}" '
+                     f'format="appended"/>')
+        offset += 8 + n_tuples * ncomp * np.dtype(dtype).itemsize
+    lines += [f'</{section}>', '</Piece>', '</UnstructuredGrid>', '<AppendedData encoding="raw">']
+
+    with open(filename, 'wb') as f:
+        f.write(('\n'.join(lines) + '\n_').encode())
+        for _, _, dtype, ncomp, n_tuples, make in arrays:
+            values = np.ascontiguousarray(make(), dtype=dtype)
+            f.write(np.array([values.nbytes], dtype='<u8').tobytes())
+            values.tofile(f)
+            del values
+        f.write(b'</AppendedData>\n</VTKFile>\n')
+    return filename
+
+
+def _best_time(func, n_repeats):
+    best = np.inf
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(vtu_file, n_repeats=5):
+    """Executa o benchmark e retorna lista de dicts (um por método)"""
+    size_mb = os.path.getsize(vtu_file) / 1024**2
+    rows = []
+
+    t_vtk = _best_time(lambda: _read_vtu_vtk(vtu_file), 1)
+    rows.append({'method': 'VTK', 'size_mb': size_mb, 'ratio': 1.0, 'archive_s': 0.0,
+                 'read_s': t_vtk, 'read_mb_s': size_mb / t_vtk, 'column_s': np.nan})
+
+    t_read = _best_time(lambda: read_vtu(vtu_file), n_repeats)
+    t_column = _best_time(lambda: read_vtu(vtu_file, columns=['Pressure']), n_repeats)
+    rows.append({'method': 'bruto (numpy)', 'size_mb': size_mb, 'ratio': 1.0, 'archive_s': 0.0,
+                 'read_s': t_read, 'read_mb_s': size_mb / t_read, 'column_s': t_column})
+
+    reference = read_vtu(vtu_file)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for codec in available_codecs():
+            path = os.path.join(tmp_dir, os.path.basename(vtu_file))
+            shutil.copyfile(vtu_file, path)
+            result = archive_file(path, codec=codec, remove=True)
+
+            t_read = _best_time(lambda: read_vtu(path), n_repeats)
+            t_column = _best_time(lambda: read_vtu(path, columns=['Pressure']), n_repeats)
+            assert read_vtu(path).equals(reference)
+
+            rows.append({'method': f'arquivado ({codec})',
+                         'size_mb': result['archived_size'] / 1024**2,
+                         'ratio': result['ratio'], 'archive_s': result['time'],
+                         'read_s': t_read, 'read_mb_s': size_mb / t_read, 'column_s': t_column})
+            os.remove(path + ARCHIVE_SUFFIX)
+    return rows
+
+
+def main():
+    n_repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if len(sys.argv) > 1:
+            vtu_file = sys.argv[1]
+        else:
+            vtu_file = write_synthetic_vtu(os.path.join(tmp_dir, 'flow_sintetico.vtu'))
+
+        print(f"Benchmark de arquivamento: {vtu_file}")
+        print(f"  Tamanho: {os.path.getsize(vtu_file) / 1024**2:.2f} MB  |  Repetições: {n_repeats}\n")
+        rows = bench(vtu_file, n_repeats)
+
+    print(f"  {'Método':<20} {'MB':>8} {'Razão':>7} {'Arquivar':>10} "
+          f"{'Leitura':>10} {'MB/s':>8} {'1 coluna':>10}")
+    print("  " + "-" * 78)
+    for r in rows:
+        column = f"{r['column_s'] * 1000:8.1f}ms" if np.isfinite(r['column_s']) else f"{'-':>10}"
+        print(f"  {r['method']:<20} {r['size_mb']:8.2f} {r['ratio']:6.1f}x "
+              f"{r['archive_s'] * 1000:8.1f}ms {r['read_s'] * 1000:8.1f}ms "
+              f"{r['read_mb_s']:8.0f} {column}")
+
+
+if __name__ == "__main__":
+    main()
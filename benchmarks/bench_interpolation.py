@@ -0,0 +1,100 @@
+"""
+Benchmark: InterpolationOperator vs busca repetida do ponto mais próximo
+Autor: Script automatizado
+Data: 2025
+
+Compara, para N pontos e vários campos/repetições (ex.: vários campos,
+iterações ou reexecuções de uma varredura):
+- find_nearest_point chamado ponto a ponto (abordagem atual)
+- InterpolationOperator: montagem (uma vez) + aplicação (produto esparso)
+- InterpolationOperator carregado do cache em disco
+
+Uso:
+    python benchmarks/bench_interpolation.py [arquivo.vtu] [n_pontos] [n_repeticoes]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compare_pressure import (find_nearest_point, load_case_mesh, mesh_hash,
+                              InterpolationOperator)
+from read_vtu import read_vtu
+
+
+def bench(vtu_file, n_points=200, n_repeats=5):
+    """Executa o benchmark e retorna um dict com os tempos (s)"""
+    df = read_vtu(vtu_file)
+    case = load_case_mesh(vtu_file)
+
+    lo = case['points'].min(axis=0)
+    hi = case['points'].max(axis=0)
+    rng = np.random.default_rng(0)
+    targets = lo + (hi - lo) * rng.random((n_points, 2))
+    target_hash = mesh_hash(targets)
+
+    # Abordagem atual: busca do ponto mais próximo a cada consulta
+    start = time.perf_counter()
+    for _ in range(n_repeats):
+        nearest = np.array([find_nearest_point(df, x, y)['Pressure'] for x, y in targets])
+    t_nearest = time.perf_counter() - start
+
+    # Operador: monta uma vez e aplica em todas as repetições
+    start = time.perf_counter()
+    operator = InterpolationOperator.build(case['points'], case['cells'], targets,
+                                           case['hash'], target_hash)
+    t_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n_repeats):
+        interpolated = operator.apply(case['fields'])
+    t_apply = time.perf_counter() - start
+
+    # Operador salvo e recarregado do disco (reexecução da varredura)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = InterpolationOperator.cache_path(case['hash'], target_hash, tmp_dir)
+        operator.save(filename)
+        start = time.perf_counter()
+        InterpolationOperator.load(filename)
+        t_load = time.perf_counter() - start
+
+    return {
+        'n_points': n_points,
+        'n_repeats': n_repeats,
+        'nearest_total': t_nearest,
+        'operator_build': t_build,
+        'operator_apply_total': t_apply,
+        'operator_load': t_load,
+        'speedup_first_run': t_nearest / (t_build + t_apply),
+        'speedup_cached': t_nearest / (t_load + t_apply),
+        'n_fields': interpolated.shape[1],
+        'nearest_check': float(np.nanmean(nearest)),
+    }
+
+
+def main():
+    vtu_file = sys.argv[1] if len(sys.argv) > 1 else 'flow.vtu'
+    n_points = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    n_repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    print(f"Benchmark de interpolação: {vtu_file}")
+    print(f"  Pontos: {n_points}  |  Repetições: {n_repeats}\n")
+
+    r = bench(vtu_file, n_points, n_repeats)
+
+    print(f"  find_nearest_point (total):   {r['nearest_total']*1000:10.2f} ms")
+    print(f"  Operador - montagem:          {r['operator_build']*1000:10.2f} ms")
+    print(f"  Operador - aplicação (total): {r['operator_apply_total']*1000:10.2f} ms "
+          f"({r['n_fields']} campos por aplicação)")
+    print(f"  Operador - carga do disco:    {r['operator_load']*1000:10.2f} ms")
+    print(f"\n  Speedup (1a execução):  {r['speedup_first_run']:8.1f}x")
+    print(f"  Speedup (com cache):    {r['speedup_cached']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
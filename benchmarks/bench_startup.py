@@ -0,0 +1,117 @@
+"""
+Benchmark: tempo de inicialização (importação) dos scripts
+Autor: Script automatizado
+Data: 2025
+
+Para cada script de linha de comando mede, com `python -X importtime`, o
+tempo acumulado de importação do módulo (melhor de n execuções, cada uma
+num processo novo) e verifica:
+- que fica abaixo do alvo (TARGET_MS, ou o valor passado em --target)
+- que nenhuma biblioteca pesada (HEAVY_MODULES) é importada só por carregar
+  o script: elas devem ser importadas dentro das funções que as usam
+Também mede o tempo total de `python aed_cli.py` saindo do menu.
+
+Retorna código de saída 1 se algum script falhar (uso em CI).
+
+Uso:
+    python benchmarks/bench_startup.py [n_repeticoes] [--target ms]
+"""
+
+import os
+import re
+import sys
+import time
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scripts verificados (módulos na raiz do repositório)
+SCRIPTS = [
+    'aed_cli', 'generate_meshes', 'mesh_quality', 'run_su2_batch', 'run_parametric_study',
+    'adaptive_sweep', 'solver_sweep', 'work_queue', 'analyze_results', 'compare_pressure',
+    'exemplo_comparacao', 'blasius', 'velocity_profiles', 'domain_convergence',
+    'solver_profiler', 'artifact_store', 'find_executables', 'tool_registry', 'batch_cli',
+]
+
+# Não podem aparecer na importação dos scripts acima
+HEAVY_MODULES = ('vtk', 'matplotlib', 'pandas', 'scipy')
+
+# Alvo de inicialização a frio por script (ms); numpy sozinho leva ~100 ms
+TARGET_MS = 250.0
+
+_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)')
+
+
+def import_profile(module):
+    """
+    Importa o módulo num processo novo com -X importtime
+
+    Returns:
+        (tempo acumulado do módulo em ms, dict módulo -> tempo acumulado em ms)
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"falha ao importar {module}: {proc.stderr.strip().splitlines()[-1]}")
+    modules = {}
+    for match in _LINE.finditer(proc.stderr):
+        modules[match.group(4)] = int(match.group(2)) / 1000.0
+    return modules[module], modules
+
+
+def menu_exit_time(n_repeats):
+    """Tempo total (ms) de `python aed_cli.py` escolhendo 0 no menu"""
+    best = float('inf')
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(ROOT, 'aed_cli.py')], cwd=ROOT,
+                       input='0\n', capture_output=True, text=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def bench(n_repeats=5, target_ms=TARGET_MS):
+    """Executa o benchmark e retorna lista de dicts (um por script)"""
+    rows = []
+    for module in SCRIPTS:
+        best, modules = float('inf'), {}
+        for _ in range(n_repeats):
+            elapsed, profile = import_profile(module)
+            if elapsed < best:
+                best, modules = elapsed, profile
+        heavy = sorted({name.split('.')[0] for name in modules} & set(HEAVY_MODULES))
+        rows.append({'script': module, 'import_ms': best, 'heavy': heavy,
+                     'ok': best <= target_ms and not heavy})
+    return rows
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    target_ms = TARGET_MS
+    if '--target' in sys.argv:
+        target_ms = float(sys.argv[sys.argv.index('--target') + 1])
+        args = [a for a in args if a != sys.argv[sys.argv.index('--target') + 1]]
+    n_repeats = int(args[0]) if args else 5
+
+    print(f"Benchmark de inicialização: {len(SCRIPTS)} scripts  |  "
+          f"Repetições: {n_repeats}  |  Alvo: {target_ms:.0f} ms\n")
+    rows = bench(n_repeats, target_ms)
+
+    print(f"  {'Script':<24} {'Importação':>12}  Bibliotecas pesadas")
+    print("  " + "-" * 66)
+    for r in rows:
+        mark = '✓' if r['ok'] else '✗'
+        print(f"  {mark} {r['script']:<22} {r['import_ms']:9.1f} ms  {', '.join(r['heavy']) or '-'}")
+
+    print(f"\n  aed_cli.py até sair do menu (processo completo): {menu_exit_time(n_repeats):.0f} ms")
+
+    failed = [r['script'] for r in rows if not r['ok']]
+    if failed:
+        print(f"\n✗ {len(failed)} script(s) acima do alvo ou importando bibliotecas pesadas: "
+              f"{', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✓ Todos os scripts abaixo de {target_ms:.0f} ms e sem bibliotecas pesadas")
+
+
+if __name__ == "__main__":
+    main()
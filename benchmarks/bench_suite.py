@@ -0,0 +1,353 @@
+"""
+Suíte de benchmarks: leitores, sondas, históricos, malhas e agendamento
+Autor: Script automatizado
+Data: 2025
+
+Gera dados sintéticos com o formato dos arquivos do SU2 (flow.vtu appended
+raw e history.csv), em escala de produção, e mede:
+- read_vtu: leitura completa do VTU
+- read_vtu_coluna: leitura só de Pressure
+- find_nearest_point: pressão em 20 pontos da linha (-0.02, 0) → (0, 0)
+- load_history: leitura de um histórico com n iterações
+- create_geo_file: 100 arquivos .geo (ajuste de parâmetros incluso)
+- agendamento: custo do run_with_admission com 64 tarefas vazias
+
+Os resultados (mínimo, mediana, média e desvio de n repetições, mais
+versões e parâmetros) são gravados em JSON. Com --compare, cada benchmark é
+comparado à mediana do arquivo de referência: mais lento que a tolerância
+conta como regressão e o código de saída é 1 (uso em CI).
+
+Tamanhos (--size): pequeno (10⁵ pontos, 10³ iterações), medio (10⁶, 10⁴),
+grande (10⁷, 10⁴); --points/--iterations substituem os do tamanho. Os
+dados gerados ficam em cache (--data, padrão: diretório temporário) e são
+reaproveitados nas execuções seguintes.
+
+Uso:
+    python benchmarks/bench_suite.py [n_repeticoes] [--size medio] [--only read_vtu,load_history]
+                                     [--output resultados.json] [--compare referencia.json]
+                                     [--tolerance 0.25] [--data DIR]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import platform
+import tempfile
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_artifact_store import write_synthetic_vtu
+
+# Tamanho -> (pontos do VTU, iterações do histórico)
+SIZES = {
+    'pequeno': (100_000, 1_000),
+    'medio': (1_000_000, 10_000),
+    'grande': (10_000_000, 10_000),
+}
+
+# Mais lento que a referência por mais que esta fração = regressão
+TOLERANCE = 0.25
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+DATA_DIR = os.path.join(tempfile.gettempdir(), 'aed_bench_data')
+
+
+# ============================================================================
+# DADOS SINTÉTICOS
+# ============================================================================
+
+def synthetic_vtu(n_points, data_dir=DATA_DIR):
+    """VTU de placa plana com ~n_points pontos (grade nx × ny, nx = 2 ny), em cache"""
+    ny = max(2, int(round(np.sqrt(n_points / 2))))
+    nx = max(2, n_points // ny)
+    filename = os.path.join(data_dir, f'flow_sintetico_{nx}x{ny}.vtu')
+    if not os.path.exists(filename):
+        os.makedirs(data_dir, exist_ok=True)
+        write_synthetic_vtu(filename + '.tmp', nx, ny)
+        os.replace(filename + '.tmp', filename)
+    return filename
+
+
+def write_synthetic_history(filename, n_iter):
+    """
+    history.csv no formato do SU2 (colunas e larguras iguais às do
+    history.csv do repositório) com resíduos decaindo e ruído
+    """
+    rng = np.random.default_rng(0)
+    it = np.arange(n_iter)
+    start = np.array([-3.97, -2.11, -1.43, 1.51])
+    rate = np.array([8.0, 7.5, 7.0, 6.5]) / max(n_iter, 1)
+    residuals = start - rate * it[:, None] + 0.05 * rng.standard_normal((n_iter, 4))
+
+    header = ('"Time_Iter","Outer_Iter","Inner_Iter",    "rms[Rho]"    ,    "rms[RhoU]"   ,'
+              '    "rms[RhoV]"   ,    "rms[RhoE]"   \n')
+    rows = (f"{0:>11d},{0:>12d},{k:>12d},{r[0]:>18.9f},{r[1]:>18.9f},{r[2]:>18.9f},{r[3]:>18.9f}\n"
+            for k, r in zip(it, residuals))
+    with open(filename, 'w') as f:
+        f.write(header)
+        f.writelines(rows)
+    return filename
+
+
+def synthetic_history(n_iter, data_dir=DATA_DIR):
+    """history.csv sintético com n_iter iterações, em cache"""
+    filename = os.path.join(data_dir, f'history_sintetico_{n_iter}.csv')
+    if not os.path.exists(filename):
+        os.makedirs(data_dir, exist_ok=True)
+        write_synthetic_history(filename + '.tmp', n_iter)
+        os.replace(filename + '.tmp', filename)
+    return filename
+
+
+def _noop(task):
+    """Tarefa vazia do benchmark de agendamento (picklável)"""
+    return task
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def bench_read_vtu(data):
+    from read_vtu import read_vtu
+    return (lambda: read_vtu(data['vtu'])), {'n_points': data['n_points']}
+
+
+def bench_read_vtu_column(data):
+    from read_vtu import read_vtu
+    return (lambda: read_vtu(data['vtu'], columns=['Pressure'])), {'n_points': data['n_points']}
+
+
+def bench_find_nearest_point(data):
+    from read_vtu import read_vtu
+    from compare_pressure import find_nearest_point
+
+    df = read_vtu(data['vtu'], columns=['Pressure'])
+    x_points = np.linspace(-0.02, 0, 20)
+
+    def run():
+        return [find_nearest_point(df, x, 0.0)['Pressure'] for x in x_points]
+    return run, {'n_points': len(df), 'n_probes': len(x_points)}
+
+
+def bench_load_history(data):
+    from analyze_results import load_history
+    return (lambda: load_history(data['history'])), {'n_iter': data['n_iter']}
+
+
+def bench_create_geo_file(data):
+    from generate_meshes import create_geo_file
+
+    rng = np.random.default_rng(0)
+    x_inlet = -0.02 - 0.38 * rng.random(100)
+    H_dom = 0.01 + 0.29 * rng.random(100)
+    output_geo = os.path.join(data['tmp_dir'], 'bench.geo')
+
+    def run():
+        for x, h in zip(x_inlet, H_dom):
+            create_geo_file(x, h, output_geo, '3', verbose=False)
+    return run, {'n_files': len(x_inlet)}
+
+
+def bench_scheduling(data):
+    from scheduler import run_with_admission
+
+    n_tasks, workers = 64, 2
+
+    def run():
+        run_with_admission(_noop, list(range(n_tasks)), [1.0] * n_tasks, max_workers=workers,
+                           memory_budget_mb=1e9, reserve_mb=0, log=lambda *args: None)
+    return run, {'n_tasks': n_tasks, 'workers': workers}
+
+
+# Nome -> função que prepara os dados e devolve (função cronometrada, parâmetros)
+BENCHMARKS = {
+    'read_vtu': bench_read_vtu,
+    'read_vtu_coluna': bench_read_vtu_column,
+    'find_nearest_point': bench_find_nearest_point,
+    'load_history': bench_load_history,
+    'create_geo_file': bench_create_geo_file,
+    'agendamento': bench_scheduling,
+}
+
+
+# ============================================================================
+# EXECUÇÃO E RESULTADOS
+# ============================================================================
+
+def time_repeats(func, n_repeats):
+    """Tempos (s) de n execuções, depois de uma execução de aquecimento"""
+    func()
+    times = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def environment():
+    """Versões e máquina (para saber se dois resultados são comparáveis)"""
+    import pandas as pd
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {'host': socket.gethostname(), 'platform': platform.platform(),
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'cpus': os.cpu_count(), 'commit': commit,
+            'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def run_suite(n_points, n_iter, names=None, n_repeats=5, data_dir=DATA_DIR):
+    """
+    Executa os benchmarks pedidos (todos, se names=None)
+
+    Returns:
+        dict com 'environment', 'config' e 'benchmarks' (nome -> estatísticas)
+    """
+    names = list(BENCHMARKS) if names is None else names
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise KeyError(f"Benchmark desconhecido: {', '.join(sorted(unknown))} "
+                       f"(disponíveis: {', '.join(BENCHMARKS)})")
+
+    results = {'environment': environment(),
+               'config': {'n_points': n_points, 'n_iter': n_iter, 'n_repeats': n_repeats},
+               'benchmarks': {}}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data = {'n_points': n_points, 'n_iter': n_iter, 'tmp_dir': tmp_dir}
+        if {'read_vtu', 'read_vtu_coluna', 'find_nearest_point'} & set(names):
+            print(f"  Preparando VTU sintético (~{n_points} pontos)...")
+            data['vtu'] = synthetic_vtu(n_points, data_dir)
+        if 'load_history' in names:
+            data['history'] = synthetic_history(n_iter, data_dir)
+
+        for name in names:
+            func, params = BENCHMARKS[name](data)
+            times = time_repeats(func, n_repeats)
+            results['benchmarks'][name] = {
+                'params': params, 'min_s': float(times.min()), 'median_s': float(np.median(times)),
+                'mean_s': float(times.mean()), 'std_s': float(times.std()), 'repeats': n_repeats,
+            }
+            print(f"  ✓ {name:<20} {np.median(times) * 1000:10.2f} ms (mediana)")
+    return results
+
+
+def save_results(results, filename):
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with open(filename, 'w') as f:
+        json.dump(results, f, indent=2)
+    return filename
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Compara as medianas com as da referência
+
+    Returns:
+        lista de dicts (name, baseline_s, current_s, ratio, status), status em
+        'ok', 'regressao', 'melhora', 'parametros' (parâmetros diferentes,
+        não comparável) ou 'novo' (ausente na referência)
+    """
+    rows = []
+    for name, current in results['benchmarks'].items():
+        reference = baseline.get('benchmarks', {}).get(name)
+        row = {'name': name, 'current_s': current['median_s'], 'baseline_s': None,
+               'ratio': None, 'status': 'novo'}
+        if reference is not None:
+            row['baseline_s'] = reference['median_s']
+            row['ratio'] = current['median_s'] / reference['median_s']
+            if reference.get('params') != current['params']:
+                row['status'] = 'parametros'
+            elif row['ratio'] > 1 + tolerance:
+                row['status'] = 'regressao'
+            elif row['ratio'] < 1 / (1 + tolerance):
+                row['status'] = 'melhora'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows, tolerance=TOLERANCE):
+    marks = {'ok': '✓', 'melhora': '✓', 'regressao': '✗', 'parametros': '⚠', 'novo': '-'}
+    print(f"\n  {'Benchmark':<22} {'Referência':>12} {'Atual':>12} {'Razão':>8}  Situação")
+    print("  " + "-" * 70)
+    for r in rows:
+        baseline = f"{r['baseline_s'] * 1000:9.2f} ms" if r['baseline_s'] is not None else f"{'-':>12}"
+        ratio = f"{r['ratio']:7.2f}x" if r['ratio'] is not None else f"{'-':>8}"
+        print(f"  {marks[r['status']]} {r['name']:<20} {baseline} {r['current_s'] * 1000:9.2f} ms "
+              f"{ratio}  {r['status']}")
+    print(f"  (regressão: mais de {tolerance:.0%} mais lento que a referência)")
+
+
+# ============================================================================
+# LINHA DE COMANDO
+# ============================================================================
+
+def _option(name, default=None):
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+def main():
+    options = {'--size', '--points', '--iterations', '--only', '--output', '--compare',
+               '--tolerance', '--data'}
+    args = [a for k, a in enumerate(sys.argv[1:], 1)
+            if a not in options and sys.argv[k - 1] not in options]
+    n_repeats = int(args[0]) if args else 5
+
+    size = _option('--size', 'medio')
+    if size not in SIZES:
+        print(f"✗ Tamanho desconhecido: {size} (disponíveis: {', '.join(SIZES)})")
+        sys.exit(2)
+    n_points = int(float(_option('--points', SIZES[size][0])))
+    n_iter = int(float(_option('--iterations', SIZES[size][1])))
+    names = _option('--only').split(',') if _option('--only') else None
+    if names and set(names) - set(BENCHMARKS):
+        print(f"✗ Benchmark desconhecido: {', '.join(sorted(set(names) - set(BENCHMARKS)))} "
+              f"(disponíveis: {', '.join(BENCHMARKS)})")
+        sys.exit(2)
+    tolerance = float(_option('--tolerance', TOLERANCE))
+    output = _option('--output') or os.path.join(
+        RESULTS_DIR, f"bench_{socket.gethostname()}_{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+    # Referência lida antes de rodar: arquivo errado falha na hora
+    baseline_file = _option('--compare')
+    if baseline_file:
+        with open(baseline_file, 'r') as f:
+            baseline = json.load(f)
+
+    print(f"Suíte de benchmarks: {n_points} pontos  |  {n_iter} iterações  |  "
+          f"Repetições: {n_repeats}\n")
+    results = run_suite(n_points, n_iter, names, n_repeats, _option('--data', DATA_DIR))
+    print(f"\n✓ Resultados salvos em: {save_results(results, output)}")
+
+    if baseline_file:
+        print(f"\nComparação com {baseline_file} "
+              f"(commit {baseline.get('environment', {}).get('commit') or '?'}, "
+              f"{baseline.get('environment', {}).get('host', '?')}):")
+        rows = compare(results, baseline, tolerance)
+        print_comparison(rows, tolerance)
+
+        regressions = [r['name'] for r in rows if r['status'] == 'regressao']
+        if regressions:
+            print(f"\n✗ {len(regressions)} regressão(ões): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✓ Nenhuma regressão")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Comparação vetorizada entre o SU2 e a solução de Blasius (camada limite laminar)
+Autor: Script automatizado
+Data: 2025
+
+Funções:
+- Resolve a EDO de Blasius uma única vez e guarda a solução tabelada
+- Calcula Cf(x) e delta_99(x) analíticos de forma vetorizada
+- Compara o Cf dos arquivos surface_flow_*.vtu de todos os casos de uma vez
+- Calcula normas de erro (L2, Linf, relativa) por caso
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+from su2_config import load_config
+
+CONFIG_FILE = "lam_flatplate.cfg"
+
+# Coluna de Cf (componente x) gerada pelo read_vtu para o vetor do SU2
+CF_COLUMN = 'Skin_Friction_Coefficient[0]'
+
+
+# ============================================================================
+# SOLUÇÃO DE BLASIUS
+# ============================================================================
+
+def _blasius_rhs(state):
+    """Lado direito de f''' + 0.5 f f'' = 0 escrito como sistema de 1a ordem"""
+    f, fp, fpp = state
+    return np.array([fp, fpp, -0.5 * f * fpp])
+
+
+def _integrate_blasius(fpp0, eta_max, n_steps):
+    """Integra a EDO de Blasius com RK4 a partir de f''(0) = fpp0"""
+    h = eta_max / n_steps
+    table = np.empty((n_steps + 1, 3))
+    state = np.array([0.0, 0.0, fpp0])
+    table[0] = state
+
+    for k in range(n_steps):
+        k1 = _blasius_rhs(state)
+        k2 = _blasius_rhs(state + 0.5 * h * k1)
+        k3 = _blasius_rhs(state + 0.5 * h * k2)
+        k4 = _blasius_rhs(state + h * k3)
+        state = state + h * (k1 + 2 * k2 + 2 * k3 + k4) / 6.0
+        table[k + 1] = state
+
+    return table
+
+
+@lru_cache(maxsize=None)
+def solve_blasius(eta_max=10.0, n_steps=2000, tol=1e-10):
+    """
+    Resolve a EDO de Blasius por shooting (método da secante) e guarda o resultado
+
+    A solução é calculada apenas uma vez por combinação de argumentos
+    (lru_cache); chamadas seguintes retornam a mesma tabela.
+
+    Args:
+        eta_max: limite superior da variável de similaridade
+        n_steps: número de passos do RK4
+        tol: tolerância em f'(eta_max) - 1
+
+    Returns:
+        dict com 'eta', 'f', 'fp', 'fpp' (arrays somente leitura),
+        'fpp0' (f''(0)) e 'eta99' (eta onde f' = 0.99)
+    """
+    # Secante sobre f''(0) para impor f'(inf) = 1
+    s0, s1 = 0.3, 0.35
+    r0 = _integrate_blasius(s0, eta_max, n_steps)[-1, 1] - 1.0
+    r1 = _integrate_blasius(s1, eta_max, n_steps)[-1, 1] - 1.0
+
+    for _ in range(50):
+        if abs(r1) < tol:
+            break
+        s0, s1 = s1, s1 - r1 * (s1 - s0) / (r1 - r0)
+        r0 = r1
+        r1 = _integrate_blasius(s1, eta_max, n_steps)[-1, 1] - 1.0
+
+    table = _integrate_blasius(s1, eta_max, n_steps)
+    eta = np.linspace(0.0, eta_max, n_steps + 1)
+
+    # f' é monotônico: interpolação inversa para eta_99
+    eta99 = float(np.interp(0.99, table[:, 1], eta))
+
+    solution = {
+        'eta': eta,
+        'f': table[:, 0].copy(),
+        'fp': table[:, 1].copy(),
+        'fpp': table[:, 2].copy(),
+        'fpp0': float(s1),
+        'eta99': eta99,
+    }
+
+    # Protege a tabela em cache contra modificações acidentais
+    for key in ('eta', 'f', 'fp', 'fpp'):
+        solution[key].setflags(write=False)
+
+    return solution
+
+
+def read_reynolds(config_file=CONFIG_FILE):
+    """
+    Lê REYNOLDS_NUMBER e REYNOLDS_LENGTH do arquivo de configuração do SU2
+
+    Returns:
+        (reynolds_number, reynolds_length)
+    """
+    config = load_config(config_file)
+
+    if 'REYNOLDS_NUMBER' not in config:
+        raise ValueError(f"REYNOLDS_NUMBER não encontrado em {config_file}")
+
+    return float(config['REYNOLDS_NUMBER']), float(config.get('REYNOLDS_LENGTH', 1.0))
+
+
+def reynolds_x(x, reynolds_number, reynolds_length):
+    """Reynolds local Re_x = (Re / L_ref) * x (x medido do bordo de ataque)"""
+    return (reynolds_number / reynolds_length) * np.asarray(x, dtype=float)
+
+
+def blasius_cf(x, reynolds_number, reynolds_length):
+    """
+    Cf(x) de Blasius, vetorizado para arrays de qualquer forma
+
+    Cf = 2 f''(0) / sqrt(Re_x)  (~ 0.664 / sqrt(Re_x)); NaN para x <= 0
+    """
+    re_x = reynolds_x(x, reynolds_number, reynolds_length)
+    fpp0 = solve_blasius()['fpp0']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(re_x > 0, 2.0 * fpp0 / np.sqrt(re_x), np.nan)
+
+
+def blasius_delta99(x, reynolds_number, reynolds_length):
+    """
+    Espessura delta_99(x) de Blasius, vetorizada
+
+    delta_99 = eta_99 * x / sqrt(Re_x)  (~ 4.91 x / sqrt(Re_x)); NaN para x <= 0
+    """
+    x = np.asarray(x, dtype=float)
+    re_x = reynolds_x(x, reynolds_number, reynolds_length)
+    eta99 = solve_blasius()['eta99']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(re_x > 0, eta99 * x / np.sqrt(re_x), np.nan)
+
+
+def blasius_velocity_profile(x, y, reynolds_number, reynolds_length):
+    """
+    Perfil u/U_inf de Blasius em (x, y), vetorizado com broadcasting
+
+    Usa a tabela em cache: eta = y * sqrt(Re_x) / x e u/U = f'(eta).
+    """
+    sol = solve_blasius()
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    re_x = reynolds_x(x, reynolds_number, reynolds_length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eta = np.where(x > 0, y * np.sqrt(re_x) / x, np.nan)
+    # Acima de eta_max o perfil já é uniforme (f' = 1)
+    return np.interp(eta, sol['eta'], sol['fp'], right=1.0)
+
+
+# ============================================================================
+# COMPARAÇÃO COM O SU2
+# ============================================================================
+
+def load_plate_surfaces(surface_files, y_tol=1e-9):
+    """
+    Lê os arquivos surface_flow_*.vtu e empilha os pontos da placa
+
+    Os casos têm números diferentes de pontos de superfície, então os dados
+    são guardados em matrizes [caso, ponto] completadas com NaN.
+
+    Args:
+        surface_files: lista de arquivos surface_flow_*.vtu
+        y_tol: tolerância para considerar um ponto sobre a placa (y ~ 0)
+
+    Returns:
+        x: matriz [caso, ponto] com as coordenadas x (ordenadas)
+        cf: matriz [caso, ponto] com o Cf do SU2
+    """
+    from read_vtu import read_vtu
+
+    x_cases = []
+    cf_cases = []
+
+    for surface_file in surface_files:
+        df = read_vtu(surface_file, columns=[CF_COLUMN])
+        mask = (np.abs(df['Y'].values) <= y_tol) & (df['X'].values >= 0.0)
+        x = df['X'].values[mask]
+        cf = df[CF_COLUMN].values[mask]
+        order = np.argsort(x)
+        x_cases.append(x[order])
+        cf_cases.append(cf[order])
+
+    n_max = max((len(x) for x in x_cases), default=0)
+    x_all = np.full((len(x_cases), n_max), np.nan)
+    cf_all = np.full((len(x_cases), n_max), np.nan)
+
+    for i, (x, cf) in enumerate(zip(x_cases, cf_cases)):
+        x_all[i, :len(x)] = x
+        cf_all[i, :len(cf)] = cf
+
+    return x_all, cf_all
+
+
+def compare_skin_friction(x, cf_su2, reynolds_number, reynolds_length, x_min=0.0):
+    """
+    Compara o Cf do SU2 com Blasius para todos os casos de uma vez
+
+    Args:
+        x: matriz [caso, ponto] com coordenadas x (NaN = ponto inexistente)
+        cf_su2: matriz [caso, ponto] com o Cf do SU2
+        reynolds_number, reynolds_length: parâmetros do escoamento
+        x_min: ignora pontos com x < x_min (singularidade no bordo de ataque)
+
+    Returns:
+        dict com 'cf_blasius', 'error' (matrizes [caso, ponto]) e as normas
+        por caso 'l2', 'linf', 'l2_rel' e 'n_points'
+    """
+    x = np.asarray(x, dtype=float)
+    cf_su2 = np.asarray(cf_su2, dtype=float)
+
+    cf_ref = blasius_cf(x, reynolds_number, reynolds_length)
+    valid = np.isfinite(x) & np.isfinite(cf_su2) & np.isfinite(cf_ref) & (x >= x_min)
+
+    error = np.where(valid, cf_su2 - cf_ref, np.nan)
+    err0 = np.where(valid, error, 0.0)
+    ref0 = np.where(valid, cf_ref, 0.0)
+
+    n_points = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        l2 = np.sqrt((err0 ** 2).sum(axis=1) / n_points)
+        l2_rel = np.sqrt((err0 ** 2).sum(axis=1) / (ref0 ** 2).sum(axis=1))
+    linf = np.abs(err0).max(axis=1, initial=0.0)
+    linf = np.where(n_points > 0, linf, np.nan)
+
+    return {
+        'cf_blasius': cf_ref,
+        'error': error,
+        'l2': l2,
+        'linf': linf,
+        'l2_rel': l2_rel,
+        'n_points': n_points,
+    }
+
+
+def compare_cases(surface_files, config_file=CONFIG_FILE, x_min=0.0):
+    """
+    Executa a comparação completa com Blasius para uma lista de casos
+
+    Returns:
+        df_summary: DataFrame com as normas de erro por caso
+        data: dict com as matrizes x, cf_su2 e o resultado de compare_skin_friction
+    """
+    import pandas as pd
+
+    reynolds_number, reynolds_length = read_reynolds(config_file)
+    x, cf_su2 = load_plate_surfaces(surface_files)
+    result = compare_skin_friction(x, cf_su2, reynolds_number, reynolds_length, x_min)
+
+    labels = [os.path.basename(f).replace('surface_flow_', '').replace('.vtu', '')
+              for f in surface_files]
+    x_end = np.nanmax(x, axis=1) if x.size else np.array([])
+
+    df_summary = pd.DataFrame({
+        'Caso': labels,
+        'Pontos': result['n_points'],
+        'L2': result['l2'],
+        'Linf': result['linf'],
+        'L2_rel': result['l2_rel'],
+        'delta99_fim (m)': blasius_delta99(x_end, reynolds_number, reynolds_length),
+    })
+
+    data = {'x': x, 'cf_su2': cf_su2, 'labels': labels}
+    data.update(result)
+    return df_summary, data
+
+
+def main():
+    """Função principal - compara todos os surface_flow_*.vtu com Blasius"""
+    import matplotlib.pyplot as plt
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "COMPARAÇÃO COM BLASIUS - Cf AO LONGO DA PLACA")
+    print("=" * 70 + "\n")
+
+    from artifact_store import find_artifacts
+
+    # Inclui os arquivados pelo artifact_store (.aedz)
+    surface_files = find_artifacts('surface_flow_d*.vtu')
+    if not surface_files:
+        surface_files = find_artifacts('surface_flow*.vtu')
+
+    if not surface_files:
+        print("✗ Nenhum arquivo surface_flow_*.vtu encontrado!")
+        return
+
+    print(f"✓ Arquivos encontrados: {len(surface_files)}")
+
+    sol = solve_blasius()
+    print(f"\nBlasius: f''(0) = {sol['fpp0']:.6f}, eta_99 = {sol['eta99']:.4f}")
+
+    df_summary, data = compare_cases(surface_files)
+
+    print("\n" + df_summary.to_string(index=False))
+
+    output_csv = 'blasius_comparison.csv'
+    df_summary.to_csv(output_csv, index=False)
+    print(f"\n✓ Resumo salvo em: {output_csv}")
+
+    # Gráfico: Cf de todos os casos contra Blasius
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for i, label in enumerate(data['labels']):
+        ax.plot(data['x'][i], data['cf_su2'][i], '.-', label=label, linewidth=1)
+
+    x_ref = np.linspace(np.nanmax(data['x']) / 200, np.nanmax(data['x']), 200)
+    reynolds_number, reynolds_length = read_reynolds()
+    ax.plot(x_ref, blasius_cf(x_ref, reynolds_number, reynolds_length),
+            'k--', linewidth=2, label='Blasius')
+
+    ax.set_xlabel('X (m)')
+    ax.set_ylabel('Cf')
+    ax.set_title('Coeficiente de Atrito: SU2 vs Blasius')
+    ax.legend(fontsize=8)
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    output_plot = 'blasius_cf.png'
+    plt.savefig(output_plot, dpi=150, bbox_inches='tight')
+    plt.close('all')
+    print(f"✓ Gráfico salvo em: {output_plot}")
+
+    return df_summary, data
+
+
+if __name__ == "__main__":
+    main()
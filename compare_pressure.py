@@ -4,17 +4,22 @@ entre múltiplos arquivos VTU
 """
 
 import os
-import glob
+import hashlib
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from read_vtu import read_vtu
 
 # Diretórios
 BASE_DIR = r"C:\Users\ymarc\OneDrive\Desktop\ITA_2025\AED_26\Lab9_Atividade1710"
 DIR_HORIZONTAL = os.path.join(BASE_DIR, "Analise_Horizontal")
 DIR_VERTICAL = os.path.join(BASE_DIR, "Analise_Vertical")
 
+# Campos comparados entre casos na comparação de campo completo
+FIELD_COLUMNS = ['Pressure', 'Velocity[0]', 'Velocity[1]']
+
+# Cache das matrizes de interpolação: em memória (hash origem, hash destino)
+# -> InterpolationOperator, e em disco no diretório abaixo
+_OPERATOR_CACHE = {}
+INTERP_CACHE_DIR = ".interp_cache"
+
 
 def find_nearest_point(df, x_target, y_target, tolerance=1e-3):
     """
@@ -55,6 +60,8 @@ def compare_pressure_at_point(vtu_files, x_point, y_point, tolerance=1e-3):
     Returns:
         lista de dicionários com resultados
     """
+    from read_vtu import read_vtu
+
     # Lista para armazenar DataFrames
     dataframes = []
     
@@ -64,7 +71,7 @@ def compare_pressure_at_point(vtu_files, x_point, y_point, tolerance=1e-3):
     # Lê todos os arquivos
     for i, vtu_file in enumerate(vtu_files):
         print(f"[{i+1}/{len(vtu_files)}] Lendo: {vtu_file}")
-        df = read_vtu(vtu_file)
+        df = read_vtu(vtu_file, columns=['Pressure'])
         dataframes.append({
             'filename': vtu_file,
             'df': df
@@ -123,56 +130,366 @@ def compare_pressure_at_point(vtu_files, x_point, y_point, tolerance=1e-3):
     return results, dataframes
 
 
-def main():
-    """Função principal - Analisa pressão entre (-0.02, 0) e (0, 0)"""
-    
-    print("\n" + "=" * 70)
-    print(" " * 15 + "COMPARAÇÃO DE PRESSÃO ENTRE CASOS")
-    print(" " * 18 + "Linha: (-0.02, 0) até (0, 0)")
-    print("=" * 70)
-    
-    # Menu de escolha de diretório
-    print("\nEscolha o diretório para analisar:")
-    print("1. Análise Horizontal (variando x_inlet)")
-    print("2. Análise Vertical (variando H_dom)")
-    print("3. Diretório atual")
-    
-    choice = input("\nEscolha (1-3): ").strip()
-    
-    if choice == '1':
-        work_dir = DIR_HORIZONTAL
-        analysis_type = "Horizontal"
-    elif choice == '2':
-        work_dir = DIR_VERTICAL
-        analysis_type = "Vertical"
-    elif choice == '3':
-        work_dir = BASE_DIR
-        analysis_type = "Diretório atual"
-    else:
-        print("Opção inválida!")
-        return
-    
-    print(f"\nTipo de análise: {analysis_type}")
-    print(f"Diretório de trabalho: {work_dir}")
+# ============================================================================
+# COMPARAÇÃO DE CAMPO COMPLETO ENTRE MALHAS DIFERENTES
+# ============================================================================
+
+def mesh_hash(*arrays):
+    """Hash (sha1) que identifica uma malha pelos bytes de coordenadas/conectividade"""
+    h = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        h.update(str(array.dtype).encode())
+        h.update(str(array.shape).encode())
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+
+def load_case_mesh(vtu_file, columns=FIELD_COLUMNS):
+    """
+    Lê um caso com coordenadas, quadriláteros e campos pedidos
+
+    Returns:
+        dict com 'points' [nó, 2], 'cells' [célula, 4], 'fields' [nó, campo],
+        'columns' e 'hash' da malha
+    """
+    from read_vtu import open_vtu
+    from structured_grid import quad_cells
+
+    # Só as colunas usadas são lidas do arquivo, sem montar o DataFrame
+    with open_vtu(vtu_file) as ds:
+        points = ds.points()
+        fields = np.column_stack([ds[column] for column in columns])
+        connectivity, offsets, types = ds.cells()
+    cells, _ = quad_cells(connectivity, offsets, types)
+
+    return {
+        'filename': vtu_file,
+        'points': points,
+        'cells': cells,
+        'fields': fields,
+        'columns': list(columns),
+        'hash': mesh_hash(points, cells),
+    }
+
+
+def _locate_in_triangles(vertices, tree, targets, k):
+    """
+    Testa os k triângulos de centróide mais próximo de cada ponto de uma vez
+
+    Returns:
+        tri: triângulo escolhido para cada ponto
+        lam: coordenadas baricêntricas [ponto, 3]
+        found: máscara dos pontos localizados
+    """
+    n = len(targets)
+    _, candidates = tree.query(targets, k=k)
+    candidates = candidates.reshape(n, k)
+
+    v0 = vertices[candidates, 0]
+    e1 = vertices[candidates, 1] - v0
+    e2 = vertices[candidates, 2] - v0
+    d = targets[:, None, :] - v0
+    det = e1[..., 0] * e2[..., 1] - e1[..., 1] * e2[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        l1 = (d[..., 0] * e2[..., 1] - d[..., 1] * e2[..., 0]) / det
+        l2 = (e1[..., 0] * d[..., 1] - e1[..., 1] * d[..., 0]) / det
+    l0 = 1.0 - l1 - l2
+
+    eps = 1e-9
+    contains = (l0 >= -eps) & (l1 >= -eps) & (l2 >= -eps) & (det != 0)
+    found = contains.any(axis=1)
+    first = np.argmax(contains, axis=1)
+
+    rows = np.arange(n)
+    lam = np.stack((l0[rows, first], l1[rows, first], l2[rows, first]), axis=1)
+    return candidates[rows, first], lam, found
+
+
+def build_interpolation_weights(src_points, src_cells, target_points, k_candidates=8):
+    """
+    Monta a matriz esparsa W tal que campo_destino = W @ campo_origem
+
+    Cada quadrilátero é dividido em dois triângulos; para cada ponto de destino
+    os k triângulos de centróide mais próximo são testados de uma vez
+    (coordenadas baricêntricas vetorizadas). Como as células próximas da placa
+    são muito alongadas, os pontos não localizados são testados de novo com
+    mais candidatos. Pontos fora da malha de origem recebem o valor do nó
+    mais próximo.
+
+    Args:
+        src_points: matriz [nó, 2] da malha de origem
+        src_cells: matriz [célula, 4] de quadriláteros da malha de origem
+        target_points: matriz [ponto, 2] onde os campos serão avaliados
+        k_candidates: número inicial de triângulos candidatos por ponto
+
+    Returns:
+        W: scipy.sparse.csr_matrix [n_destino, n_origem]
+        inside: máscara dos pontos de destino localizados dentro da malha
+    """
+    from scipy import sparse
+    from scipy.spatial import cKDTree
+
+    src_points = np.asarray(src_points, dtype=float)
+    target_points = np.asarray(target_points, dtype=float)
+    n_target = len(target_points)
+
+    tris = np.concatenate((src_cells[:, [0, 1, 2]], src_cells[:, [0, 2, 3]]))
+    vertices = src_points[tris]
+    tree = cKDTree(vertices.mean(axis=1))
+
+    tri = np.zeros(n_target, dtype=np.int64)
+    lam = np.zeros((n_target, 3))
+    inside = np.zeros(n_target, dtype=bool)
+
+    # Só pontos dentro da caixa da malha podem estar em algum triângulo
+    lo = src_points.min(axis=0) - 1e-12
+    hi = src_points.max(axis=0) + 1e-12
+    pending = np.nonzero(np.all((target_points >= lo) & (target_points <= hi), axis=1))[0]
+
+    k = min(k_candidates, len(tris))
+    while len(pending):
+        t, l, found = _locate_in_triangles(vertices, tree, target_points[pending], k)
+        done = pending[found]
+        tri[done] = t[found]
+        lam[done] = l[found]
+        inside[done] = True
+        pending = pending[~found]
+        if k >= len(tris):
+            break
+        k = min(k * 8, len(tris))
+
+    cols = tris[tri]
+
+    # Fora da malha: valor do nó mais próximo
+    if not np.all(inside):
+        outside = ~inside
+        _, nearest = cKDTree(src_points).query(target_points[outside])
+        cols[outside] = nearest[:, None]
+        lam[outside] = [1.0, 0.0, 0.0]
+
+    W = sparse.csr_matrix(
+        (lam.ravel(), (np.repeat(np.arange(n_target), 3), cols.ravel())),
+        shape=(n_target, len(src_points)),
+    )
+    W.sum_duplicates()
+    return W, inside
+
+
+class InterpolationOperator:
+    """
+    Operador de interpolação reutilizável entre duas malhas
+
+    Guarda a matriz CSR W [n_destino, n_origem]; aplicar o operador a qualquer
+    campo (ou a vários campos empilhados em colunas) é um único produto
+    matriz esparsa-vetor. O operador é identificado pelos hashes das malhas de
+    origem e destino e pode ser salvo/carregado do disco (.npz).
+    """
+
+    __slots__ = ('matrix', 'inside', 'src_hash', 'target_hash')
+
+    def __init__(self, matrix, inside, src_hash, target_hash):
+        from scipy import sparse
+
+        self.matrix = sparse.csr_matrix(matrix)
+        self.inside = np.asarray(inside, dtype=bool)
+        self.src_hash = src_hash
+        self.target_hash = target_hash
+
+    @classmethod
+    def build(cls, src_points, src_cells, target_points, src_hash=None, target_hash=None):
+        """Monta o operador localizando os pontos de destino na malha de origem"""
+        if src_hash is None:
+            src_hash = mesh_hash(src_points, src_cells)
+        if target_hash is None:
+            target_hash = mesh_hash(target_points)
+        W, inside = build_interpolation_weights(src_points, src_cells, target_points)
+        return cls(W, inside, src_hash, target_hash)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def apply(self, field):
+        """Interpola um campo [n_origem] ou vários campos [n_origem, campo]"""
+        return self.matrix @ np.asarray(field, dtype=float)
+
+    __call__ = apply
+
+    @staticmethod
+    def cache_path(src_hash, target_hash, cache_dir=INTERP_CACHE_DIR):
+        """Caminho do arquivo do operador no cache em disco"""
+        return os.path.join(cache_dir, f"interp_{src_hash[:16]}_{target_hash[:16]}.npz")
+
+    def save(self, filename):
+        """Salva o operador em formato .npz (CSR + máscara + hashes)"""
+        directory = os.path.dirname(filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Escreve em arquivo temporário e renomeia: leitores nunca veem arquivo parcial
+        tmp_file = filename + '.tmp.npz'
+        np.savez(
+            tmp_file,
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape),
+            inside=self.inside,
+            src_hash=np.array(self.src_hash),
+            target_hash=np.array(self.target_hash),
+        )
+        os.replace(tmp_file, filename)
+
+    @classmethod
+    def load(cls, filename):
+        """Carrega um operador salvo com save()"""
+        from scipy import sparse
+
+        with np.load(filename) as data:
+            matrix = sparse.csr_matrix(
+                (data['data'], data['indices'], data['indptr']),
+                shape=tuple(data['shape']),
+            )
+            return cls(matrix, data['inside'], str(data['src_hash']), str(data['target_hash']))
+
+    @classmethod
+    def get_or_build(cls, src, target_points, target_hash=None, cache_dir=INTERP_CACHE_DIR):
+        """
+        Retorna o operador de src (dict de load_case_mesh) para target_points
+
+        Procura primeiro no cache em memória, depois no disco (se cache_dir não
+        for None); só monta o operador se não houver nenhum dos dois.
+        """
+        if target_hash is None:
+            target_hash = mesh_hash(target_points)
+        key = (src['hash'], target_hash)
+
+        if key in _OPERATOR_CACHE:
+            return _OPERATOR_CACHE[key]
+
+        operator = None
+        if cache_dir is not None:
+            filename = cls.cache_path(src['hash'], target_hash, cache_dir)
+            if os.path.exists(filename):
+                operator = cls.load(filename)
+                if (operator.src_hash, operator.target_hash) != key:
+                    operator = None
+
+        if operator is None:
+            operator = cls.build(src['points'], src['cells'], target_points,
+                                 src['hash'], target_hash)
+            if cache_dir is not None:
+                operator.save(cls.cache_path(src['hash'], target_hash, cache_dir))
+
+        _OPERATOR_CACHE[key] = operator
+        return operator
+
+
+def reference_grid(cases):
+    """
+    Grade de referência comum: nós do caso de menor domínio que estão dentro
+    da interseção dos domínios de todos os casos
+
+    Returns:
+        points: matriz [ponto, 2]
+        bounds: (x_min, x_max, y_min, y_max) da interseção
+    """
+    mins = np.array([c['points'].min(axis=0) for c in cases])
+    maxs = np.array([c['points'].max(axis=0) for c in cases])
+    lo = mins.max(axis=0)
+    hi = maxs.min(axis=0)
+
+    areas = np.prod(maxs - mins, axis=1)
+    base = cases[int(np.argmin(areas))]['points']
+
+    mask = np.all((base >= lo - 1e-12) & (base <= hi + 1e-12), axis=1)
+    return base[mask], (lo[0], hi[0], lo[1], hi[1])
+
+
+def compare_fields_all_cases(vtu_files, columns=FIELD_COLUMNS, cache_dir=INTERP_CACHE_DIR):
+    """
+    Compara os campos completos entre casos consecutivos em malhas diferentes
+
+    Todos os casos são reamostrados na grade de referência (interseção dos
+    domínios) por um InterpolationOperator (produto matriz esparsa-vetor,
+    reaproveitado do cache quando já existe); as diferenças e normas de
+    todos os pares consecutivos são calculadas com operações de array.
+
+    Args:
+        vtu_files: lista de arquivos VTU (ordem dos casos)
+        columns: campos a comparar
+        cache_dir: diretório do cache de operadores (None = só em memória)
+
+    Returns:
+        df_norms: DataFrame com L2 (RMS) e Linf de cada par e campo
+        data: dict com 'points' da grade de referência, 'resampled'
+              [caso, ponto, campo] e 'diffs' [par, ponto, campo]
+    """
+    import pandas as pd
+
+    cases = [load_case_mesh(f, columns) for f in vtu_files]
+    ref_points, bounds = reference_grid(cases)
+    ref_hash = mesh_hash(ref_points)
+
+    resampled = np.empty((len(cases), len(ref_points), len(columns)))
+    for i, case in enumerate(cases):
+        operator = InterpolationOperator.get_or_build(case, ref_points, ref_hash, cache_dir)
+        resampled[i] = operator.apply(case['fields'])
+
+    diffs = resampled[1:] - resampled[:-1]
+    l2 = np.sqrt(np.mean(diffs ** 2, axis=1))
+    linf = np.abs(diffs).max(axis=1, initial=0.0)
+
+    labels = [os.path.basename(f).replace('flow_', '').replace('.vtu', '') for f in vtu_files]
+    rows = []
+    for p in range(len(diffs)):
+        row = {'Par': f'{labels[p]} → {labels[p + 1]}'}
+        for k, column in enumerate(columns):
+            row[f'L2_{column}'] = l2[p, k]
+            row[f'Linf_{column}'] = linf[p, k]
+        rows.append(row)
+
+    data = {
+        'points': ref_points,
+        'bounds': bounds,
+        'resampled': resampled,
+        'diffs': diffs,
+        'columns': list(columns),
+        'labels': labels,
+    }
+    return pd.DataFrame(rows), data
+
+
+def compare_directory(work_dir, plot=True):
+    """
+    Compara a pressão ao longo da linha (-0.02, 0) → (0, 0) entre os casos
+    flow_d*.vtu de um diretório (e o campo completo, se houver mais de um)
     
-    # Verifica se o diretório existe
-    if not os.path.exists(work_dir):
-        print(f"\n✗ ERRO: Diretório não encontrado!")
-        return
+    Salva pressure_comparison_line.csv e field_difference_norms.csv em
+    work_dir; com plot=True também os gráficos.
     
-    # Encontra arquivos VTU (ordenados por nome)
-    vtu_pattern = os.path.join(work_dir, 'flow_d*.vtu')
-    vtu_files = sorted(glob.glob(vtu_pattern))
+    Returns:
+        (df_results, dataframes), ou None se não há arquivos VTU
+    """
+    from artifact_store import find_artifacts
+
+    # Encontra arquivos VTU (ordenados por nome; inclui os arquivados em .aedz)
+    vtu_files = find_artifacts(os.path.join(work_dir, 'flow_d*.vtu'))
     
     if not vtu_files:
         print(f"\n✗ Nenhum arquivo flow_d*.vtu encontrado em {work_dir}!")
         print("  Execute o script run_su2_batch.py primeiro.")
-        return
+        return None
     
     print(f"\n✓ Encontrados {len(vtu_files)} arquivos:")
     for i, f in enumerate(vtu_files):
         print(f"  {i}: {f}")
-    
+
+    # Bibliotecas pesadas só agora (cancelar o menu é instantâneo)
+    import pandas as pd
+    from read_vtu import read_vtu
+
     # Lista para armazenar DataFrames
     print("\n" + "=" * 70)
     print("Lendo arquivos VTU...")
@@ -183,7 +500,7 @@ def main():
     
     for i, vtu_file in enumerate(vtu_files):
         print(f"[{i+1}/{len(vtu_files)}] Lendo: {vtu_file}")
-        df = read_vtu(vtu_file)
+        df = read_vtu(vtu_file, columns=['Pressure'])
         dataframes.append(df)
         
         # Extrai label do arquivo
@@ -252,6 +569,20 @@ def main():
         print(f"  Mínimo:     {np.min(diff_values):+.6f} Pa")
         print(f"  Máximo:     {np.max(diff_values):+.6f} Pa")
     
+    # Comparação de campo completo (interseção dos domínios)
+    if len(vtu_files) > 1:
+        print("\n" + "=" * 70)
+        print("COMPARAÇÃO DE CAMPO COMPLETO (interseção dos domínios)")
+        print("=" * 70 + "\n")
+
+        df_norms, field_data = compare_fields_all_cases(vtu_files)
+        print(f"Grade de referência: {len(field_data['points'])} pontos")
+        print(df_norms.to_string(index=False))
+
+        output_norms = os.path.join(work_dir, 'field_difference_norms.csv')
+        df_norms.to_csv(output_norms, index=False)
+        print(f"\n✓ Normas salvas em: {output_norms}")
+
     # Salva resultados em CSV
     output_csv = os.path.join(work_dir, 'pressure_comparison_line.csv')
     df_results.to_csv(output_csv, index=False)
@@ -259,81 +590,124 @@ def main():
     print(f"✓ Resultados salvos em: {output_csv}")
     
     # Plota gráficos
-    print(f"Gerando gráficos...")
+    if plot:
+        import matplotlib.pyplot as plt
+        
+        print(f"Gerando gráficos...")
     
-    # Gráfico 1: Distribuição de pressão em cada caso
-    fig, axes = plt.subplots(2, 1, figsize=(12, 10))
+        # Gráfico 1: Distribuição de pressão em cada caso
+        fig, axes = plt.subplots(2, 1, figsize=(12, 10))
     
-    for i in range(len(dataframes)):
-        axes[0].plot(x_points, all_pressures[i], 'o-', label=f'Caso {i}: {labels[i]}', linewidth=2)
+        for i in range(len(dataframes)):
+            axes[0].plot(x_points, all_pressures[i], 'o-', label=f'Caso {i}: {labels[i]}', linewidth=2)
     
-    axes[0].set_xlabel('X (m)')
-    axes[0].set_ylabel('Pressão (Pa)')
-    axes[0].set_title('Distribuição de Pressão entre (-0.02, 0) e (0, 0)')
-    axes[0].legend()
-    axes[0].grid(True, alpha=0.3)
-    axes[0].axvline(0, color='red', linestyle='--', alpha=0.5, label='Início da placa')
+        axes[0].set_xlabel('X (m)')
+        axes[0].set_ylabel('Pressão (Pa)')
+        axes[0].set_title('Distribuição de Pressão entre (-0.02, 0) e (0, 0)')
+        axes[0].legend()
+        axes[0].grid(True, alpha=0.3)
+        axes[0].axvline(0, color='red', linestyle='--', alpha=0.5, label='Início da placa')
     
-    # Gráfico 2: Diferenças entre casos consecutivos
-    for i in range(1, len(dataframes)):
-        diffs = np.array(all_pressures[i]) - np.array(all_pressures[i-1])
-        axes[1].plot(x_points, diffs, 'o-', 
-                    label=f'Δ (caso {i} - caso {i-1})', linewidth=2)
-    
-    axes[1].axhline(0, color='black', linestyle='--', linewidth=1)
-    axes[1].set_xlabel('X (m)')
-    axes[1].set_ylabel('ΔPressão (Pa)')
-    axes[1].set_title('Diferenças de Pressão entre Casos Consecutivos')
-    axes[1].legend()
-    axes[1].grid(True, alpha=0.3)
-    axes[1].axvline(0, color='red', linestyle='--', alpha=0.5)
-    
-    plt.tight_layout()
-    output_plot = os.path.join(work_dir, 'pressure_comparison_line.png')
-    plt.savefig(output_plot, dpi=150, bbox_inches='tight')
-    print(f"✓ Gráfico salvo em: {output_plot}")
-    
-    # Gráfico 3: Mapa de calor das diferenças
-    if len(dataframes) > 1:
-        fig, ax = plt.subplots(figsize=(14, 6))
-        
-        # Prepara dados para heatmap
-        diff_matrix = []
-        diff_labels = []
-        
+        # Gráfico 2: Diferenças entre casos consecutivos
         for i in range(1, len(dataframes)):
             diffs = np.array(all_pressures[i]) - np.array(all_pressures[i-1])
-            diff_matrix.append(diffs)
-            diff_labels.append(f'{labels[i-1]} → {labels[i]}')
+            axes[1].plot(x_points, diffs, 'o-', 
+                        label=f'Δ (caso {i} - caso {i-1})', linewidth=2)
+    
+        axes[1].axhline(0, color='black', linestyle='--', linewidth=1)
+        axes[1].set_xlabel('X (m)')
+        axes[1].set_ylabel('ΔPressão (Pa)')
+        axes[1].set_title('Diferenças de Pressão entre Casos Consecutivos')
+        axes[1].legend()
+        axes[1].grid(True, alpha=0.3)
+        axes[1].axvline(0, color='red', linestyle='--', alpha=0.5)
+    
+        plt.tight_layout()
+        output_plot = os.path.join(work_dir, 'pressure_comparison_line.png')
+        plt.savefig(output_plot, dpi=150, bbox_inches='tight')
+        print(f"✓ Gráfico salvo em: {output_plot}")
+    
+        # Gráfico 3: Mapa de calor das diferenças
+        if len(dataframes) > 1:
+            fig, ax = plt.subplots(figsize=(14, 6))
         
-        diff_matrix = np.array(diff_matrix)
+            # Prepara dados para heatmap
+            diff_matrix = []
+            diff_labels = []
         
-        im = ax.imshow(diff_matrix, aspect='auto', cmap='RdBu_r', 
-                      extent=[-0.02, 0, len(diff_labels)-0.5, -0.5])
+            for i in range(1, len(dataframes)):
+                diffs = np.array(all_pressures[i]) - np.array(all_pressures[i-1])
+                diff_matrix.append(diffs)
+                diff_labels.append(f'{labels[i-1]} → {labels[i]}')
         
-        ax.set_xlabel('X (m)')
-        ax.set_ylabel('Transição entre casos')
-        ax.set_yticks(range(len(diff_labels)))
-        ax.set_yticklabels(diff_labels)
-        ax.set_title('Mapa de Calor: Diferenças de Pressão')
+            diff_matrix = np.array(diff_matrix)
         
-        cbar = plt.colorbar(im, ax=ax)
-        cbar.set_label('ΔPressão (Pa)', rotation=270, labelpad=20)
+            im = ax.imshow(diff_matrix, aspect='auto', cmap='RdBu_r', 
+                          extent=[-0.02, 0, len(diff_labels)-0.5, -0.5])
         
-        plt.tight_layout()
-        output_heatmap = os.path.join(work_dir, 'pressure_heatmap.png')
-        plt.savefig(output_heatmap, dpi=150, bbox_inches='tight')
-        print(f"✓ Mapa de calor salvo em: {output_heatmap}")
+            ax.set_xlabel('X (m)')
+            ax.set_ylabel('Transição entre casos')
+            ax.set_yticks(range(len(diff_labels)))
+            ax.set_yticklabels(diff_labels)
+            ax.set_title('Mapa de Calor: Diferenças de Pressão')
+        
+            cbar = plt.colorbar(im, ax=ax)
+            cbar.set_label('ΔPressão (Pa)', rotation=270, labelpad=20)
+        
+            plt.tight_layout()
+            output_heatmap = os.path.join(work_dir, 'pressure_heatmap.png')
+            plt.savefig(output_heatmap, dpi=150, bbox_inches='tight')
+            print(f"✓ Mapa de calor salvo em: {output_heatmap}")
+        
+        plt.close('all')
     
     print("\n" + "=" * 70)
     print("✓ Análise concluída!")
     print("=" * 70 + "\n")
     
-    plt.close('all')
-    
     return df_results, dataframes
 
 
+def main():
+    """Função principal - Analisa pressão entre (-0.02, 0) e (0, 0)"""
+    
+    print("\n" + "=" * 70)
+    print(" " * 15 + "COMPARAÇÃO DE PRESSÃO ENTRE CASOS")
+    print(" " * 18 + "Linha: (-0.02, 0) até (0, 0)")
+    print("=" * 70)
+    
+    # Menu de escolha de diretório
+    print("\nEscolha o diretório para analisar:")
+    print("1. Análise Horizontal (variando x_inlet)")
+    print("2. Análise Vertical (variando H_dom)")
+    print("3. Diretório atual")
+    
+    choice = input("\nEscolha (1-3): ").strip()
+    
+    if choice == '1':
+        work_dir = DIR_HORIZONTAL
+        analysis_type = "Horizontal"
+    elif choice == '2':
+        work_dir = DIR_VERTICAL
+        analysis_type = "Vertical"
+    elif choice == '3':
+        work_dir = BASE_DIR
+        analysis_type = "Diretório atual"
+    else:
+        print("Opção inválida!")
+        return
+    
+    print(f"\nTipo de análise: {analysis_type}")
+    print(f"Diretório de trabalho: {work_dir}")
+    
+    # Verifica se o diretório existe
+    if not os.path.exists(work_dir):
+        print(f"\n✗ ERRO: Diretório não encontrado!")
+        return
+    
+    return compare_directory(work_dir)
+
+
 if __name__ == "__main__":
     main()
 
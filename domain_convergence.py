@@ -0,0 +1,335 @@
+"""
+Detector automático de independência de domínio (x_inlet / H_dom)
+Autor: Script automatizado
+Data: 2025
+
+A partir do catálogo de casos (history_*, surface_flow_*, flow_*):
+- Extrai Cd final, Cf em estações da placa e pressão em pontos de prova
+- Calcula a sensibilidade de cada grandeza a x_inlet e a H_dom
+- Extrapola o valor de domínio infinito (Richardson, Q(L) = Q_inf + C L^-p)
+- Informa o menor domínio cujo erro relativo fica abaixo da tolerância
+"""
+
+import os
+
+import numpy as np
+
+from analyze_results import parse_mesh_id, load_history
+from blasius import load_plate_surfaces
+from compare_pressure import load_case_mesh, InterpolationOperator, mesh_hash
+
+# Estações ao longo da placa para Cf(x) (m)
+CF_STATIONS = np.array([0.02, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30])
+
+# Pontos de prova de pressão (linha de estagnação antes da placa e sobre a placa)
+PROBE_POINTS = np.array([
+    [-0.02, 0.0],
+    [-0.01, 0.0],
+    [0.0, 0.0],
+    [0.05, 0.0],
+    [0.15, 0.0],
+    [0.30, 0.0],
+])
+
+# Parâmetros de domínio e a grandeza "tamanho" associada a cada um
+PARAMETERS = {
+    'x_inlet': lambda case: abs(case['x_inlet']),
+    'H_dom': lambda case: case['H_dom'],
+}
+
+
+def build_catalog(directory='.'):
+    """
+    Monta o catálogo de casos a partir dos arquivos de um diretório
+
+    Returns:
+        lista de dicts com mesh_id, x_inlet, H_dom e os caminhos (ou None)
+        de history, surface e flow
+    """
+    from artifact_store import artifact_exists, find_artifacts
+
+    catalog = []
+
+    # Inclui os casos arquivados pelo artifact_store ([nome].aedz)
+    for hist_file in find_artifacts(os.path.join(directory, 'history_d*.csv')):
+        x_inlet, H_dom, mesh_id = parse_mesh_id(hist_file)
+        if x_inlet is None:
+            continue
+
+        surface = os.path.join(directory, f'surface_flow_{mesh_id}.vtu')
+        flow = os.path.join(directory, f'flow_{mesh_id}.vtu')
+
+        catalog.append({
+            'mesh_id': mesh_id,
+            'x_inlet': x_inlet,
+            'H_dom': H_dom,
+            'history': hist_file,
+            'surface': surface if artifact_exists(surface) else None,
+            'flow': flow if artifact_exists(flow) else None,
+        })
+
+    return catalog
+
+
+def extract_quantities(catalog, cf_stations=CF_STATIONS, probe_points=PROBE_POINTS):
+    """
+    Extrai as grandezas monitoradas de todos os casos
+
+    Returns:
+        dict nome -> matriz [caso, componente] (NaN quando o arquivo falta):
+        'Cd' (1 componente), 'Cf' (uma por estação), 'P_probe' (uma por ponto)
+    """
+    n = len(catalog)
+    cd = np.full((n, 1), np.nan)
+    cf = np.full((n, len(cf_stations)), np.nan)
+    probes = np.full((n, len(probe_points)), np.nan)
+
+    for i, case in enumerate(catalog):
+        df = load_history(case['history'])
+        if df is not None and len(df):
+            drag_cols = [col for col in df.columns if 'Drag' in col or 'CD' in col]
+            if drag_cols:
+                cd[i, 0] = df[drag_cols[0]].iloc[-1]
+
+    # Cf: todos os casos lidos e interpolados nas estações
+    with_surface = [i for i, case in enumerate(catalog) if case['surface']]
+    if with_surface:
+        x, cf_su2 = load_plate_surfaces([catalog[i]['surface'] for i in with_surface])
+        for row, i in enumerate(with_surface):
+            valid = np.isfinite(x[row])
+            cf[i] = np.interp(cf_stations, x[row, valid], cf_su2[row, valid],
+                              left=np.nan, right=np.nan)
+
+    # Pressão nos pontos de prova: um operador de interpolação por malha (em cache)
+    probe_hash = mesh_hash(probe_points)
+    for i, case in enumerate(catalog):
+        if case['flow']:
+            mesh = load_case_mesh(case['flow'], columns=['Pressure'])
+            operator = InterpolationOperator.get_or_build(mesh, probe_points, probe_hash)
+            values = operator.apply(mesh['fields'][:, 0])
+            probes[i] = np.where(operator.inside, values, np.nan)
+
+    return {'Cd': cd, 'Cf': cf, 'P_probe': probes}
+
+
+def _richardson_exponent(L, Q, p_min=0.05, p_max=10.0, n_iter=60):
+    """
+    Resolve (Q1-Q2)/(Q2-Q3) = (L1^-p - L2^-p)/(L2^-p - L3^-p) em p por bisseção,
+    vetorizado sobre as componentes (colunas de Q)
+
+    Returns:
+        p por componente (NaN onde a sequência não é monótona)
+    """
+    q12 = Q[0] - Q[1]
+    q23 = Q[1] - Q[2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = q12 / q23
+
+    def g(p):
+        a = L[0] ** -p - L[1] ** -p
+        b = L[1] ** -p - L[2] ** -p
+        return a / b - ratio
+
+    lo = np.full(ratio.shape, p_min)
+    hi = np.full(ratio.shape, p_max)
+    g_lo = g(lo)
+    valid = np.isfinite(ratio) & (ratio > 0) & (np.sign(g_lo) != np.sign(g(hi)))
+
+    for _ in range(n_iter):
+        mid = 0.5 * (lo + hi)
+        g_mid = g(mid)
+        left = np.sign(g_mid) == np.sign(g_lo)
+        lo = np.where(left, mid, lo)
+        g_lo = np.where(left, g_mid, g_lo)
+        hi = np.where(left, hi, mid)
+
+    return np.where(valid, 0.5 * (lo + hi), np.nan)
+
+
+def richardson_extrapolate(L, Q):
+    """
+    Extrapola Q(L -> infinito) com os três maiores domínios
+
+    Args:
+        L: tamanhos de domínio crescentes [caso]
+        Q: matriz [caso, componente]
+
+    Returns:
+        q_inf: valor extrapolado por componente (NaN onde a extrapolação não
+               é possível: menos de 3 casos ou expoente não encontrado)
+        p: expoente estimado por componente
+    """
+    L = np.asarray(L, dtype=float)
+    Q = np.asarray(Q, dtype=float)
+
+    if len(L) < 3:
+        return np.full(Q.shape[1:], np.nan), np.full(Q.shape[1:], np.nan)
+
+    L3 = L[-3:]
+    Q3 = Q[-3:]
+    p = _richardson_exponent(L3, Q3)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        c = (Q3[1] - Q3[2]) / (L3[1] ** -p - L3[2] ** -p)
+        q_inf = Q3[2] - c * L3[2] ** -p
+
+    return np.where(np.isfinite(q_inf), q_inf, np.nan), p
+
+
+def convergence_error(L, Q):
+    """
+    Erro relativo de cada caso, por componente
+
+    Onde a extrapolação de Richardson funciona, é o erro em relação ao valor
+    extrapolado. Onde não funciona, cada caso é julgado pela variação
+    relativa até o caso maior seguinte, e o maior caso pela variação do
+    último intervalo (nunca em relação a ele mesmo): se os resultados ainda
+    mudam no fim da varredura, nenhum caso fica dentro da tolerância.
+
+    Args:
+        L: tamanhos de domínio crescentes [caso]
+        Q: matriz [caso, componente]
+
+    Returns:
+        err: matriz [caso, componente] (NaN com um único caso)
+        scale: escala de referência por componente (|q_inf| ou |Q do maior caso|)
+    """
+    Q = np.asarray(Q, dtype=float)
+    q_inf, _ = richardson_extrapolate(L, Q)
+    extrapolated = np.isfinite(q_inf)
+    scale = np.maximum(np.abs(np.where(extrapolated, q_inf, Q[-1])), 1e-12)
+
+    if len(Q) < 2:
+        return np.full(Q.shape, np.nan), scale
+
+    step = np.abs(np.diff(Q, axis=0)) / scale
+    err_step = np.vstack([step, step[-1:]])
+    with np.errstate(invalid='ignore'):
+        err_inf = np.abs(Q - q_inf) / scale
+    return np.where(extrapolated, err_inf, err_step), scale
+
+
+def _sweeps(catalog, parameter):
+    """Agrupa os casos em varreduras: mesmo valor do outro parâmetro, tamanhos distintos"""
+    other = 'H_dom' if parameter == 'x_inlet' else 'x_inlet'
+    groups = {}
+    for i, case in enumerate(catalog):
+        groups.setdefault(round(case[other], 6), []).append(i)
+
+    size = PARAMETERS[parameter]
+    sweeps = []
+    for key, indices in groups.items():
+        if len(indices) >= 2:
+            indices.sort(key=lambda i: size(catalog[i]))
+            sweeps.append((key, indices))
+    return sweeps
+
+
+def analyse_parameter(catalog, quantities, parameter, tol=1e-3):
+    """
+    Sensibilidade e domínio mínimo para um parâmetro (x_inlet ou H_dom)
+
+    Para cada varredura (casos com o outro parâmetro fixo) calcula, por caso,
+    a variação relativa em relação ao caso anterior, a derivada relativa
+    dQ/dL e o erro relativo (convergence_error: em relação ao valor
+    extrapolado ou, sem extrapolação, ao caso maior seguinte). O domínio
+    mínimo é o menor tamanho a partir do qual todos os casos maiores também
+    estão dentro da tolerância, em todas as grandezas.
+
+    Returns:
+        lista de dicts (um por varredura) com 'fixed', 'table' (DataFrame)
+        e 'minimal_size' (None se nenhum caso atende a tolerância)
+    """
+    import pandas as pd
+
+    size = PARAMETERS[parameter]
+    reports = []
+
+    for fixed, indices in _sweeps(catalog, parameter):
+        L = np.array([size(catalog[i]) for i in indices])
+        table = pd.DataFrame({
+            'Caso': [catalog[i]['mesh_id'] for i in indices],
+            parameter: [catalog[i][parameter] for i in indices],
+        })
+        errors = []
+
+        for name, values in quantities.items():
+            Q = values[indices]
+            usable = np.all(np.isfinite(Q), axis=0)
+            if not np.any(usable):
+                continue
+            Q = Q[:, usable]
+
+            err, scale = convergence_error(L, Q)
+            err = np.max(err, axis=1)
+            change = np.concatenate(([np.nan], np.max(np.abs(np.diff(Q, axis=0)) / scale, axis=1)))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sensitivity = np.concatenate(([np.nan], change[1:] / np.diff(L)))
+
+            table[f'{name}_var_rel'] = change
+            table[f'{name}_dQdL_rel'] = sensitivity
+            table[f'{name}_erro_rel'] = err
+            errors.append(err)
+
+        if errors:
+            worst = np.max(errors, axis=0)
+            # ok[k] = caso k e todos os maiores dentro da tolerância
+            # (NaN, com um só caso, nunca está dentro da tolerância)
+            ok = np.flip(np.logical_and.accumulate(np.flip(worst <= tol)))
+            table['erro_max'] = worst
+            table['ok'] = ok
+            minimal = float(L[np.argmax(ok)]) if np.any(ok) else None
+        else:
+            minimal = None
+
+        reports.append({'fixed': fixed, 'table': table, 'minimal_size': minimal})
+
+    return reports
+
+
+def main():
+    """Função principal - detecta o menor domínio independente"""
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "INDEPENDÊNCIA DE DOMÍNIO - x_inlet / H_dom")
+    print("=" * 70 + "\n")
+
+    catalog = build_catalog('.')
+    if len(catalog) < 2:
+        print("✗ São necessários pelo menos 2 casos (history_d*.csv)!")
+        return
+
+    print(f"✓ Casos encontrados: {len(catalog)}")
+
+    tol_str = input("\nTolerância relativa [padrão: 0.001]: ").strip()
+    tol = float(tol_str) if tol_str else 1e-3
+
+    quantities = extract_quantities(catalog)
+
+    n_sweeps = 0
+    for parameter in PARAMETERS:
+        other = 'H_dom' if parameter == 'x_inlet' else 'x_inlet'
+        for report in analyse_parameter(catalog, quantities, parameter, tol):
+            n_sweeps += 1
+            print("\n" + "=" * 70)
+            print(f"Variando {parameter} ({other} = {report['fixed']})")
+            print("=" * 70)
+            print(report['table'].to_string(index=False))
+
+            if report['minimal_size'] is None:
+                print(f"\n✗ Nenhum caso dentro da tolerância {tol:g}: aumente o domínio")
+            else:
+                print(f"\n✓ Domínio mínimo: |{parameter}| = {report['minimal_size']:.4f} m "
+                      f"(tolerância {tol:g})")
+
+            output_csv = f"domain_convergence_{parameter}_{report['fixed']}.csv"
+            report['table'].to_csv(output_csv, index=False)
+            print(f"✓ Tabela salva em: {output_csv}")
+
+    if n_sweeps == 0:
+        print("\n✗ Nenhuma varredura encontrada: são necessários pelo menos 2 casos")
+        print("  com o mesmo H_dom (variando x_inlet) ou o mesmo x_inlet (variando H_dom).")
+
+
+if __name__ == "__main__":
+    main()
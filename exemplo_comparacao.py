@@ -2,10 +2,8 @@
 Exemplo de uso programático da comparação de pressão
 """
 
-import glob
+from artifact_store import find_artifacts
 import numpy as np
-import matplotlib.pyplot as plt
-from read_vtu import read_vtu
 from compare_pressure import find_nearest_point
 
 
@@ -15,13 +13,14 @@ from compare_pressure import find_nearest_point
 
 def exemplo_basico():
     """Exemplo básico: compara pressão em um ponto entre casos"""
-    
+    from read_vtu import read_vtu
+
     print("\n" + "="*70)
     print("EXEMPLO 1: Comparação Básica")
     print("="*70 + "\n")
     
-    # Encontra arquivos VTU
-    vtu_files = sorted(glob.glob('flow_d*.vtu'))
+    # Encontra arquivos VTU (inclusive os arquivados em .aedz)
+    vtu_files = find_artifacts('flow_d*.vtu')
     
     if len(vtu_files) < 2:
         print("✗ Necessário pelo menos 2 arquivos VTU")
@@ -67,13 +66,14 @@ def exemplo_basico():
 
 def exemplo_multiplos_pontos():
     """Exemplo: compara pressão em vários pontos ao longo da placa"""
-    
+    from read_vtu import read_vtu
+
     print("\n" + "="*70)
     print("EXEMPLO 2: Múltiplos Pontos ao Longo da Placa")
     print("="*70 + "\n")
     
     # Encontra arquivos VTU
-    vtu_files = sorted(glob.glob('flow_d*.vtu'))
+    vtu_files = find_artifacts('flow_d*.vtu')
     
     if len(vtu_files) < 2:
         print("✗ Necessário pelo menos 2 arquivos VTU")
@@ -117,13 +117,15 @@ def exemplo_multiplos_pontos():
 
 def exemplo_plotar_diferencas():
     """Exemplo: plota gráfico das diferenças de pressão"""
-    
+    import matplotlib.pyplot as plt
+    from read_vtu import read_vtu
+
     print("\n" + "="*70)
     print("EXEMPLO 3: Gráfico de Diferenças de Pressão")
     print("="*70 + "\n")
     
     # Encontra arquivos VTU
-    vtu_files = sorted(glob.glob('flow_d*.vtu'))
+    vtu_files = find_artifacts('flow_d*.vtu')
     
     if len(vtu_files) < 2:
         print("✗ Necessário pelo menos 2 arquivos VTU")
@@ -198,13 +200,15 @@ def exemplo_plotar_diferencas():
 
 def exemplo_diferencas_ao_longo_placa():
     """Exemplo: plota diferenças de pressão ao longo da placa"""
-    
+    import matplotlib.pyplot as plt
+    from read_vtu import read_vtu
+
     print("\n" + "="*70)
     print("EXEMPLO 4: Diferenças ao Longo da Placa")
     print("="*70 + "\n")
     
     # Encontra arquivos VTU
-    vtu_files = sorted(glob.glob('flow_d*.vtu'))
+    vtu_files = find_artifacts('flow_d*.vtu')
     
     if len(vtu_files) < 2:
         print("✗ Necessário pelo menos 2 arquivos VTU")
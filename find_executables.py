@@ -8,6 +8,8 @@ import os
 import subprocess
 from pathlib import Path
 
+from tool_registry import REGISTRY_FILE, set_tool
+
 def find_in_path(executable_name):
     """Verifica se executável está no PATH do sistema"""
     try:
@@ -203,6 +205,7 @@ def main():
         if works:
             print(f"  ✓ Funcionando corretamente!")
             print(f"    {output.split(chr(10))[0]}")
+            set_tool('gmsh', gmsh_locations[0])
         else:
             print(f"  ⚠ Erro ao executar: {output}")
     else:
@@ -222,6 +225,7 @@ def main():
         works, output = test_executable(su2_locations[0], '-h')
         if works:
             print(f"  ✓ Funcionando corretamente!")
+            set_tool('su2', su2_locations[0])
         else:
             print(f"  ⚠ Erro ao executar: {output}")
     else:
@@ -233,11 +237,9 @@ def main():
     
     print("\n" + "="*70)
     print("\nPróximos passos:")
-    print("  1. Copie os caminhos acima")
-    print("  2. Cole no início dos scripts Python:")
-    print("     - generate_meshes.py")
-    print("     - run_su2_batch.py")
-    print("     - run_parametric_study.py")
+    print(f"  1. Os executáveis que funcionaram foram registrados em {REGISTRY_FILE}")
+    print("     e serão usados por todos os scripts (sem nova busca)")
+    print("  2. Para outro caminho: python tool_registry.py set gmsh|su2 <caminho>")
     print("  3. Execute os scripts normalmente")
     print("="*70 + "\n")
 
@@ -4,11 +4,12 @@ Autor: Script automatizado
 Data: 2025
 """
 
-import numpy as np
 import os
 import subprocess
 import shutil
 from pathlib import Path
+from tool_registry import find_tool, set_tool
+from mesh_planner import RH, RV, snap_parameters, plan_meshes, final_plan, print_plan
 
 # Configurações
 GMSH_PATH = r"C:\Users\ymarc\OneDrive\Desktop\ITA_2025\AED_26\Lab 3\gmsh-4.14.0-Windows64\gmsh.exe"  # Ajuste conforme sua instalação
@@ -21,59 +22,27 @@ DIR_HORIZONTAL = os.path.join(BASE_DIR, "Analise_Horizontal")
 DIR_VERTICAL = os.path.join(BASE_DIR, "Analise_Vertical")
 
 def find_gmsh():
-    """Tenta encontrar o executável do GMSH em locais comuns"""
-    possible_paths = [
-        r"C:\Users\ymarc\OneDrive\Desktop\ITA_2025\AED_26\Lab 3\gmsh-4.14.0-Windows64\gmsh.exe",
-        r"C:\Program Files\gmsh-4.11.1-Windows64\gmsh.exe",
-        r"C:\Program Files\gmsh-4.12.0-Windows64\gmsh.exe",
-        r"C:\Program Files\gmsh-4.13.0-Windows64\gmsh.exe",
-        r"C:\Program Files\gmsh-4.14.0-Windows64\gmsh.exe",
-        r"C:\Program Files (x86)\gmsh-4.11.1-Windows64\gmsh.exe",
-        r"C:\gmsh\gmsh.exe",
-    ]
-    
-    # Verifica se gmsh está no PATH
-    try:
-        result = subprocess.run(['gmsh', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return 'gmsh'
-    except:
-        pass
-    
-    # Verifica caminhos comuns
-    for path in possible_paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
+    """Executável do GMSH (registro em cache do tool_registry.py)"""
+    return find_tool('gmsh', preferred=GMSH_PATH)
 
-def create_geo_file(x_inlet, H_dom, output_geo, choice):
+def create_geo_file(x_inlet, H_dom, output_geo, choice, verbose=True):
     """Cria arquivo .geo com parâmetros especificados"""
 
-    # Cálculo de x_inlet corrigido (progressão horizontal)
-    rh=1.12
-    lh0=0.02/(1+(rh**24))
-    n_h = np.floor(np.log(-x_inlet*(rh-1)/lh0 + 1)/np.log(rh))
-    
-    # Cálculo de H_dom corrigido (progressão vertical)
-    rv=1.2
-    lv0=0.3048/(1+(rv**64))  # Comprimento inicial vertical (baseado no comprimento da placa)
-    n_v = np.floor(np.log(H_dom*(rv-1)/lv0 + 1)/np.log(rv))
-
-    if choice == '1':
-        x_inlet_final = -lh0*(rh**n_h - 1)/(rh-1)
-        H_dom_final = H_dom
-    else:
-        x_inlet_final = x_inlet
-        H_dom_final = lv0*(rv**n_v - 1)/(rv-1)
-    
-    # Printar valores originais e corrigidos
-    print(f"  x_inlet (original) = {x_inlet:.6f}")
-    print(f"  x_inlet_final (corrigido) = {x_inlet_final:.6f}")
-    print(f"  Diferença x_inlet = {abs(x_inlet - x_inlet_final):.6f}")
-    print(f"  H_dom (original) = {H_dom:.6f}")
-    print(f"  H_dom_final (corrigido) = {H_dom_final:.6f}")
-    print(f"  Diferença H_dom = {abs(H_dom - H_dom_final):.6f}")
+    # Ajuste de x_inlet / H_dom à progressão geométrica (ver mesh_planner)
+    rh = RH
+    rv = RV
+    x_inlet_final, H_dom_final, n_h, n_v = snap_parameters(x_inlet, H_dom, choice)
+    x_inlet_final = float(x_inlet_final)
+    H_dom_final = float(H_dom_final)
+    
+    if verbose:
+        # Printar valores originais e corrigidos
+        print(f"  x_inlet (original) = {x_inlet:.6f}")
+        print(f"  x_inlet_final (corrigido) = {x_inlet_final:.6f}")
+        print(f"  Diferença x_inlet = {abs(x_inlet - x_inlet_final):.6f}")
+        print(f"  H_dom (original) = {H_dom:.6f}")
+        print(f"  H_dom_final (corrigido) = {H_dom_final:.6f}")
+        print(f"  Diferença H_dom = {abs(H_dom - H_dom_final):.6f}")
     
     # Template do arquivo .geo
     geo_content = f"""h=1.0;
@@ -122,7 +91,8 @@ Physical Surface ('domain') = {{1}};
     with open(output_geo, 'w') as f:
         f.write(geo_content)
     
-    print(f"  [OK] Arquivo .geo criado com x_inlet={x_inlet}, H_dom={H_dom}")
+    if verbose:
+        print(f"  [OK] Arquivo .geo criado com x_inlet={x_inlet}, H_dom={H_dom}")
     
     # Retorna os valores finais corrigidos para serem usados na nomenclatura do arquivo
     return x_inlet_final, H_dom_final
@@ -170,6 +140,95 @@ def generate_mesh(geo_file, output_su2, gmsh_path):
         print(f"  [X] Erro: GMSH nao encontrado em {gmsh_path}")
         return False
 
+# Valores padrão de cada modo de varredura
+X_INLET_HORIZONTAL = [-0.02, -0.04, -0.06, -0.08, -0.10, -0.12, -0.14, -0.16, -0.18, -0.20,
+                      -0.22, -0.24, -0.26, -0.28, -0.30, -0.32, -0.34, -0.36, -0.38, -0.40]
+H_DOM_HORIZONTAL = 0.03
+X_INLET_VERTICAL = -0.07
+H_DOM_VERTICAL = [0.03, 0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.10, 0.12, 0.14, 0.16, 0.18,
+                  0.20, 0.22, 0.24, 0.26, 0.28, 0.30]
+X_INLET_MATRIX = [-0.02, -0.04, -0.06, -0.08, -0.10, -0.12, -0.14, -0.16]
+H_DOM_MATRIX = [0.01, 0.02, 0.03, 0.04, 0.05]
+
+# Modo de varredura -> opção do menu
+MODES = {'horizontal': '1', 'vertical': '2', 'matriz': '3'}
+
+def sweep_parameters(choice, x_inlet_values=None, H_dom_values=None):
+    """
+    Lista (x_inlet, H_dom, mesh_id) de um modo de varredura
+    
+    Args:
+        choice: '1' (varia x_inlet), '2' (varia H_dom) ou '3' (matriz)
+        x_inlet_values, H_dom_values: substituem os valores padrão do modo;
+            nos modos 1 e 2 o parâmetro fixo usa o primeiro valor da lista
+    """
+    if choice == '1':
+        x_inlet_values = x_inlet_values or X_INLET_HORIZONTAL
+        H_dom_values = (H_dom_values or [H_DOM_HORIZONTAL])[:1]
+    elif choice == '2':
+        x_inlet_values = (x_inlet_values or [X_INLET_VERTICAL])[:1]
+        H_dom_values = H_dom_values or H_DOM_VERTICAL
+    elif choice == '3':
+        x_inlet_values = x_inlet_values or X_INLET_MATRIX
+        H_dom_values = H_dom_values or H_DOM_MATRIX
+    else:
+        raise ValueError(f"Modo de varredura inválido: {choice}")
+    
+    return [(d, h, f"d{int(abs(d)*100):03d}_H{int(h*100):02d}")
+            for d in x_inlet_values for h in H_dom_values]
+
+def output_directory(choice):
+    """(diretório de saída, descrição) do tipo de análise"""
+    if choice == '1':
+        return DIR_HORIZONTAL, "Horizontal (variando x_inlet)"
+    if choice == '2':
+        return DIR_VERTICAL, "Vertical (variando H_dom)"
+    return BASE_DIR, "Combinada"
+
+def generate_all(to_generate, choice, output_dir, gmsh_path, on_result=None):
+    """
+    Gera as malhas do plano (linhas de final_plan) em output_dir
+    
+    Args:
+        on_result: chamada com o dict de cada malha assim que termina
+    
+    Returns:
+        lista de dicts com mesh_id, mesh_id_final, x_inlet, H_dom, file e success
+    """
+    # Cria diretório se não existir
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"\n[OK] Diretório criado: {output_dir}")
+    
+    results = []
+    for i, row in enumerate(to_generate.itertuples(index=False), 1):
+        x_inlet, H_dom, mesh_id = row.x_inlet, row.H_dom, row.mesh_id
+        mesh_id_final = row.mesh_id_final
+        print(f"\n{'#'*60}")
+        print(f"# Malha {i}/{len(to_generate)}: mesh_{mesh_id_final}.su2 (pedido: {mesh_id})")
+        print(f"# x_inlet = {row.x_inlet_final:.4f}, H_dom = {row.H_dom_final:.4f}")
+        print(f"{'#'*60}")
+        
+        # Cria arquivo .geo temporário (valores corrigidos já mostrados no plano)
+        create_geo_file(x_inlet, H_dom, GEO_TEMP, choice, verbose=False)
+        
+        # Gera malha com o nome atualizado no diretório correto
+        output_file = os.path.join(output_dir, f"mesh_{mesh_id_final}.su2")
+        success = generate_mesh(GEO_TEMP, output_file, gmsh_path)
+        
+        if success:
+            # Remove arquivo .geo temporário
+            if os.path.exists(GEO_TEMP):
+                os.remove(GEO_TEMP)
+        
+        result = {'mesh_id': mesh_id, 'mesh_id_final': mesh_id_final,
+                  'x_inlet': float(row.x_inlet_final), 'H_dom': float(row.H_dom_final),
+                  'file': output_file, 'success': success}
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results
+
 def main():
     """Função principal"""
     print("\n" + "="*60)
@@ -187,6 +246,8 @@ def main():
         if not os.path.exists(gmsh_path):
             print(f"[X] Arquivo nao encontrado: {gmsh_path}")
             return
+        # Lembrado nas próximas execuções
+        set_tool('gmsh', gmsh_path)
     
     print(f"[OK] GMSH encontrado: {gmsh_path}\n")
     
@@ -202,41 +263,11 @@ def main():
     
     choice = input("\nEscolha (1-4): ").strip()
     
-    parameters = []
-    
-    if choice == '1':
-        # Variar x_inlet
-        x_inlet_values = [-0.02, -0.04, -0.06, -0.08, -0.10, -0.12, -0.14, -0.16, -0.18, -0.20, -0.22, -0.24, -0.26, -0.28, -0.30, -0.32, -0.34, -0.36, -0.38, -0.40]
-        H_dom = 0.03
-        
-        for d in x_inlet_values:
-            d_str = f"{abs(d):.2f}".replace('.', '').replace('0', '')
-            if d_str == '':
-                d_str = '0'
-            mesh_id = f"d{int(abs(d)*100):03d}_H{int(H_dom*100):02d}"
-            parameters.append((d, H_dom, mesh_id))
-    
-    elif choice == '2':
-        # Variar H_dom (mantendo x_inlet fixo em -0.07)
-        x_inlet = -0.07
-        H_dom_values = [0.03, 0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.10, 0.12, 0.14, 0.16, 0.18, 0.20, 0.22, 0.24, 0.26, 0.28, 0.30]
-        
-        for h in H_dom_values:
-            mesh_id = f"d{int(abs(x_inlet)*100):03d}_H{int(h*100):02d}"
-            parameters.append((x_inlet, h, mesh_id))
-    
-    elif choice == '3':
-        # Variar ambos
-        x_inlet_values = [-0.02, -0.04, -0.06, -0.08, -0.10, -0.12, -0.14, -0.16]
-        H_dom_values = [0.01, 0.02, 0.03, 0.04, 0.05]
-        
-        for d in x_inlet_values:
-            for h in H_dom_values:
-                mesh_id = f"d{int(abs(d)*100):03d}_H{int(h*100):02d}"
-                parameters.append((d, h, mesh_id))
-    
+    if choice in MODES.values():
+        parameters = sweep_parameters(choice)
     elif choice == '4':
         # Manual
+        parameters = []
         print("\nDefina os parâmetros (digite 'fim' para encerrar):")
         while True:
             try:
@@ -260,28 +291,22 @@ def main():
         print("Nenhum parâmetro definido!")
         return
     
+    # Plano final: ajuste vetorizado, remoção de duplicatas e custo estimado
+    plan = plan_meshes(parameters, choice)
+    to_generate = final_plan(plan)
+    
     # Mostra resumo
     print(f"\n{'='*60}")
-    print(f"Malhas a serem geradas: {len(parameters)}")
+    print(f"Malhas a serem geradas: {len(to_generate)} (de {len(parameters)} pedidas)")
     print(f"{'='*60}")
-    for i, (d, h, mesh_id) in enumerate(parameters, 1):
-        print(f"  {i}. mesh_{mesh_id}.su2 (x_inlet={d:.4f}, H_dom={h:.4f})")
+    print_plan(plan)
     
-    # Define diretório de saída baseado no tipo de análise
-    if choice == '1':
-        output_dir = DIR_HORIZONTAL
-        analysis_type = "Horizontal (variando x_inlet)"
-    elif choice == '2':
-        output_dir = DIR_VERTICAL
-        analysis_type = "Vertical (variando H_dom)"
-    else:
-        output_dir = BASE_DIR
-        analysis_type = "Combinada"
+    if len(to_generate) == 0:
+        print("\nNenhuma malha válida no plano!")
+        return
     
-    # Cria diretório se não existir
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        print(f"\n[OK] Diretório criado: {output_dir}")
+    # Define diretório de saída baseado no tipo de análise
+    output_dir, analysis_type = output_directory(choice)
     
     print(f"\nTipo de análise: {analysis_type}")
     print(f"Diretório de saída: {output_dir}")
@@ -293,33 +318,9 @@ def main():
         return
     
     # Gera as malhas
-    success_count = 0
-    fail_count = 0
-    
-    for i, (x_inlet, H_dom, mesh_id) in enumerate(parameters, 1):
-        print(f"\n{'#'*60}")
-        print(f"# Malha {i}/{len(parameters)}: mesh_{mesh_id}.su2")
-        print(f"# x_inlet = {x_inlet:.4f}, H_dom = {H_dom:.4f}")
-        print(f"{'#'*60}")
-        
-        # Cria arquivo .geo temporário e obtém valores corrigidos
-        x_inlet_final, H_dom_final = create_geo_file(x_inlet, H_dom, GEO_TEMP, choice)
-        
-        # Atualiza mesh_id com os valores corrigidos
-        mesh_id_final = f"d{int(abs(x_inlet_final)*100):03d}_H{int(H_dom_final*100):02d}"
-        print(f"  mesh_id atualizado: {mesh_id} -> {mesh_id_final}")
-        
-        # Gera malha com o nome atualizado no diretório correto
-        output_file = os.path.join(output_dir, f"mesh_{mesh_id_final}.su2")
-        success = generate_mesh(GEO_TEMP, output_file, gmsh_path)
-        
-        if success:
-            success_count += 1
-            # Remove arquivo .geo temporário
-            if os.path.exists(GEO_TEMP):
-                os.remove(GEO_TEMP)
-        else:
-            fail_count += 1
+    results = generate_all(to_generate, choice, output_dir, gmsh_path)
+    success_count = sum(r['success'] for r in results)
+    fail_count = len(results) - success_count
     
     # Relatório final
     print(f"\n\n{'='*60}")
@@ -0,0 +1,177 @@
+"""
+Planejador vetorizado dos parâmetros de malha (ajuste à progressão geométrica)
+Autor: Script automatizado
+Data: 2025
+
+O create_geo_file ajusta x_inlet (modo horizontal) ou H_dom (demais modos)
+para que o domínio termine exatamente em um nó da progressão geométrica.
+Este módulo faz o mesmo ajuste para arrays inteiros de parâmetros, remove
+parâmetros que resultam na mesma geometria, estima nós/células/memória de
+cada caso e produz o plano final antes de qualquer malha ser gerada.
+"""
+
+import numpy as np
+
+# Progressão horizontal (curvas 1 e 5, antes da placa)
+RH = 1.12
+LH0 = 0.02 / (1 + (RH**24))
+
+# Progressão vertical (curvas 3 e 6)
+RV = 1.2
+LV0 = 0.3048 / (1 + (RV**64))  # Comprimento inicial vertical (baseado no comprimento da placa)
+
+# Número de nós das curvas sobre a placa (curvas 2 e 4)
+N_PLATE = 41
+
+# Estimativa de memória do SU2 (NAVIER_STOKES 2D implícito): base + por nó
+SU2_BASE_MEMORY = 150 * 1024**2
+SU2_BYTES_PER_NODE = 4 * 1024
+
+
+def snap_parameters(x_inlet, H_dom, choice):
+    """
+    Ajuste vetorizado de x_inlet / H_dom à progressão geométrica
+
+    Mesma regra do create_geo_file: no modo '1' x_inlet é ajustado e H_dom
+    mantido; nos demais modos H_dom é ajustado e x_inlet mantido. n_h e n_v
+    são sempre calculados a partir dos valores pedidos.
+
+    Args:
+        x_inlet, H_dom: escalares ou arrays (com broadcasting)
+        choice: modo do generate_meshes ('1', '2', '3' ou '4')
+
+    Returns:
+        x_inlet_final, H_dom_final, n_h, n_v (arrays; n_h/n_v inteiros)
+    """
+    x_inlet = np.asarray(x_inlet, dtype=float)
+    H_dom = np.asarray(H_dom, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_h = np.floor(np.log(-x_inlet*(RH-1)/LH0 + 1)/np.log(RH))
+        n_v = np.floor(np.log(H_dom*(RV-1)/LV0 + 1)/np.log(RV))
+
+    if choice == '1':
+        x_inlet_final = -LH0*(RH**n_h - 1)/(RH-1)
+        H_dom_final = np.broadcast_to(H_dom, x_inlet_final.shape).astype(float)
+    else:
+        H_dom_final = LV0*(RV**n_v - 1)/(RV-1)
+        x_inlet_final = np.broadcast_to(x_inlet, H_dom_final.shape).astype(float)
+
+    n_h = np.nan_to_num(n_h, nan=0.0, neginf=0.0).astype(np.int64)
+    n_v = np.nan_to_num(n_v, nan=0.0, neginf=0.0).astype(np.int64)
+    return x_inlet_final, H_dom_final, n_h, n_v
+
+
+def mesh_ids(x_inlet, H_dom):
+    """Identificadores d[XXX]_H[YY] (mesma regra do generate_meshes)"""
+    return [f"d{int(abs(x)*100):03d}_H{int(h*100):02d}"
+            for x, h in zip(np.ravel(x_inlet), np.ravel(H_dom))]
+
+
+def mesh_size(n_h, n_v):
+    """
+    Nós e células da malha transfinita para n_h (curva 1) e n_v (curva 3)
+
+    Linha inferior: curva 1 (n_h nós) + curva 2 (N_PLATE nós), com um nó em comum.
+    """
+    n_h = np.asarray(n_h)
+    n_v = np.asarray(n_v)
+    n_i = n_h + N_PLATE - 1
+    nodes = n_i * n_v
+    cells = np.maximum(n_i - 1, 0) * np.maximum(n_v - 1, 0)
+    return nodes, cells
+
+
+def estimate_memory(nodes):
+    """Memória estimada do SU2 (bytes) para uma malha com 'nodes' nós"""
+    return SU2_BASE_MEMORY + SU2_BYTES_PER_NODE * np.asarray(nodes)
+
+
+def plan_meshes(parameters, choice):
+    """
+    Monta o plano final de malhas a partir da lista de parâmetros
+
+    Args:
+        parameters: lista de (x_inlet, H_dom, mesh_id) como no generate_meshes
+        choice: modo do generate_meshes
+
+    Returns:
+        DataFrame com uma linha por parâmetro pedido e as colunas:
+        x_inlet, H_dom, mesh_id (pedidos), x_inlet_final, H_dom_final, n_h,
+        n_v, mesh_id_final, nodes, cells, memory_mb, valid (n_h, n_v >= 2),
+        duplicate (mesma geometria de uma linha anterior) e id_conflict
+        (geometria diferente com o mesmo mesh_id_final de uma linha anterior:
+        o arquivo e os resultados seriam sobrescritos, então a linha é
+        descartada e só a primeira geometria com esse ID é gerada)
+    """
+    import pandas as pd
+
+    if not parameters:
+        return pd.DataFrame(columns=[
+            'x_inlet', 'H_dom', 'mesh_id', 'x_inlet_final', 'H_dom_final', 'n_h', 'n_v',
+            'mesh_id_final', 'nodes', 'cells', 'memory_mb', 'valid', 'duplicate', 'id_conflict'])
+
+    x_req = np.array([p[0] for p in parameters], dtype=float)
+    H_req = np.array([p[1] for p in parameters], dtype=float)
+
+    x_final, H_final, n_h, n_v = snap_parameters(x_req, H_req, choice)
+    nodes, cells = mesh_size(n_h, n_v)
+
+    plan = pd.DataFrame({
+        'x_inlet': x_req,
+        'H_dom': H_req,
+        'mesh_id': [p[2] for p in parameters],
+        'x_inlet_final': x_final,
+        'H_dom_final': H_final,
+        'n_h': n_h,
+        'n_v': n_v,
+        'mesh_id_final': mesh_ids(x_final, H_final),
+        'nodes': nodes,
+        'cells': cells,
+        'memory_mb': estimate_memory(nodes) / 1024**2,
+        'valid': (n_h >= 2) & (n_v >= 2),
+    })
+
+    # Mesma geometria: mesmos valores finais e mesmas discretizações
+    geometry = pd.DataFrame({
+        'x': np.round(x_final, 12), 'H': np.round(H_final, 12), 'n_h': n_h, 'n_v': n_v})
+    plan['duplicate'] = geometry.duplicated().values
+
+    # O mesh_id tem resolução de 1 cm: geometrias diferentes podem cair no mesmo ID
+    candidates = plan['valid'] & ~plan['duplicate']
+    plan['id_conflict'] = candidates & plan['mesh_id_final'].where(candidates).duplicated()
+
+    return plan
+
+
+def final_plan(plan):
+    """Linhas do plano que realmente serão geradas (válidas, sem duplicatas e com mesh_id único)"""
+    return plan[plan['valid'] & ~plan['duplicate'] & ~plan['id_conflict']]
+
+
+def print_plan(plan):
+    """Imprime o plano e o resumo (casos únicos, duplicatas, custo estimado)"""
+    to_run = final_plan(plan)
+
+    print(f"\n{'Pedido':<10} {'x_final':<10} {'H_final':<10} {'n_h':>4} {'n_v':>4} "
+          f"{'Nós':>8} {'Mem(MB)':>8}  {'Mesh ID':<12} Status")
+    print("-" * 86)
+    for _, row in plan.iterrows():
+        if not row['valid']:
+            status = "✗ inválida (n_h/n_v < 2)"
+        elif row['duplicate']:
+            status = "= duplicata"
+        elif row['id_conflict']:
+            status = "✗ mesh_id repetido (descartada)"
+        else:
+            status = "✓"
+        print(f"{row['mesh_id']:<10} {row['x_inlet_final']:<10.5f} {row['H_dom_final']:<10.5f} "
+              f"{row['n_h']:>4} {row['n_v']:>4} {row['nodes']:>8} {row['memory_mb']:>8.0f}  "
+              f"{row['mesh_id_final']:<12} {status}")
+
+    print("-" * 86)
+    print(f"Pedidos: {len(plan)}  |  Únicos: {len(to_run)}  |  "
+          f"Duplicatas: {int(plan['duplicate'].sum())}  |  Inválidos: {int((~plan['valid']).sum())}  |  "
+          f"ID repetido: {int(plan['id_conflict'].sum())}")
+    print(f"Total de nós: {int(to_run['nodes'].sum())}  |  "
+          f"Maior caso: {to_run['memory_mb'].max() if len(to_run) else 0:.0f} MB (estimado)")
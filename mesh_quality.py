@@ -0,0 +1,296 @@
+"""
+Verificação de qualidade das malhas antes de rodar o SU2
+Autor: Script automatizado
+Data: 2025
+
+Calcula, para todas as células de uma malha .su2 de uma vez (NumPy):
+- skewness (equiangular)
+- razão de aspecto (maior / menor aresta)
+- razão de expansão (maior razão de tamanho para as células vizinhas)
+- y+ da primeira célula em cada nó da placa, estimado com o Cf de Blasius
+  e o Reynolds do lam_flatplate.cfg
+
+e classifica a malha em aprovada, com avisos ou rejeitada, para que uma
+malha degenerada (ex.: n_h muito pequeno para |x_inlet| pequeno) não custe
+uma execução inteira do SU2.
+"""
+
+import os
+
+import numpy as np
+
+from blasius import read_reynolds, blasius_cf, CONFIG_FILE
+from su2_config import load_config
+from su2_mesh import (read_su2_mesh, cell_groups, edge_lengths, polygon_area,
+                      cell_adjacency, wall_spacing, WALL_MARKER)
+
+# Ângulo ideal por número de nós da célula (triângulo, quadrilátero)
+IDEAL_ANGLE = {3: 60.0, 4: 90.0}
+
+# Limites: acima de *_WARN a malha é sinalizada, acima de *_MAX é rejeitada
+SKEWNESS_WARN = 0.85
+SKEWNESS_MAX = 0.98
+ASPECT_RATIO_WARN = 1e5
+EXPANSION_WARN = 2.0
+EXPANSION_MAX = 5.0
+YPLUS_WARN = 2.0
+YPLUS_MAX = 10.0
+MIN_PLATE_NODES = 10
+
+# Mach acima do qual a estimativa incompressível de y+ é só indicativa
+MACH_INCOMPRESSIBLE = 0.3
+
+
+def read_flow_conditions(config_file=CONFIG_FILE):
+    """
+    Condições do escoamento e marcadores usados pela verificação
+
+    Returns:
+        dict com reynolds_number, reynolds_length, mach e markers (nomes dos
+        contornos declarados em MARKER_HEATFLUX/SYM/INLET/OUTLET/...)
+    """
+    reynolds_number, reynolds_length = read_reynolds(config_file)
+    config = load_config(config_file)
+    mach = config.get('MACH_NUMBER')
+
+    markers = []
+    for key in ('MARKER_HEATFLUX', 'MARKER_ISOTHERMAL', 'MARKER_EULER', 'MARKER_SYM',
+                'MARKER_INLET', 'MARKER_OUTLET', 'MARKER_FAR'):
+        value = config.get(key)
+        name = value[0] if isinstance(value, tuple) and value else value
+        if name is not None and name != 'NONE':
+            markers.append(str(name))
+
+    return {
+        'reynolds_number': reynolds_number,
+        'reynolds_length': reynolds_length,
+        'mach': float(mach) if mach is not None else None,
+        'markers': markers,
+    }
+
+
+def cell_skewness(points, nodes):
+    """
+    Skewness equiangular de cada célula [célula]
+
+    max((θmax - θe) / (180 - θe), (θe - θmin) / θe), com θe = 60° para
+    triângulos e 90° para quadriláteros (0 = ideal, 1 = degenerada)
+    """
+    p = points[nodes]
+    to_next = np.roll(p, -1, axis=1) - p
+    to_prev = np.roll(p, 1, axis=1) - p
+    dot = np.sum(to_next * to_prev, axis=-1)
+    cross = to_next[..., 0] * to_prev[..., 1] - to_next[..., 1] * to_prev[..., 0]
+    angles = np.degrees(np.arctan2(np.abs(cross), dot))
+
+    ideal = IDEAL_ANGLE.get(nodes.shape[1], 180.0 * (nodes.shape[1] - 2) / nodes.shape[1])
+    return np.maximum((angles.max(axis=1) - ideal) / (180.0 - ideal),
+                      (ideal - angles.min(axis=1)) / ideal)
+
+
+def analyze_mesh(mesh, conditions, wall=WALL_MARKER):
+    """
+    Métricas de qualidade de todas as células e y+ na parede
+
+    Returns:
+        dict com arrays por célula 'skewness', 'aspect_ratio', 'expansion',
+        'area', e na parede 'wall_x', 'wall_spacing', 'yplus'
+    """
+    points = mesh['points']
+    n_cells = len(mesh['types'])
+    skewness = np.zeros(n_cells)
+    aspect = np.zeros(n_cells)
+    area = np.zeros(n_cells)
+
+    for cell_ids, nodes in cell_groups(mesh):
+        lengths = edge_lengths(points, nodes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            aspect[cell_ids] = lengths.max(axis=1) / lengths.min(axis=1)
+        skewness[cell_ids] = cell_skewness(points, nodes)
+        area[cell_ids] = polygon_area(points, nodes)
+
+    # Expansão: maior razão de tamanho (raiz da área) entre a célula e as vizinhas
+    size = np.sqrt(np.abs(area))
+    pairs = cell_adjacency(mesh)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.maximum(size[pairs[:, 0]], size[pairs[:, 1]]) / \
+            np.minimum(size[pairs[:, 0]], size[pairs[:, 1]])
+    expansion = np.ones(n_cells)
+    np.maximum.at(expansion, pairs[:, 0], ratio)
+    np.maximum.at(expansion, pairs[:, 1], ratio)
+
+    result = {
+        'skewness': skewness,
+        'aspect_ratio': aspect,
+        'expansion': expansion,
+        'area': area,
+        'wall_x': np.zeros(0),
+        'wall_spacing': np.zeros(0),
+        'yplus': np.zeros(0),
+    }
+
+    if wall in mesh['markers']:
+        wall_nodes, spacing = wall_spacing(mesh, wall)
+        x = points[wall_nodes, 0] - points[wall_nodes, 0].min()
+        # y+ = Δy u_tau / ν = Δy (Re / L) sqrt(Cf / 2)
+        cf = blasius_cf(x, conditions['reynolds_number'], conditions['reynolds_length'])
+        yplus = spacing * conditions['reynolds_number'] / conditions['reynolds_length'] * np.sqrt(cf / 2)
+        order = np.argsort(x)
+        result['wall_x'] = x[order]
+        result['wall_spacing'] = spacing[order]
+        result['yplus'] = yplus[order]
+
+    return result
+
+
+def preflight(mesh_file, conditions=None, wall=WALL_MARKER):
+    """
+    Verifica uma malha antes do SU2
+
+    Args:
+        mesh_file: caminho do .su2
+        conditions: resultado de read_flow_conditions (lido do
+                    lam_flatplate.cfg se None)
+
+    Returns:
+        dict com 'status' ('ok', 'aviso' ou 'rejeitada'), 'errors' e
+        'warnings' (listas de mensagens) e 'summary' (valores máximos)
+    """
+    if conditions is None:
+        conditions = read_flow_conditions()
+
+    errors = []
+    warnings = []
+
+    try:
+        mesh = read_su2_mesh(mesh_file)
+    except Exception as e:
+        return {'status': 'rejeitada', 'errors': [f"Malha ilegível: {e}"],
+                'warnings': [], 'summary': {}}
+
+    if len(mesh['types']) == 0 or mesh['points'] is None or len(mesh['points']) == 0:
+        return {'status': 'rejeitada', 'errors': ["Malha sem células ou sem nós"],
+                'warnings': [], 'summary': {}}
+
+    missing = [m for m in conditions['markers'] if m not in mesh['markers']]
+    if missing:
+        errors.append(f"Marcadores do .cfg ausentes na malha: {', '.join(missing)}")
+
+    metrics = analyze_mesh(mesh, conditions, wall)
+
+    # Células com área nula ou orientação oposta à maioria (invertidas)
+    area = metrics['area']
+    orientation = np.sign(np.median(area)) or 1.0
+    tiny = np.abs(area) <= 1e-14 * np.max(np.abs(area))
+    inverted = (np.sign(area) != orientation) & ~tiny
+    if np.any(tiny):
+        errors.append(f"{int(tiny.sum())} células degeneradas (área nula)")
+    if np.any(inverted):
+        errors.append(f"{int(inverted.sum())} células invertidas")
+
+    valid = ~tiny
+    skew = metrics['skewness'][valid]
+    aspect = metrics['aspect_ratio'][valid]
+    expansion = metrics['expansion'][valid]
+
+    if np.any(skew > SKEWNESS_MAX):
+        errors.append(f"{int(np.sum(skew > SKEWNESS_MAX))} células com skewness > {SKEWNESS_MAX}")
+    elif np.any(skew > SKEWNESS_WARN):
+        warnings.append(f"{int(np.sum(skew > SKEWNESS_WARN))} células com skewness > {SKEWNESS_WARN}")
+
+    if np.max(expansion) > EXPANSION_MAX:
+        errors.append(f"Razão de expansão {np.max(expansion):.2f} > {EXPANSION_MAX}")
+    elif np.max(expansion) > EXPANSION_WARN:
+        warnings.append(f"Razão de expansão {np.max(expansion):.2f} > {EXPANSION_WARN}")
+
+    if np.max(aspect) > ASPECT_RATIO_WARN:
+        warnings.append(f"Razão de aspecto {np.max(aspect):.3g} > {ASPECT_RATIO_WARN:g}")
+
+    yplus = metrics['yplus']
+    yplus_max = float(np.nanmax(yplus)) if np.any(np.isfinite(yplus)) else None
+    if wall not in mesh['markers']:
+        errors.append(f"Marcador da parede '{wall}' ausente")
+    elif len(metrics['wall_x']) < MIN_PLATE_NODES:
+        errors.append(f"Apenas {len(metrics['wall_x'])} nós na placa (mínimo {MIN_PLATE_NODES})")
+    if yplus_max is not None:
+        if yplus_max > YPLUS_MAX:
+            errors.append(f"y+ máximo {yplus_max:.2f} > {YPLUS_MAX}")
+        elif yplus_max > YPLUS_WARN:
+            warnings.append(f"y+ máximo {yplus_max:.2f} > {YPLUS_WARN}")
+    if conditions['mach'] is not None and conditions['mach'] > MACH_INCOMPRESSIBLE:
+        warnings.append(f"Mach {conditions['mach']:g}: estimativa de y+ incompressível é aproximada")
+
+    summary = {
+        'n_points': int(len(mesh['points'])),
+        'n_cells': int(len(mesh['types'])),
+        'max_skewness': float(skew.max()) if len(skew) else None,
+        'max_aspect_ratio': float(aspect.max()) if len(aspect) else None,
+        'max_expansion': float(expansion.max()) if len(expansion) else None,
+        'max_yplus': yplus_max,
+    }
+
+    status = 'rejeitada' if errors else ('aviso' if warnings else 'ok')
+    return {'status': status, 'errors': errors, 'warnings': warnings, 'summary': summary}
+
+
+def preflight_all(mesh_files, config_file=CONFIG_FILE):
+    """
+    Verifica várias malhas
+
+    Returns:
+        accepted: malhas aprovadas (com ou sem avisos), na ordem recebida
+        reports: dict caminho -> resultado de preflight
+    """
+    conditions = read_flow_conditions(config_file)
+    reports = {mesh_file: preflight(mesh_file, conditions) for mesh_file in mesh_files}
+    accepted = [m for m in mesh_files if reports[m]['status'] != 'rejeitada']
+    return accepted, reports
+
+
+def print_reports(reports):
+    """Resumo da verificação de qualidade"""
+    print(f"\n{'Malha':<28} {'Skew máx':>9} {'AR máx':>9} {'Expansão':>9} {'y+ máx':>8}  Status")
+    print("-" * 80)
+    for mesh_file, report in reports.items():
+        s = report['summary']
+
+        def fmt(key, spec):
+            return format(s[key], spec) if s.get(key) is not None else format(float('nan'), spec)
+
+        marker = {'ok': '✓', 'aviso': '⚠', 'rejeitada': '✗'}[report['status']]
+        print(f"{os.path.basename(mesh_file):<28} {fmt('max_skewness', '>9.3f')} "
+              f"{fmt('max_aspect_ratio', '>9.3g')} {fmt('max_expansion', '>9.3f')} "
+              f"{fmt('max_yplus', '>8.3f')}  {marker} {report['status']}")
+        for message in report['errors']:
+            print(f"    ✗ {message}")
+        for message in report['warnings']:
+            print(f"    ⚠ {message}")
+
+
+def main():
+    """Função principal - verifica as malhas mesh_*.su2 de um diretório"""
+    import sys
+    import glob
+    import time
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else '.'
+    mesh_files = sorted(glob.glob(os.path.join(directory, 'mesh_*.su2')))
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "QUALIDADE DAS MALHAS (PRÉ-VERIFICAÇÃO)")
+    print("=" * 70)
+
+    if not mesh_files:
+        print(f"\n✗ Nenhuma malha 'mesh_*.su2' encontrada em {directory}")
+        return
+
+    start = time.perf_counter()
+    accepted, reports = preflight_all(mesh_files)
+    elapsed = time.perf_counter() - start
+
+    print_reports(reports)
+    print(f"\n✓ Aprovadas: {len(accepted)}/{len(mesh_files)}  ({elapsed*1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,435 @@
 """
 Script simples para ler arquivos VTU e converter para DataFrame pandas
 Baseado em: https://gist.github.com/christophernhill/e0633da540be8cfd254ac368e16390b6
+
+Os arquivos do SU2 (formato "appended" raw) são lidos diretamente com
+numpy a partir do cabeçalho XML, sem VTK e só com os arrays pedidos;
+arquivos arquivados pelo artifact_store.py (.aedz) são lidos da mesma
+forma, descomprimindo só esses arrays. Outros formatos usam o VTK.
+
+open_vtu() devolve um VTUDataset, que lê e converte cada coluna só no
+primeiro acesso (opcionalmente em float32); read_vtu() continua
+devolvendo o DataFrame completo, montado a partir dele. Para malhas que
+não cabem em memória, VTUDataset.iter_chunks() percorre os pontos em
+blocos (reduções em vtu_stream.py).
 """
 
-import vtk
+import os
+import re
+import mmap
+
 import numpy as np
 import pandas as pd
 
+# Tipos do atributo "type" dos DataArray do VTK
+VTK_DTYPES = {
+    'Int8': 'i1', 'UInt8': 'u1', 'Int16': 'i2', 'UInt16': 'u2',
+    'Int32': 'i4', 'UInt32': 'u4', 'Int64': 'i8', 'UInt64': 'u8',
+    'Float32': 'f4', 'Float64': 'f8',
+}
+
+# Pontos por bloco na leitura em blocos (iter_chunks)
+CHUNK_POINTS = 1_000_000
+
+_TAG = re.compile(rb'<(/?)(Points|Cells|PointData|CellData)\b[^>]*?(/?)>|<DataArray\b([^>]*)>')
+_ATTR = re.compile(rb'(\w+)\s*=\s*"([^"]*)"')
+
+
+# ============================================================================
+# FORMATO APPENDED RAW (SU2)
+# ============================================================================
+
+def parse_vtu_layout(data):
+    """
+    Estrutura de um VTU com dados "appended" raw a partir do cabeçalho XML
+
+    Args:
+        data: bytes (ou mmap) do arquivo; só o cabeçalho é percorrido
+
+    Returns:
+        dict com n_points, n_cells, header_bytes (4 ou 8), appended (posição
+        do primeiro byte após o '_') e arrays: lista de dicts com section
+        (Points/Cells/PointData/CellData), name, dtype, components e offset;
+        None se o arquivo não estiver nesse formato (comprimido, base64, ascii)
+    """
+    start = data.find(b'<AppendedData')
+    if start < 0:
+        return None
+    header = bytes(data[:start])
+    tag_end = data.find(b'>', start)
+    underscore = data.find(b'_', tag_end)
+    if b'encoding="raw"' not in bytes(data[start:tag_end]) or underscore < 0:
+        return None
+    if b'compressor=' in header or b'byte_order="BigEndian"' in header:
+        return None
+
+    piece = re.search(rb'NumberOfPoints="(\d+)"\s+NumberOfCells="(\d+)"', header)
+    header_type = re.search(rb'header_type="(\w+)"', header)
+    layout = {
+        'n_points': int(piece.group(1)) if piece else 0,
+        'n_cells': int(piece.group(2)) if piece else 0,
+        'header_bytes': 8 if header_type and header_type.group(1) == b'UInt64' else 4,
+        'appended': underscore + 1,
+        'arrays': [],
+    }
+
+    section = None
+    for match in _TAG.finditer(header):
+        if match.group(2):
+            closing, name, empty = match.group(1), match.group(2), match.group(3)
+            section = None if closing or empty else name.decode()
+            continue
+        attrs = {k.decode(): v.decode() for k, v in _ATTR.findall(match.group(4))}
+        if attrs.get('format') != 'appended' or attrs.get('type') not in VTK_DTYPES:
+            return None
+        layout['arrays'].append({
+            'section': section,
+            'name': attrs.get('Name', '') or section,
+            'dtype': '<' + VTK_DTYPES[attrs['type']],
+            'components': int(attrs.get('NumberOfComponents', 1)),
+            'offset': int(attrs['offset']),
+        })
+    return layout
+
+
+def array_key(array):
+    """Chave "Seção/Nome" de um array do layout (ex.: "PointData/Pressure")"""
+    return f"{array['section']}/{array['name']}"
+
+
+def read_appended_array(data, layout, array):
+    """Array (n, componentes) de um bloco appended raw, sem cópia quando possível"""
+    position = layout['appended'] + array['offset']
+    size_dtype = '<u8' if layout['header_bytes'] == 8 else '<u4'
+    nbytes = int(np.frombuffer(data, dtype=size_dtype, count=1, offset=position)[0])
+    dtype = np.dtype(array['dtype'])
+    values = np.frombuffer(data, dtype=dtype, count=nbytes // dtype.itemsize,
+                           offset=position + layout['header_bytes'])
+    return values.reshape(-1, array['components']) if array['components'] > 1 else values
+
+
+def _column_names(array):
+    """Colunas do DataFrame geradas por um array de PointData (vetores com [i])"""
+    if array['components'] == 1:
+        return [array['name']]
+    return [f"{array['name']}[{comp}]" for comp in range(array['components'])]
+
+
+def _vtk_layout(output):
+    """Layout equivalente ao parse_vtu_layout para uma saída do leitor VTK"""
+    point_data = output.GetPointData()
+    arrays = [{'section': 'Points', 'name': 'Points', 'components': 3}]
+    for i in range(point_data.GetNumberOfArrays()):
+        arrays.append({'section': 'PointData', 'name': point_data.GetArrayName(i),
+                       'components': point_data.GetArray(i).GetNumberOfComponents()})
+    return {'n_points': output.GetNumberOfPoints(), 'n_cells': output.GetNumberOfCells(),
+            'arrays': arrays}
+
+
+# ============================================================================
+# DATASET COM LEITURA SOB DEMANDA
+# ============================================================================
+
+class VTUDataset:
+    """
+    Arquivo VTU aberto com leitura preguiçosa por coluna
+
+    Ao abrir, só o cabeçalho é lido. Cada coluna é lida (ou descomprimida,
+    no .aedz), convertida e guardada na primeira vez em que é acessada;
+    colunas nunca usadas não custam memória nem tempo.
+
+    Uso:
+        with open_vtu('flow_d016_H03.vtu') as ds:
+            ds.columns                        # nomes, sem ler os dados
+            p = ds['Pressure']                # só este array é lido
+            df = ds.to_pandas(['Pressure'])   # X, Y, Z + Pressure
+    """
+
+    __slots__ = ('filename', 'dtype', 'layout', '_file', '_data', '_archive', '_vtk',
+                 '_columns', '_raw', '_cache')
+
+    def __init__(self, filename, dtype=np.float64):
+        from artifact_store import ARCHIVE_SUFFIX, open_archive
+
+        self.filename = filename
+        self.dtype = np.dtype(dtype)
+        self._file = self._data = self._archive = self._vtk = None
+        self._raw = {}
+        self._cache = {}
+
+        if filename.endswith(ARCHIVE_SUFFIX) or not os.path.exists(filename):
+            archive = filename if filename.endswith(ARCHIVE_SUFFIX) else filename + ARCHIVE_SUFFIX
+            self._archive = open_archive(archive)
+            self.layout = self._archive.layout
+            if self.layout is None:
+                # Arquivado sem trecho appended raw: o VTK lê uma cópia extraída
+                import tempfile
+
+                name = os.path.basename(archive[:-len(ARCHIVE_SUFFIX)])
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    original = self._archive.extract(os.path.join(tmp_dir, name))
+                    self.close()
+                    self._read_with_vtk(original)
+        else:
+            self._file = open(filename, 'rb')
+            if os.fstat(self._file.fileno()).st_size:
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.layout = parse_vtu_layout(self._data)
+            else:
+                self.layout = None
+            if self.layout is None:
+                self.close()
+                self._read_with_vtk(filename)
+
+        # Coluna -> (chave do array, componente)
+        self._columns = {}
+        for array in self.layout['arrays']:
+            key = array_key(array)
+            if array['section'] == 'Points':
+                for comp, column in enumerate(('X', 'Y', 'Z')):
+                    self._columns[column] = (key, comp)
+            elif array['section'] == 'PointData':
+                for comp, column in enumerate(_column_names(array)):
+                    self._columns[column] = (key, comp if array['components'] > 1 else None)
+
+    def _read_with_vtk(self, filename):
+        """Formato que só o VTK lê (base64, comprimido, ascii); o VTK só é
+        importado aqui, por ser lento de carregar"""
+        import vtk
+
+        reader = vtk.vtkXMLUnstructuredGridReader()
+        reader.SetFileName(filename)
+        reader.Update()
+        self._vtk = reader.GetOutput()
+        self.layout = _vtk_layout(self._vtk)
+
+    # ------------------------------------------------------------------
+    # Acesso
+    # ------------------------------------------------------------------
+
+    @property
+    def columns(self):
+        """Colunas disponíveis (mesmos nomes do DataFrame do read_vtu)"""
+        return list(self._columns)
+
+    @property
+    def arrays(self):
+        """Nomes dos arrays de PointData do SU2 (vetores sem o [i])"""
+        return [a['name'] for a in self.layout['arrays'] if a['section'] == 'PointData']
 
-def read_vtu(filename):
+    def __len__(self):
+        return self.layout['n_points']
+
+    def __contains__(self, column):
+        return column in self._columns
+
+    def _raw_array(self, key):
+        """Array como está no arquivo (visão do mmap, sem conversão)"""
+        raw = self._raw.get(key)
+        if raw is not None:
+            return raw
+        if self._vtk is not None:
+            from vtk.util.numpy_support import vtk_to_numpy
+            section, name = key.split('/', 1)
+            if section == 'Points':
+                raw = vtk_to_numpy(self._vtk.GetPoints().GetData())
+            else:
+                raw = vtk_to_numpy(self._vtk.GetPointData().GetArray(name))
+        elif self._archive is not None:
+            raw = self._archive.array(key)
+        else:
+            array = next(a for a in self.layout['arrays'] if array_key(a) == key)
+            raw = read_appended_array(self._data, self.layout, array)
+        self._raw[key] = raw
+        return raw
+
+    def __getitem__(self, column):
+        values = self._cache.get(column)
+        if values is not None:
+            return values
+        try:
+            key, comp = self._columns[column]
+        except KeyError:
+            raise KeyError(f"Coluna {column!r} não existe em {self.filename}") from None
+        raw = self._raw_array(key)
+        values = (raw[:, comp] if comp is not None else raw).astype(self.dtype)
+        self._cache[column] = values
+        return values
+
+    def array(self, name):
+        """Array completo [nó] ou [nó, componente] de um campo do SU2 (ex.: 'Velocity')"""
+        return self._raw_array(f"PointData/{name}").astype(self.dtype)
+
+    def points(self):
+        """Coordenadas [nó, 2] (X, Y)"""
+        return np.column_stack([self['X'], self['Y']])
+
+    def resolve(self, columns):
+        """Expande nomes de arrays do SU2 ('Velocity') nas colunas ('Velocity[0]', ...)"""
+        resolved = []
+        arrays = {a['name']: a for a in self.layout['arrays'] if a['section'] == 'PointData'}
+        for column in columns:
+            if column in self._columns:
+                resolved.append(column)
+            elif column in arrays:
+                resolved.extend(_column_names(arrays[column]))
+            else:
+                raise KeyError(f"Coluna {column!r} não existe em {self.filename}")
+        return resolved
+
+    def to_pandas(self, columns=None):
+        """
+        DataFrame com X, Y, Z e as colunas pedidas
+
+        Args:
+            columns: colunas ('Pressure', 'Velocity[0]') ou arrays do SU2
+                     ('Velocity' = todas as componentes); None = todas
+        """
+        return pd.DataFrame({column: self[column] for column in self._wanted(columns)})
+
+    def _wanted(self, columns):
+        """X, Y, Z + colunas pedidas, sem repetição"""
+        # Coordenadas primeiro, como no leitor VTK original (no arquivo os
+        # Points podem vir depois do PointData)
+        wanted = self.columns if columns is None else self.resolve(columns)
+        return list(dict.fromkeys(['X', 'Y', 'Z'] + wanted))
+
+    def _iter_raw(self, key, rows):
+        """Array como está no arquivo, em blocos de `rows` linhas lidos sob demanda"""
+        if self._archive is not None:
+            yield from self._archive.iter_array(key, rows)
+            return
+        if self._vtk is not None:
+            # O VTK já carregou o arquivo inteiro; só fatia
+            raw = self._raw_array(key)
+            for start in range(0, len(raw), rows):
+                yield raw[start:start + rows]
+            return
+
+        array = next(a for a in self.layout['arrays'] if array_key(a) == key)
+        dtype = np.dtype(array['dtype'])
+        components = array['components']
+        position = self.layout['appended'] + array['offset']
+        size_dtype = '<u8' if self.layout['header_bytes'] == 8 else '<u4'
+        nbytes = int(np.frombuffer(self._data, dtype=size_dtype, count=1, offset=position)[0])
+        position += self.layout['header_bytes']
+        row_bytes = dtype.itemsize * components
+        n_rows = nbytes // row_bytes
+
+        # Leitura explícita (e não visão do mmap): a memória fica limitada ao bloco
+        for start in range(0, n_rows, rows):
+            self._file.seek(position + start * row_bytes)
+            block = np.fromfile(self._file, dtype=dtype, count=min(rows, n_rows - start) * components)
+            yield block.reshape(-1, components) if components > 1 else block
+
+    def iter_chunks(self, columns=None, chunk_size=CHUNK_POINTS):
+        """
+        DataFrames de blocos consecutivos de até chunk_size pontos
+
+        Cada bloco tem as mesmas colunas do to_pandas(columns) e índice com a
+        numeração global dos nós; só um bloco de cada array fica em memória.
+        """
+        wanted = self._wanted(columns)
+        sources = {}
+        for column in wanted:
+            key, comp = self._columns[column]
+            sources.setdefault(key, []).append((column, comp))
+        iterators = {key: self._iter_raw(key, chunk_size) for key in sources}
+
+        start = 0
+        while start < len(self):
+            data = {}
+            for key, iterator in iterators.items():
+                block = next(iterator)
+                for column, comp in sources[key]:
+                    data[column] = (block[:, comp] if comp is not None else block).astype(self.dtype)
+            stop = start + len(data['X'])
+            yield pd.DataFrame({column: data[column] for column in wanted},
+                               index=pd.RangeIndex(start, stop))
+            start = stop
+
+    def cells(self):
+        """Conectividade: (connectivity, offsets com o zero inicial, types)"""
+        if self._vtk is not None:
+            from vtk.util.numpy_support import vtk_to_numpy
+            cells = self._vtk.GetCells()
+            connectivity = vtk_to_numpy(cells.GetConnectivityArray()).astype(np.int64)
+            offsets = vtk_to_numpy(cells.GetOffsetsArray()).astype(np.int64)
+            # GetCellTypesArray foi descontinuado no VTK 9.6
+            try:
+                types_array = self._vtk.GetCellTypes()
+            except TypeError:
+                types_array = self._vtk.GetCellTypesArray()
+            return connectivity, offsets, vtk_to_numpy(types_array).astype(np.uint8)
+
+        # Como no VTK: offsets com o zero inicial (n_cells + 1)
+        offsets = np.concatenate(([0], self._raw_array('Cells/offsets').astype(np.int64)))
+        return (self._raw_array('Cells/connectivity').astype(np.int64), offsets,
+                self._raw_array('Cells/types').astype(np.uint8))
+
+    # ------------------------------------------------------------------
+    # Fechamento
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """Libera o arquivo (as colunas já lidas continuam válidas)"""
+        self._raw.clear()
+        if self._data is not None:
+            try:
+                self._data.close()
+            except BufferError:
+                pass  # ainda há visões do mmap em uso; o GC fecha depois
+            self._data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def open_vtu(filename, dtype=np.float64):
+    """
+    Abre um VTU (ou .aedz) para leitura sob demanda
+
+    Args:
+        dtype: tipo das colunas (np.float32 reduz a memória pela metade)
+    """
+    return VTUDataset(filename, dtype)
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+def read_vtu(filename, columns=None, dtype=np.float64):
     """
     Lê arquivo VTU e retorna DataFrame pandas
     
     Args:
-        filename: caminho do arquivo .vtu
+        filename: caminho do arquivo .vtu (ou do .aedz arquivado)
+        columns: colunas a incluir ('Pressure', 'Velocity[0]' ou o vetor
+                 inteiro 'Velocity'); None = todas. X, Y, Z sempre incluídos
+        dtype: tipo das colunas (np.float32 para reduzir a memória)
     
     Returns:
         df: DataFrame com coordenadas (X, Y, Z) e todas as variáveis
     """
+    with open_vtu(filename, dtype) as ds:
+        return ds.to_pandas(columns)
+
+
+def _read_vtu_vtk(filename, columns=None):
+    """Leitura pelo VTK elemento a elemento (implementação original, referência dos benchmarks)"""
+    import vtk
+
     # Lê arquivo VTU
     reader = vtk.vtkXMLUnstructuredGridReader()
     reader.SetFileName(filename)
@@ -41,6 +453,8 @@ def read_vtu(filename):
     # Adiciona cada variável ao DataFrame
     for i in range(n_arrays):
         array_name = point_data.GetArrayName(i)
+        if columns is not None and array_name not in columns:
+            continue
         array = point_data.GetArray(i)
         n_components = array.GetNumberOfComponents()
         
@@ -57,6 +471,22 @@ def read_vtu(filename):
     return df
 
 
+def read_vtu_cells(filename):
+    """
+    Lê a conectividade das células de um arquivo VTU
+
+    Args:
+        filename: caminho do arquivo .vtu
+
+    Returns:
+        connectivity: índices dos nós de todas as células (concatenados)
+        offsets: posição inicial de cada célula em connectivity (n_cells + 1)
+        types: tipo VTK de cada célula (9 = quadrilátero)
+    """
+    with open_vtu(filename) as ds:
+        return ds.cells()
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     import sys
@@ -66,8 +496,8 @@ if __name__ == "__main__":
         vtu_file = sys.argv[1]
     else:
         # Procura primeiro arquivo flow_*.vtu
-        import glob
-        vtu_files = glob.glob('flow_*.vtu')
+        from artifact_store import find_artifacts
+        vtu_files = find_artifacts('flow_*.vtu')
         if vtu_files:
             vtu_file = vtu_files[0]
         else:
@@ -0,0 +1,318 @@
+"""
+Leitura dos arquivos de reinício do SU2 (restart_flow_[ID].dat) como arrays numpy
+Autor: Script automatizado
+Data: 2025
+
+O restart é a saída mais compacta com a solução completa: uma linha por nó,
+na mesma ordem dos nós da malha (NPOIN do .su2). Dois formatos:
+
+- Binário (padrão do SU2 7/8): 5 inteiros int32 [535532, nCampos, nPontos,
+  0, 0], os nomes dos campos com 33 caracteres cada e os valores float64
+  nó a nó. O arquivo é mapeado em memória (np.memmap): as colunas são
+  visões sem cópia e só as páginas efetivamente usadas são lidas do disco.
+- ASCII/CSV (RESTART_ASCII, SU2 6): cabeçalho "PointID","x","y",... e uma
+  linha por nó; linhas finais de metadados (EXT_ITER= ...) são separadas.
+
+Também lê restarts arquivados pelo artifact_store (.aedz), descomprimindo
+em memória.
+
+Uso:
+    python restart_reader.py restart_flow_d016_H03.dat [mesh_d016_H03.su2]
+"""
+
+import os
+import re
+
+import numpy as np
+
+SU2_MAGIC_NUMBER = 535532
+CGNS_STRING_SIZE = 33
+HEADER_INTS = 5
+
+# Valores padrão do SU2 (GAMMA_VALUE e GAS_CONSTANT não estão no lam_flatplate.cfg)
+GAMMA = 1.4
+GAS_CONSTANT = 287.058
+
+# Nomes das variáveis conservativas no SU2 7/8 e equivalentes antigos
+CONSERVATIVE_ALIASES = {
+    'Density': ('Density', 'Conservative_1'),
+    'Momentum_x': ('Momentum_x', 'X-Momentum', 'Conservative_2'),
+    'Momentum_y': ('Momentum_y', 'Y-Momentum', 'Conservative_3'),
+    'Energy': ('Energy', 'Conservative_4'),
+}
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+def _raw_bytes(filename):
+    """Bytes do arquivo: memmap (sem cópia) ou conteúdo do .aedz"""
+    if os.path.exists(filename):
+        if os.path.getsize(filename) == 0:
+            raise ValueError(f"{filename}: arquivo vazio")
+        return np.memmap(filename, dtype=np.uint8, mode='r')
+
+    from artifact_store import ARCHIVE_SUFFIX, open_archive
+    with open_archive(filename + ARCHIVE_SUFFIX) as archive:
+        return np.frombuffer(b''.join(archive.iter_original()), dtype=np.uint8)
+
+
+def _binary_header(raw):
+    """(ordem dos bytes, nCampos, nPontos) ou None se não for restart binário"""
+    if len(raw) < 4 * HEADER_INTS:
+        return None
+    for byte_order in ('<', '>'):
+        header = raw[:4 * HEADER_INTS].view(byte_order + 'i4')
+        if header[0] == SU2_MAGIC_NUMBER:
+            return byte_order, int(header[1]), int(header[2])
+    return None
+
+
+def _read_binary(raw, filename, byte_order, n_fields, n_points):
+    if n_fields <= 0 or n_points <= 0:
+        raise ValueError(f"{filename}: cabeçalho inválido ({n_fields} campos, {n_points} pontos)")
+
+    names_start = 4 * HEADER_INTS
+    data_start = names_start + CGNS_STRING_SIZE * n_fields
+    data_end = data_start + 8 * n_fields * n_points
+    if len(raw) < data_end:
+        raise ValueError(f"{filename}: arquivo truncado ({len(raw)} bytes, "
+                         f"esperados {data_end} para {n_points} pontos x {n_fields} campos)")
+
+    names = raw[names_start:data_start].tobytes()
+    fields = [names[k * CGNS_STRING_SIZE:(k + 1) * CGNS_STRING_SIZE].split(b'\0', 1)[0].decode().strip()
+              for k in range(n_fields)]
+
+    # Visão float64 dos bytes mapeados: nenhuma cópia (pode ficar desalinhada)
+    data = raw[data_start:data_end].view(byte_order + 'f8').reshape(n_points, n_fields)
+    return {'format': 'binary', 'fields': fields, 'data': data, 'n_points': n_points, 'meta': {}}
+
+
+def _read_ascii(raw, filename):
+    text = raw.tobytes().decode('ascii', errors='replace')
+    header, _, body = text.partition('\n')
+    separator = '\t' if '\t' in header else ','
+    fields = [name.strip().strip('"') for name in header.split(separator) if name.strip()]
+    if not fields or not re.match(r'^\s*"?[A-Za-z]', header):
+        raise ValueError(f"{filename}: não é um restart do SU2 (cabeçalho: {header[:60]!r})")
+
+    # Metadados no fim (EXT_ITER= 1000, AOA= 0 ...)
+    lines = body.rstrip('\n').split('\n')
+    n_data = len(lines)
+    while n_data and '=' in lines[n_data - 1]:
+        n_data -= 1
+    meta = {}
+    for line in lines[n_data:]:
+        key, _, value = line.partition('=')
+        meta[key.strip()] = value.strip()
+    lines = lines[:n_data]
+    body = '\n'.join(lines)
+
+    values = np.fromstring(body.replace(',', ' '), sep=' ')
+    if values.size % len(fields):
+        raise ValueError(f"{filename}: arquivo truncado ({values.size} valores "
+                         f"para {len(fields)} campos)")
+    data = values.reshape(-1, len(fields))
+
+    # Ordem dos nós da malha: pela coluna PointID
+    if fields[0] == 'PointID':
+        point_id = data[:, 0].astype(np.int64)
+        if np.any(np.diff(point_id) < 0):
+            data = data[np.argsort(point_id, kind='stable')]
+        data = data[:, 1:]
+        fields = fields[1:]
+
+    return {'format': 'ascii', 'fields': fields, 'data': data, 'n_points': len(data), 'meta': meta}
+
+
+def read_restart(filename, n_points=None):
+    """
+    Lê um restart do SU2 (binário ou ASCII)
+
+    Args:
+        filename: restart_flow_[ID].dat (ou .csv); se não existir, usa o .aedz
+        n_points: se informado, número de nós esperado (o da malha)
+
+    Returns:
+        dict com format ('binary'/'ascii'), fields (nomes), data (array
+        [nó, campo]; no binário, memmap sem cópia), n_points e meta
+    """
+    raw = _raw_bytes(filename)
+    header = _binary_header(raw)
+    if header is not None:
+        restart = _read_binary(raw, filename, *header)
+    else:
+        restart = _read_ascii(raw, filename)
+
+    if n_points is not None and restart['n_points'] != n_points:
+        raise ValueError(f"{filename}: {restart['n_points']} pontos no restart, "
+                         f"{n_points} na malha")
+    return restart
+
+
+def restart_is_complete(filename):
+    """Verificação barata de restart truncado (só o cabeçalho e o tamanho)"""
+    try:
+        with open(filename, 'rb') as f:
+            head = np.frombuffer(f.read(4 * HEADER_INTS), dtype=np.uint8)
+            size = os.fstat(f.fileno()).st_size
+            header = _binary_header(head)
+            if header is None:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b'\n'
+    except OSError:
+        return False
+    _, n_fields, n_points = header
+    return size >= 4 * HEADER_INTS + CGNS_STRING_SIZE * n_fields + 8 * n_fields * n_points
+
+
+# ============================================================================
+# CAMPOS
+# ============================================================================
+
+def restart_field(restart, name):
+    """Coluna de um campo (visão sem cópia no restart binário)"""
+    try:
+        k = restart['fields'].index(name)
+    except ValueError:
+        raise KeyError(f"Campo {name!r} não está no restart: {restart['fields']}") from None
+    return restart['data'][:, k]
+
+
+def _find(restart, names):
+    for name in names:
+        if name in restart['fields']:
+            return restart_field(restart, name)
+    return None
+
+
+def conservative_variables(restart):
+    """dict Density, Momentum_x, Momentum_y, Energy (colunas do restart)"""
+    variables = {}
+    for name, aliases in CONSERVATIVE_ALIASES.items():
+        column = _find(restart, aliases)
+        if column is None:
+            raise KeyError(f"Variável conservativa {name} não encontrada: {restart['fields']}")
+        variables[name] = column
+    return variables
+
+
+def primitive_variables(restart, gamma=GAMMA, gas_constant=GAS_CONSTANT):
+    """
+    Variáveis primitivas por nó
+
+    Usa as colunas do restart quando existirem (Pressure, Temperature,
+    Mach...) e calcula as demais a partir das conservativas (gás ideal).
+
+    Returns:
+        dict Density, Velocity_x, Velocity_y, Pressure, Temperature, Mach
+    """
+    cons = conservative_variables(restart)
+    rho = cons['Density']
+    u = cons['Momentum_x'] / rho
+    v = cons['Momentum_y'] / rho
+
+    pressure = _find(restart, ('Pressure',))
+    if pressure is None:
+        pressure = (gamma - 1.0) * (cons['Energy'] - 0.5 * rho * (u * u + v * v))
+    temperature = _find(restart, ('Temperature',))
+    if temperature is None:
+        temperature = pressure / (rho * gas_constant)
+    mach = _find(restart, ('Mach',))
+    if mach is None:
+        mach = np.sqrt(u * u + v * v) / np.sqrt(gamma * pressure / rho)
+
+    return {'Density': rho, 'Velocity_x': u, 'Velocity_y': v,
+            'Pressure': pressure, 'Temperature': temperature, 'Mach': mach}
+
+
+def restart_coordinates(restart):
+    """Coordenadas (n, 2) dos nós"""
+    return np.column_stack([restart_field(restart, 'x'), restart_field(restart, 'y')])
+
+
+def restart_to_dataframe(restart, columns=None):
+    """
+    DataFrame com os nomes de colunas do read_vtu (X, Y, Z, Pressure,
+    Velocity[0], Momentum[0]...), para usar o restart no lugar do flow_*.vtu
+
+    Args:
+        columns: colunas desejadas (None = todas); X, Y, Z sempre incluídas
+    """
+    import pandas as pd
+
+    data = {'X': restart_field(restart, 'x'), 'Y': restart_field(restart, 'y')}
+    data['Z'] = restart_field(restart, 'z') if 'z' in restart['fields'] \
+        else np.zeros(restart['n_points'])
+
+    renamed = {}
+    for name in restart['fields']:
+        if name in ('x', 'y', 'z'):
+            continue
+        match = re.match(r'^(\w+)_([xyz])$', name)
+        key = f"{match.group(1)}[{'xyz'.index(match.group(2))}]" if match else name
+        renamed[key] = name
+
+    primitive = primitive_variables(restart)
+    derived = {'Velocity[0]': 'Velocity_x', 'Velocity[1]': 'Velocity_y',
+               'Pressure': 'Pressure', 'Temperature': 'Temperature', 'Mach': 'Mach'}
+
+    wanted = columns if columns is not None else list(renamed) + [
+        c for c in derived if c not in renamed]
+    for column in wanted:
+        if column in ('X', 'Y', 'Z'):
+            continue
+        if column in renamed:
+            data[column] = restart_field(restart, renamed[column])
+        elif column in derived:
+            data[column] = primitive[derived[column]]
+        else:
+            raise KeyError(f"Coluna {column!r} não disponível no restart")
+    return pd.DataFrame(data)
+
+
+def check_mesh_order(restart, mesh, atol=1e-9):
+    """
+    Confere se os nós do restart estão na ordem da malha
+
+    Args:
+        mesh: dict do su2_mesh.read_su2_mesh
+
+    Returns:
+        maior distância entre o nó do restart e o nó da malha de mesmo índice
+    """
+    if restart['n_points'] != len(mesh['points']):
+        raise ValueError(f"{restart['n_points']} pontos no restart, {len(mesh['points'])} na malha")
+    distance = np.abs(restart_coordinates(restart) - mesh['points'][:, :2]).max()
+    return float(distance)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Uso: python restart_reader.py <restart_flow.dat> [malha.su2]")
+        sys.exit(1)
+
+    filename = sys.argv[1]
+    start = time.perf_counter()
+    restart = read_restart(filename)
+    elapsed = time.perf_counter() - start
+
+    print(f"✓ {filename}: restart {restart['format']}, {restart['n_points']} nós, "
+          f"{len(restart['fields'])} campos ({elapsed * 1000:.1f} ms)")
+    print(f"  Campos: {', '.join(restart['fields'])}")
+    for key, value in restart['meta'].items():
+        print(f"  {key} = {value}")
+
+    primitive = primitive_variables(restart)
+    for name, values in primitive.items():
+        print(f"  {name:<12} min {np.min(values):12.5g}  max {np.max(values):12.5g}")
+
+    if len(sys.argv) > 2:
+        from su2_mesh import read_su2_mesh
+        distance = check_mesh_order(restart, read_su2_mesh(sys.argv[2]))
+        symbol = '✓' if distance < 1e-9 else '✗'
+        print(f"{symbol} Ordem dos nós x malha: diferença máxima de coordenadas {distance:.3g}")
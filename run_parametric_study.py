@@ -8,11 +8,17 @@ permitindo um estudo paramétrico completo de forma automatizada.
 """
 
 import os
+import sys
 import subprocess
-import shutil
 import time
 from pathlib import Path
 
+from mesh_quality import preflight
+from tool_registry import find_tool, set_tool
+from su2_config import load_config, case_overrides
+from sweep_journal import (record_state, load_journal, resume_status,
+                           print_resume_status, case_outputs)
+
 # ============================================================================
 # CONFIGURAÇÕES - AJUSTE CONFORME NECESSÁRIO
 # ============================================================================
@@ -20,34 +26,32 @@ from pathlib import Path
 GMSH_PATH = r"C:\Program Files\gmsh-4.11.1-Windows64\gmsh.exe"
 SU2_PATH = r"C:\Users\ymarc\OneDrive\Documents\SU2-v8.3.0-win64\win64\bin\SU2_CFD.exe"
 CONFIG_FILE = "lam_flatplate.cfg"
-CONFIG_BACKUP = "lam_flatplate.cfg.backup"
 GEO_TEMP = "placa_temp.geo"
+JOURNAL_DIR = "."
+
+# Valores padrão de cada tipo de estudo
+D_INLET_VALUES = [-0.02, -0.04, -0.06, -0.08, -0.10, -0.12, -0.14, -0.16]
+H_DOM_FIXED = 0.03
+H_DOM_VALUES = [0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.10]
+D_INLET_FIXED = -0.16
+D_INLET_MATRIX = [-0.08, -0.12, -0.16]
+H_DOM_MATRIX = [0.02, 0.03, 0.04, 0.05]
+
+# Tipo de estudo -> opção do menu
+MODES = {'horizontal': '1', 'vertical': '2', 'matriz': '3'}
 
 # ============================================================================
 # FUNÇÕES AUXILIARES
 # ============================================================================
 
 def find_gmsh():
-    """Tenta encontrar o executável do GMSH"""
-    possible_paths = [
-        r"C:\Program Files\gmsh-4.11.1-Windows64\gmsh.exe",
-        r"C:\Program Files\gmsh-4.12.0-Windows64\gmsh.exe",
-        r"C:\Program Files\gmsh-4.13.0-Windows64\gmsh.exe",
-        r"C:\Program Files (x86)\gmsh-4.11.1-Windows64\gmsh.exe",
-    ]
-    
-    try:
-        result = subprocess.run(['gmsh', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return 'gmsh'
-    except:
-        pass
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
+    """Executável do GMSH (registro em cache do tool_registry.py)"""
+    return find_tool('gmsh', preferred=GMSH_PATH)
+
+
+def find_su2():
+    """Executável do SU2_CFD (registro em cache do tool_registry.py)"""
+    return find_tool('su2', preferred=SU2_PATH)
 
 def create_geo_file(d_inlet, H_dom, output_geo):
     """Cria arquivo .geo com parâmetros especificados"""
@@ -115,24 +119,24 @@ def generate_mesh(geo_file, output_su2, gmsh_path):
         print(f"  ✗ Erro ao gerar malha: {e}")
         return False
 
-def modify_config(mesh_filename):
-    """Modifica o arquivo de configuração para usar a malha especificada"""
-    with open(CONFIG_FILE, 'r') as f:
-        lines = f.readlines()
-    
-    with open(CONFIG_FILE, 'w') as f:
-        for line in lines:
-            if line.strip().startswith('MESH_FILENAME='):
-                f.write(f'MESH_FILENAME= {mesh_filename}\n')
-            else:
-                f.write(line)
+def create_case_config(mesh_filename, mesh_id):
+    """
+    Cria o arquivo de configuração do caso a partir do lam_flatplate.cfg
+    
+    O arquivo original não é alterado: a configuração é lida uma única vez e
+    cada caso recebe o seu .cfg, já com os arquivos de saída nomeados com o
+    ID da malha (flow_[ID].vtu, history_[ID].csv, ...).
+    """
+    config_case = f"lam_flatplate_{mesh_id}.cfg"
+    load_config(CONFIG_FILE).write(config_case, case_overrides(mesh_filename, mesh_id))
+    return config_case
 
-def run_su2():
+def run_su2(config_file):
     """Executa o SU2_CFD"""
     
     try:
         result = subprocess.run(
-            [SU2_PATH, CONFIG_FILE],
+            [find_su2(), config_file],
             capture_output=False,
             text=True,
             check=True
@@ -142,44 +146,211 @@ def run_su2():
         print(f"  ✗ Erro ao executar SU2: {e}")
         return False
 
-def rename_outputs(mesh_id):
-    """Renomeia os arquivos de saída com o identificador da malha"""
-    
-    output_files = {
-        'flow.vtu': f'flow_{mesh_id}.vtu',
-        'surface_flow.vtu': f'surface_flow_{mesh_id}.vtu',
-        'history.csv': f'history_{mesh_id}.csv',
-        'restart_flow.dat': f'restart_flow_{mesh_id}.dat'
-    }
-    
-    for old_name, new_name in output_files.items():
-        if os.path.exists(old_name):
-            if os.path.exists(new_name):
-                os.remove(new_name)
-            shutil.move(old_name, new_name)
-
-def backup_config():
-    """Faz backup do arquivo de configuração original"""
-    if os.path.exists(CONFIG_FILE):
-        shutil.copy2(CONFIG_FILE, CONFIG_BACKUP)
-
-def restore_config():
-    """Restaura o arquivo de configuração original"""
-    if os.path.exists(CONFIG_BACKUP):
-        shutil.copy2(CONFIG_BACKUP, CONFIG_FILE)
-        os.remove(CONFIG_BACKUP)
-
 # ============================================================================
 # FUNÇÃO PRINCIPAL
 # ============================================================================
 
+def journaled_parameters():
+    """Casos planejados no diário (d_inlet, H_dom, mesh_id), na ordem original"""
+    parameters = []
+    for mesh_id, case in load_journal(JOURNAL_DIR).items():
+        info = case['info']
+        if 'd_inlet' in info and 'H_dom' in info:
+            parameters.append((info['d_inlet'], info['H_dom'], mesh_id))
+    return parameters
+
+def study_parameters(choice, d_inlet_values=None, H_dom_values=None):
+    """
+    Lista (d_inlet, H_dom, mesh_id) de um tipo de estudo
+    
+    Args:
+        choice: '1' (varia d_inlet), '2' (varia H_dom) ou '3' (matriz)
+        d_inlet_values, H_dom_values: substituem os valores padrão; nos
+            estudos 1 e 2 o parâmetro fixo usa o primeiro valor da lista
+    """
+    if choice == '1':
+        d_inlet_values = d_inlet_values or D_INLET_VALUES
+        H_dom_values = (H_dom_values or [H_DOM_FIXED])[:1]
+    elif choice == '2':
+        d_inlet_values = (d_inlet_values or [D_INLET_FIXED])[:1]
+        H_dom_values = H_dom_values or H_DOM_VALUES
+    elif choice == '3':
+        d_inlet_values = d_inlet_values or D_INLET_MATRIX
+        H_dom_values = H_dom_values or H_DOM_MATRIX
+    else:
+        raise ValueError(f"Tipo de estudo inválido: {choice}")
+    
+    return [(d, h, f"d{int(abs(d)*100):03d}_H{int(h*100):02d}")
+            for d in d_inlet_values for h in H_dom_values]
+
+def case_status(parameters, resume=False):
+    """Estado de cada caso: pelo diário (resume=True) ou todos 'planned'"""
+    if resume:
+        status = resume_status(JOURNAL_DIR, [mesh_id for _, _, mesh_id in parameters])
+        print(f"\nRetomada pelo diário do estudo:")
+        print_resume_status(status)
+        return status
+    return {mesh_id: ('planned', []) for _, _, mesh_id in parameters}
+
+def run_study(parameters, gmsh_path, status, on_result=None):
+    """
+    Executa o estudo: malha (GMSH) → verificação → SU2, caso a caso
+    
+    Args:
+        parameters: lista (d_inlet, H_dom, mesh_id)
+        status: estado de cada caso (case_status); casos 'done' são pulados
+                e malhas 'meshed' reaproveitadas
+        on_result: chamada com (mesh_id, sucesso, mensagem, tempo) de cada caso
+    
+    Returns:
+        (lista de (mesh_id, sucesso, mensagem, tempo), tempo total em s)
+    """
+    # Todos os casos entram no diário antes do início, para que a retomada
+    # conheça também os que ainda não começaram
+    for d_inlet, H_dom, mesh_id in parameters:
+        if status[mesh_id][0] == 'planned':
+            record_state(JOURNAL_DIR, mesh_id, 'planned', d_inlet=d_inlet, H_dom=H_dom)
+    
+    # Executa o estudo
+    results = []
+    
+    def finish(result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    
+    start_time = time.time()
+    
+    try:
+        for i, (d_inlet, H_dom, mesh_id) in enumerate(parameters, 1):
+            case_start = time.time()
+            
+            print(f"\n{'#'*70}")
+            print(f"# CASO {i}/{len(parameters)}: {mesh_id}")
+            print(f"# d_inlet = {d_inlet:.4f} m  |  H_dom = {H_dom:.4f} m")
+            print(f"{'#'*70}\n")
+            
+            mesh_file = f"mesh_{mesh_id}.su2"
+            state = status[mesh_id][0]
+            
+            if state == 'done':
+                print(f"  ✓ Já concluído em execução anterior (diário)")
+                finish((mesh_id, True, "Concluído anteriormente", 0))
+                continue
+            
+            # ETAPA 1: Gerar malha
+            if state == 'meshed':
+                print(f"[1/3] Malha íntegra de execução anterior: {mesh_file}")
+            else:
+                print(f"[1/3] Gerando malha...")
+                create_geo_file(d_inlet, H_dom, GEO_TEMP)
+                mesh_success = generate_mesh(GEO_TEMP, mesh_file, gmsh_path)
+                
+                if not mesh_success:
+                    print(f"  ✗ Falha na geração da malha!")
+                    record_state(JOURNAL_DIR, mesh_id, 'failed', message="Erro na malha")
+                    finish((mesh_id, False, "Erro na malha", 0))
+                    continue
+                
+                record_state(JOURNAL_DIR, mesh_id, 'meshed', artifacts=[mesh_file])
+                print(f"  ✓ Malha gerada: {mesh_file}")
+            
+            # Verificação de qualidade antes de gastar tempo no SU2
+            quality = preflight(mesh_file)
+            if quality['status'] == 'rejeitada':
+                for message in quality['errors']:
+                    print(f"  ✗ {message}")
+                message = "Malha rejeitada: " + '; '.join(quality['errors'])
+                record_state(JOURNAL_DIR, mesh_id, 'failed', message=message)
+                finish((mesh_id, False, message, 0))
+                continue
+            for message in quality['warnings']:
+                print(f"  ⚠ {message}")
+            
+            # ETAPA 2: Configuração do caso (o lam_flatplate.cfg não é alterado)
+            print(f"\n[2/3] Configurando SU2...")
+            config_case = create_case_config(mesh_file, mesh_id)
+            print(f"  ✓ Configuração do caso: {config_case}")
+            
+            # ETAPA 3: Executar SU2
+            print(f"\n[3/3] Executando simulação SU2...")
+            print("-"*70)
+            record_state(JOURNAL_DIR, mesh_id, 'solving')
+            su2_success = run_su2(config_case)
+            print("-"*70)
+            
+            # Limpar temporários
+            if os.path.exists(config_case):
+                os.remove(config_case)
+            if os.path.exists(GEO_TEMP):
+                os.remove(GEO_TEMP)
+            
+            if not su2_success:
+                print(f"  ✗ Falha na simulação!")
+                record_state(JOURNAL_DIR, mesh_id, 'failed', message="Erro no SU2")
+                finish((mesh_id, False, "Erro no SU2", 0))
+                continue
+            
+            print(f"  ✓ Simulação concluída")
+            print(f"  ✓ Resultados salvos com ID: {mesh_id}")
+            
+            case_time = time.time() - case_start
+            record_state(JOURNAL_DIR, mesh_id, 'solved',
+                         artifacts=case_outputs(JOURNAL_DIR, mesh_id), time_s=case_time)
+            finish((mesh_id, True, "OK", case_time))
+            
+            print(f"\n✓ Caso {mesh_id} concluído em {case_time:.1f}s")
+    
+    finally:
+        if os.path.exists(GEO_TEMP):
+            os.remove(GEO_TEMP)
+    
+    return results, time.time() - start_time
+
+def print_study_report(results, total_time):
+    """Relatório final de run_study"""
+    success_count = sum(1 for _, success, _, _ in results if success)
+    
+    print(f"\n\n{'='*70}")
+    print(f"RELATÓRIO FINAL DO ESTUDO PARAMÉTRICO")
+    print(f"{'='*70}")
+    print(f"\nTempo total: {total_time:.1f}s ({total_time/60:.1f} min)")
+    print(f"Casos processados: {len(results)}")
+    print(f"  ✓ Sucesso: {success_count}")
+    print(f"  ✗ Falhas: {len(results) - success_count}\n")
+    
+    print(f"{'Caso':<15} {'Status':<10} {'Tempo (s)':<12} {'Observação'}")
+    print("-"*70)
+    for mesh_id, success, msg, t in results:
+        status = "✓ OK" if success else "✗ ERRO"
+        time_str = f"{t:.1f}" if success else "-"
+        print(f"{mesh_id:<15} {status:<10} {time_str:<12} {msg}")
+    
+    print(f"{'='*70}\n")
+    
+    if success_count > 0:
+        print("Arquivos de resultado gerados:")
+        print("  • flow_[mesh_id].vtu       - Visualização no VISIT/Paraview")
+        print("  • history_[mesh_id].csv    - Histórico de convergência")
+        print("  • surface_flow_[mesh_id].vtu - Dados de superfície")
+        print("\nVocê pode abrir os arquivos .vtu no VISIT para análise!")
+
 def main():
-    """Função principal do estudo paramétrico"""
+    """
+    Função principal do estudo paramétrico
+    
+    Com --resume, o estudo continua de onde parou: casos concluídos são
+    pulados e malhas íntegras já geradas são reaproveitadas
+    (sweep_journal.jsonl).
+    """
+    resume = '--resume' in sys.argv[1:]
     
     print("\n" + "="*70)
     print(" "*10 + "ESTUDO PARAMÉTRICO - CAMADA LIMITE LAMINAR")
     print("="*70)
     print("\nWorkflow: GMSH (geração de malha) → SU2 (simulação) → Resultados")
+    if resume:
+        print("Modo: retomada (--resume)")
     print("="*70 + "\n")
     
     # Verifica executáveis
@@ -190,9 +361,12 @@ def main():
         if not os.path.exists(gmsh_path):
             print("Arquivo não encontrado!")
             return
+        set_tool('gmsh', gmsh_path)
     
-    if not os.path.exists(SU2_PATH):
-        print(f"✗ SU2 não encontrado em: {SU2_PATH}")
+    su2_path = find_su2()
+    if su2_path is None:
+        print(f"✗ SU2 não encontrado (nem em: {SU2_PATH})")
+        print("  Registre com: python tool_registry.py set su2 <caminho do SU2_CFD>")
         return
     
     if not os.path.exists(CONFIG_FILE):
@@ -200,70 +374,67 @@ def main():
         return
     
     print(f"✓ GMSH: {gmsh_path}")
-    print(f"✓ SU2: {SU2_PATH}")
+    print(f"✓ SU2: {su2_path}")
     print(f"✓ Config: {CONFIG_FILE}\n")
     
     # Define parâmetros do estudo
     print("="*70)
     print("DEFINIÇÃO DOS PARÂMETROS")
     print("="*70)
-    print("\nOpções de estudo:")
-    print("  1. Variar d_inlet (distância do inlet) - H_dom fixo = 0.03")
-    print("  2. Variar H_dom (altura do domínio) - d_inlet fixo = -0.16")
-    print("  3. Matriz completa (variar ambos)")
-    print("  4. Casos customizados")
-    
-    choice = input("\nEscolha (1-4): ").strip()
     
     parameters = []
+    choice = None
+    
+    if resume:
+        parameters = journaled_parameters()
+        if parameters:
+            print(f"\nDiário com {len(parameters)} caso(s) planejado(s).")
+            response = input("Retomar estes casos? (s/n): ").strip().lower()
+            if response != 's':
+                parameters = []
+    
+    if not parameters:
+        print("\nOpções de estudo:")
+        print("  1. Variar d_inlet (distância do inlet) - H_dom fixo = 0.03")
+        print("  2. Variar H_dom (altura do domínio) - d_inlet fixo = -0.16")
+        print("  3. Matriz completa (variar ambos)")
+        print("  4. Casos customizados")
+        
+        choice = input("\nEscolha (1-4): ").strip()
     
     if choice == '1':
-        H_dom = 0.03
-        print(f"\nVariando d_inlet com H_dom = {H_dom}")
-        print("Valores padrão: -0.02, -0.04, -0.06, -0.08, -0.10, -0.12, -0.14, -0.16")
+        print(f"\nVariando d_inlet com H_dom = {H_DOM_FIXED}")
+        print("Valores padrão: " + ', '.join(f"{d:.2f}" for d in D_INLET_VALUES))
         response = input("Usar valores padrão? (s/n): ").strip().lower()
         
-        if response == 's':
-            d_inlet_values = [-0.02, -0.04, -0.06, -0.08, -0.10, -0.12, -0.14, -0.16]
-        else:
+        d_inlet_values = None
+        if response != 's':
             print("Digite os valores de d_inlet separados por vírgula:")
             values_str = input("d_inlet: ")
             d_inlet_values = [float(v.strip()) for v in values_str.split(',')]
         
-        for d in d_inlet_values:
-            mesh_id = f"d{int(abs(d)*100):03d}_H{int(H_dom*100):02d}"
-            parameters.append((d, H_dom, mesh_id))
+        parameters = study_parameters(choice, d_inlet_values=d_inlet_values)
     
     elif choice == '2':
-        d_inlet = -0.16
-        print(f"\nVariando H_dom com d_inlet = {d_inlet}")
-        print("Valores padrão: 0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.10")
+        print(f"\nVariando H_dom com d_inlet = {D_INLET_FIXED}")
+        print("Valores padrão: " + ', '.join(f"{h:.2f}" for h in H_DOM_VALUES))
         response = input("Usar valores padrão? (s/n): ").strip().lower()
         
-        if response == 's':
-            H_dom_values = [0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.10]
-        else:
+        H_dom_values = None
+        if response != 's':
             print("Digite os valores de H_dom separados por vírgula:")
             values_str = input("H_dom: ")
             H_dom_values = [float(v.strip()) for v in values_str.split(',')]
         
-        for h in H_dom_values:
-            mesh_id = f"d{int(abs(d_inlet)*100):03d}_H{int(h*100):02d}"
-            parameters.append((d_inlet, h, mesh_id))
+        parameters = study_parameters(choice, H_dom_values=H_dom_values)
     
     elif choice == '3':
-        d_inlet_values = [-0.08, -0.12, -0.16]
-        H_dom_values = [0.02, 0.03, 0.04, 0.05]
-        
         print(f"\nMatriz completa:")
-        print(f"  d_inlet: {d_inlet_values}")
-        print(f"  H_dom: {H_dom_values}")
-        print(f"  Total de casos: {len(d_inlet_values) * len(H_dom_values)}")
+        print(f"  d_inlet: {D_INLET_MATRIX}")
+        print(f"  H_dom: {H_DOM_MATRIX}")
+        print(f"  Total de casos: {len(D_INLET_MATRIX) * len(H_DOM_MATRIX)}")
         
-        for d in d_inlet_values:
-            for h in H_dom_values:
-                mesh_id = f"d{int(abs(d)*100):03d}_H{int(h*100):02d}"
-                parameters.append((d, h, mesh_id))
+        parameters = study_parameters(choice)
     
     elif choice == '4':
         print("\nDefina os casos (digite 'fim' para encerrar):")
@@ -291,105 +462,17 @@ def main():
     for i, (d, h, mesh_id) in enumerate(parameters, 1):
         print(f"{i:<6} {d:<10.4f} {h:<10.4f} {mesh_id:<15}")
     
+    # Retomada: estado de cada caso pelo diário e pelos arquivos em disco
+    status = case_status(parameters, resume)
+    
     print(f"{'='*70}")
     response = input("\nIniciar estudo paramétrico? (s/n): ").strip().lower()
     if response != 's':
         print("Operação cancelada.")
         return
     
-    # Executa o estudo
-    backup_config()
-    
-    results = []
-    start_time = time.time()
-    
-    try:
-        for i, (d_inlet, H_dom, mesh_id) in enumerate(parameters, 1):
-            case_start = time.time()
-            
-            print(f"\n{'#'*70}")
-            print(f"# CASO {i}/{len(parameters)}: {mesh_id}")
-            print(f"# d_inlet = {d_inlet:.4f} m  |  H_dom = {H_dom:.4f} m")
-            print(f"{'#'*70}\n")
-            
-            mesh_file = f"mesh_{mesh_id}.su2"
-            
-            # ETAPA 1: Gerar malha
-            print(f"[1/3] Gerando malha...")
-            create_geo_file(d_inlet, H_dom, GEO_TEMP)
-            mesh_success = generate_mesh(GEO_TEMP, mesh_file, gmsh_path)
-            
-            if not mesh_success:
-                print(f"  ✗ Falha na geração da malha!")
-                results.append((mesh_id, False, "Erro na malha", 0))
-                continue
-            
-            print(f"  ✓ Malha gerada: {mesh_file}")
-            
-            # ETAPA 2: Modificar configuração
-            print(f"\n[2/3] Configurando SU2...")
-            modify_config(mesh_file)
-            print(f"  ✓ Configuração atualizada")
-            
-            # ETAPA 3: Executar SU2
-            print(f"\n[3/3] Executando simulação SU2...")
-            print("-"*70)
-            su2_success = run_su2()
-            print("-"*70)
-            
-            if not su2_success:
-                print(f"  ✗ Falha na simulação!")
-                results.append((mesh_id, False, "Erro no SU2", 0))
-                continue
-            
-            print(f"  ✓ Simulação concluída")
-            
-            # Renomear outputs
-            print(f"\nRenomeando resultados...")
-            rename_outputs(mesh_id)
-            print(f"  ✓ Resultados salvos com ID: {mesh_id}")
-            
-            # Limpar temporários
-            if os.path.exists(GEO_TEMP):
-                os.remove(GEO_TEMP)
-            
-            case_time = time.time() - case_start
-            results.append((mesh_id, True, "OK", case_time))
-            
-            print(f"\n✓ Caso {mesh_id} concluído em {case_time:.1f}s")
-    
-    finally:
-        restore_config()
-        if os.path.exists(GEO_TEMP):
-            os.remove(GEO_TEMP)
-    
-    # Relatório final
-    total_time = time.time() - start_time
-    success_count = sum(1 for _, success, _, _ in results if success)
-    
-    print(f"\n\n{'='*70}")
-    print(f"RELATÓRIO FINAL DO ESTUDO PARAMÉTRICO")
-    print(f"{'='*70}")
-    print(f"\nTempo total: {total_time:.1f}s ({total_time/60:.1f} min)")
-    print(f"Casos processados: {len(results)}")
-    print(f"  ✓ Sucesso: {success_count}")
-    print(f"  ✗ Falhas: {len(results) - success_count}\n")
-    
-    print(f"{'Caso':<15} {'Status':<10} {'Tempo (s)':<12} {'Observação'}")
-    print("-"*70)
-    for mesh_id, success, msg, t in results:
-        status = "✓ OK" if success else "✗ ERRO"
-        time_str = f"{t:.1f}" if success else "-"
-        print(f"{mesh_id:<15} {status:<10} {time_str:<12} {msg}")
-    
-    print(f"{'='*70}\n")
-    
-    if success_count > 0:
-        print("Arquivos de resultado gerados:")
-        print("  • flow_[mesh_id].vtu       - Visualização no VISIT/Paraview")
-        print("  • history_[mesh_id].csv    - Histórico de convergência")
-        print("  • surface_flow_[mesh_id].vtu - Dados de superfície")
-        print("\nVocê pode abrir os arquivos .vtu no VISIT para análise!")
+    results, total_time = run_study(parameters, gmsh_path, status)
+    print_study_report(results, total_time)
 
 if __name__ == "__main__":
     main()
@@ -6,13 +6,23 @@ Versão: Paralela com multiprocessing
 """
 
 import os
+import sys
 import subprocess
 import shutil
 import glob
 from pathlib import Path
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 import time
 
+from su2_mesh import index_meshes, predicted_cost, print_statistics
+from mesh_quality import preflight_all, print_reports
+from su2_config import load_config, case_overrides, OUTPUT_KEYS
+from solver_profiler import run_profiled, throughput_metrics, append_performance_log
+from scheduler import estimate_case_memory, read_meminfo, run_with_admission
+from sweep_journal import record_state, resume_status, print_resume_status, case_outputs
+from artifact_store import archive_case, default_codec
+from tool_registry import find_tool
+
 # Configurações
 # SU2_PATH = r"C:\Users\ymarc\OneDrive\Documents\SU2-v8.3.0-win64\win64\bin\SU2_CFD.exe"
 SU2_PATH = r"C:\Users\ymarc\OneDrive\Documents\SU2-v8.3.0-win64-mpi\win64-mpi\bin\SU2_CFD.exe"
@@ -23,6 +33,10 @@ BASE_DIR = r"C:\Users\ymarc\OneDrive\Desktop\ITA_2025\AED_26\Lab9_Atividade1710"
 DIR_HORIZONTAL = os.path.join(BASE_DIR, "Analise_Horizontal")
 DIR_VERTICAL = os.path.join(BASE_DIR, "Analise_Vertical")
 
+def find_su2():
+    """Executável do SU2_CFD (registro em cache do tool_registry.py)"""
+    return find_tool('su2', preferred=SU2_PATH)
+
 def get_mesh_files(directory):
     """Retorna lista de arquivos de malha a serem processados"""
     # Busca todas as malhas mesh_*.su2 no diretório especificado
@@ -31,74 +45,138 @@ def get_mesh_files(directory):
     mesh_files.sort()  # Ordena alfabeticamente
     return mesh_files
 
-def create_config_for_mesh(mesh_filename, mesh_id, output_dir):
-    """Cria um arquivo de configuração específico para cada malha"""
+def order_by_cost(mesh_files):
+    """
+    Ordena as malhas do maior para o menor custo previsto (índice do su2_mesh)
+
+    Com os casos mais caros primeiro, a execução não termina com um único caso
+    grande rodando sozinho enquanto os outros processos ficam ociosos.
+
+    Returns:
+        mesh_files ordenados e dict caminho -> estatísticas
+    """
+    try:
+        stats = index_meshes(mesh_files)
+    except Exception as e:
+        print(f"  ⚠ Não foi possível indexar as malhas ({e}); mantendo a ordem alfabética")
+        return mesh_files, {}
+
+    ordered = sorted(mesh_files, key=lambda m: predicted_cost(stats[m]), reverse=True)
+    return ordered, stats
+
+def create_config_for_mesh(mesh_filename, mesh_id, output_dir, overrides=None):
+    """
+    Cria um arquivo de configuração específico para cada malha
+    
+    overrides: alterações extras do caso (ex.: {'CFL_NUMBER': 20.0}), usadas
+    pelas varreduras de parâmetros do solver (solver_sweep.py)
+    """
     config_temp = os.path.join(output_dir, f"lam_flatplate_{mesh_id}.cfg")
     
-    with open(CONFIG_FILE, 'r') as f:
-        lines = f.readlines()
-    
-    # Modifica as linhas necessárias para evitar conflitos entre processos paralelos
-    with open(config_temp, 'w') as f:
-        for line in lines:
-            if line.strip().startswith('MESH_FILENAME='):
-                f.write(f'MESH_FILENAME= {mesh_filename}\n')
-            elif line.strip().startswith('CONV_FILENAME='):
-                f.write(f'CONV_FILENAME= {os.path.join(output_dir, f"history_{mesh_id}")}\n')
-            elif line.strip().startswith('RESTART_FILENAME='):
-                f.write(f'RESTART_FILENAME= {os.path.join(output_dir, f"restart_flow_{mesh_id}.dat")}\n')
-            elif line.strip().startswith('VOLUME_FILENAME='):
-                f.write(f'VOLUME_FILENAME= {os.path.join(output_dir, f"flow_{mesh_id}")}\n')
-            elif line.strip().startswith('SURFACE_FILENAME='):
-                f.write(f'SURFACE_FILENAME= {os.path.join(output_dir, f"surface_flow_{mesh_id}")}\n')
-            else:
-                f.write(line)
+    # Configuração lida uma única vez por processo; só as linhas do caso mudam,
+    # evitando conflitos entre processos paralelos
+    config = load_config(CONFIG_FILE)
+    config.write(config_temp, {**(overrides or {}), **case_overrides(mesh_filename, mesh_id, output_dir)})
     
     return config_temp
 
+def record_profile(mesh_file, case_id, output_dir, overrides, run):
+    """
+    Calcula as métricas de throughput de uma execução e registra no
+    performance_log.jsonl do diretório de saída
+    """
+    mesh_id = os.path.basename(mesh_file).replace('mesh_', '').replace('.su2', '')
+    try:
+        stats = index_meshes([mesh_file])[mesh_file]
+        n_cells, n_points = stats['n_cells'], stats['n_points']
+    except Exception:
+        n_cells = n_points = None
+    
+    profile = throughput_metrics(run, n_cells)
+    record = {
+        'timestamp': time.time(),
+        'case_id': case_id,
+        'mesh_id': mesh_id,
+        'n_cells': n_cells,
+        'n_points': n_points,
+        'config_hash': load_config(CONFIG_FILE).canonical_hash(
+            overrides, exclude=OUTPUT_KEYS + ('MESH_FILENAME',)),
+        'success': run['returncode'] == 0,
+        **profile
+    }
+    try:
+        append_performance_log(output_dir, record)
+    except OSError:
+        pass
+    return profile
+
+def journal(output_dir, case_id, state, **info):
+    """Registra a transição no sweep_journal.jsonl (sem interromper o caso se falhar)"""
+    try:
+        record_state(output_dir, case_id, state, **info)
+    except OSError as e:
+        print(f"[{case_id}] ⚠ Não foi possível gravar o diário: {e}")
+
 def process_single_mesh(args):
-    """Processa uma única malha (função para ser executada em paralelo)"""
-    mesh_file, output_dir = args
+    """
+    Processa uma única malha (função para ser executada em paralelo)
+    
+    args: (mesh_file, output_dir) ou (mesh_file, output_dir, overrides, case_id),
+    em que overrides altera chaves do .cfg e case_id substitui o ID da malha
+    nos nomes dos arquivos de saída
+    """
+    mesh_file, output_dir = args[:2]
+    overrides = args[2] if len(args) > 2 else None
     
     # Extrai o mesh_id do nome do arquivo
     mesh_basename = os.path.basename(mesh_file)
     mesh_id = mesh_basename.replace('mesh_', '').replace('.su2', '')
+    if len(args) > 3 and args[3]:
+        mesh_id = args[3]
     
     print(f"\n[{mesh_id}] Iniciando processamento...")
     start_time = time.time()
     
     try:
         # Cria arquivo de configuração específico para esta malha
-        config_temp = create_config_for_mesh(mesh_file, mesh_id, output_dir)
+        config_temp = create_config_for_mesh(mesh_file, mesh_id, output_dir, overrides)
         print(f"[{mesh_id}] Arquivo de configuração criado: {config_temp}")
         
-        # Executa o SU2
+        # Executa o SU2 medindo memória, CPU e tempo por iteração (solver_profiler)
         print(f"[{mesh_id}] Executando SU2_CFD...")
-        result = subprocess.run(
-            [SU2_PATH, config_temp],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        journal(output_dir, mesh_id, 'solving')
+        su2_path = find_su2() or SU2_PATH
+        run = run_profiled([su2_path, config_temp])
+        profile = record_profile(mesh_file, mesh_id, output_dir, overrides, run)
+        if run['returncode'] != 0:
+            raise subprocess.CalledProcessError(run['returncode'], [su2_path, config_temp])
         
         # Remove arquivo de configuração temporário
         if os.path.exists(config_temp):
             os.remove(config_temp)
         
         elapsed_time = time.time() - start_time
+        journal(output_dir, mesh_id, 'solved', artifacts=case_outputs(output_dir, mesh_id),
+                time_s=elapsed_time)
         print(f"[{mesh_id}] ✓ Concluído em {elapsed_time:.1f}s")
+        if profile.get('iterations_per_s'):
+            print(f"[{mesh_id}]   {profile['iterations']} iterações, "
+                  f"{profile['iterations_per_s']:.1f} it/s")
         
         return {
             'mesh': mesh_file,
+            'case_id': mesh_id,
             'success': True,
             'time': elapsed_time,
-            'message': 'Sucesso'
+            'message': 'Sucesso',
+            'profile': profile
         }
         
     except subprocess.CalledProcessError as e:
         elapsed_time = time.time() - start_time
         error_msg = f"Erro código {e.returncode}"
         print(f"[{mesh_id}] ✗ {error_msg}")
+        journal(output_dir, mesh_id, 'failed', message=error_msg)
         
         # Remove arquivo de configuração temporário em caso de erro
         config_temp = os.path.join(output_dir, f"lam_flatplate_{mesh_id}.cfg")
@@ -107,6 +185,7 @@ def process_single_mesh(args):
         
         return {
             'mesh': mesh_file,
+            'case_id': mesh_id,
             'success': False,
             'time': elapsed_time,
             'message': error_msg
@@ -116,6 +195,7 @@ def process_single_mesh(args):
         elapsed_time = time.time() - start_time
         error_msg = f"Exceção: {str(e)}"
         print(f"[{mesh_id}] ✗ {error_msg}")
+        journal(output_dir, mesh_id, 'failed', message=error_msg)
         
         # Remove arquivo de configuração temporário em caso de erro
         config_temp = os.path.join(output_dir, f"lam_flatplate_{mesh_id}.cfg")
@@ -124,22 +204,207 @@ def process_single_mesh(args):
         
         return {
             'mesh': mesh_file,
+            'case_id': mesh_id,
             'success': False,
             'time': elapsed_time,
             'message': error_msg
         }
 
+def plan_batch(work_dir, resume=False):
+    """
+    Malhas de um diretório prontas para o SU2, na ordem de execução
+    
+    Ordena por custo previsto, descarta malhas rejeitadas na verificação de
+    qualidade, pula casos já concluídos (resume=True) e estima a memória de
+    cada caso.
+    
+    Returns:
+        dict com mesh_files, mesh_ids, memory_mb, quality e rejected
+        (mesh_files vazio se tudo já foi concluído ou todas as malhas foram
+        rejeitadas), ou None se não há malhas no diretório
+    """
+    # Obtém lista de malhas
+    mesh_files = get_mesh_files(work_dir)
+    
+    if not mesh_files:
+        print(f"\n✗ Nenhuma malha encontrada no padrão 'mesh_d*.su2' em {work_dir}")
+        return None
+    
+    print(f"Malhas encontradas: {len(mesh_files)}")
+    
+    # Estatísticas das malhas e ordem de execução (maior custo primeiro)
+    mesh_files, mesh_stats = order_by_cost(mesh_files)
+    if mesh_stats:
+        print("\nOrdem de execução (maior custo previsto primeiro):")
+        print_statistics({m: mesh_stats[m] for m in mesh_files})
+    else:
+        for i, mesh in enumerate(mesh_files, 1):
+            print(f"  {i}. {mesh}")
+    
+    # Verificação de qualidade: malhas rejeitadas não vão para o SU2
+    print("\nVerificação de qualidade das malhas:")
+    mesh_files, quality = preflight_all(mesh_files, CONFIG_FILE)
+    print_reports(quality)
+    rejected = [m for m, report in quality.items() if report['status'] == 'rejeitada']
+    if rejected:
+        print(f"\n✗ {len(rejected)} malha(s) rejeitada(s) não serão simuladas")
+    if not mesh_files:
+        # As rejeitadas ainda entram no relatório e no diário (execute_batch)
+        print("\n✗ Nenhuma malha aprovada na verificação de qualidade!")
+        return {'mesh_files': [], 'mesh_ids': [], 'memory_mb': [],
+                'quality': quality, 'rejected': rejected}
+    
+    mesh_ids = [os.path.basename(m).replace('mesh_', '').replace('.su2', '') for m in mesh_files]
+    
+    # Retomada: só casos sem registro 'solved' válido no diário
+    if resume:
+        print("\nRetomada pelo diário da varredura:")
+        status = resume_status(work_dir, mesh_ids)
+        print_resume_status(status)
+        mesh_files = [m for m, i in zip(mesh_files, mesh_ids) if status[i][0] != 'done']
+        mesh_ids = [i for i in mesh_ids if status[i][0] != 'done']
+        if not mesh_files:
+            print("\n✓ Todos os casos já foram concluídos!")
+            return {'mesh_files': [], 'mesh_ids': [], 'memory_mb': [],
+                    'quality': quality, 'rejected': rejected}
+    
+    # Memória estimada por caso (picos medidos anteriormente ou modelo por nós)
+    n_points = [mesh_stats.get(m, {}).get('n_points', 0) for m in mesh_files]
+    memory_mb, measured = estimate_case_memory(mesh_ids, n_points, [work_dir])
+    meminfo = read_meminfo()
+    print(f"Memória estimada por caso: {min(memory_mb):.0f}-{max(memory_mb):.0f} MB "
+          f"({int(measured.sum())} de {len(mesh_files)} medidas em execuções anteriores)")
+    if meminfo:
+        print(f"Memória disponível: {meminfo['MemAvailable']:.0f} MB de {meminfo['MemTotal']:.0f} MB")
+    
+    return {'mesh_files': mesh_files, 'mesh_ids': mesh_ids, 'memory_mb': memory_mb,
+            'quality': quality, 'rejected': rejected}
+
+def execute_batch(plan, work_dir, num_processes, archive=False, on_result=None):
+    """
+    Executa o SU2 nas malhas de um plano (plan_batch) com admissão por memória
+    
+    Args:
+        num_processes: limite de casos simultâneos
+        archive: comprime os resultados concluídos em .aedz
+        on_result: chamada com o dict de cada caso assim que termina
+    
+    Returns:
+        (lista de resultados, tempo total em s); malhas rejeitadas entram
+        como falhas
+    """
+    mesh_files, mesh_ids = plan['mesh_files'], plan['mesh_ids']
+    start_time_total = time.time()
+    
+    # Diário: a malha já existe, então o caso entra como planejado e malhado
+    # (se a malha mudar depois, o resultado deixa de valer na retomada)
+    for mesh_file, mesh_id in zip(mesh_files, mesh_ids):
+        journal(work_dir, mesh_id, 'planned')
+        journal(work_dir, mesh_id, 'meshed', artifacts=[mesh_file])
+    
+    # Prepara argumentos para cada malha (mesh_file, output_dir)
+    mesh_args = [(mesh_file, work_dir) for mesh_file in mesh_files]
+    
+    # Executa em paralelo na ordem de custo, admitindo cada caso só quando a
+    # memória estimada dele cabe junto com os casos em execução
+    results = []
+    if mesh_args:
+        results = run_with_admission(process_single_mesh, mesh_args, plan['memory_mb'],
+                                     max_workers=num_processes,
+                                     on_result=None if on_result is None else lambda k, r: on_result(r))
+    
+    total_time = time.time() - start_time_total
+    
+    # Arquivamento comprimido dos resultados concluídos
+    if archive:
+        print(f"\nArquivando resultados (codec: {default_codec()})...")
+        size = archived = 0
+        for r in results:
+            if r['success']:
+                for item in archive_case(work_dir, r['case_id'], remove=True):
+                    size += item['size']
+                    archived += item['archived_size']
+        if archived:
+            print(f"  ✓ {size / 1024**2:.1f} MB → {archived / 1024**2:.1f} MB ({size / archived:.1f}x)")
+    
+    # Malhas rejeitadas entram no relatório e no diário como falhas
+    for mesh_file in plan['rejected']:
+        mesh_id = os.path.basename(mesh_file).replace('mesh_', '').replace('.su2', '')
+        message = 'Rejeitada na verificação de qualidade: ' + '; '.join(plan['quality'][mesh_file]['errors'])
+        journal(work_dir, mesh_id, 'planned')
+        journal(work_dir, mesh_id, 'failed', message=message)
+        results.append({
+            'mesh': mesh_file,
+            'case_id': mesh_id,
+            'success': False,
+            'time': 0.0,
+            'message': message
+        })
+        if on_result is not None:
+            on_result(results[-1])
+    
+    return results, total_time
+
+def print_report(results, total_time, n_cases):
+    """Relatório final de execute_batch (n_cases: casos executados)"""
+    # Processa resultados
+    success_count = sum(1 for r in results if r['success'])
+    fail_count = len(results) - success_count
+    
+    # Relatório detalhado
+    print(f"\n\n{'='*60}")
+    print(f"RELATÓRIO DETALHADO")
+    print(f"{'='*60}")
+    
+    print("\nSimulações bem-sucedidas:")
+    for r in results:
+        if r['success']:
+            print(f"  ✓ {r['mesh']}: {r['time']:.1f}s")
+    
+    if fail_count > 0:
+        print("\nSimulações com falha:")
+        for r in results:
+            if not r['success']:
+                print(f"  ✗ {r['mesh']}: {r['message']}")
+    
+    # Relatório final
+    print(f"\n{'='*60}")
+    print(f"RELATÓRIO FINAL")
+    print(f"{'='*60}")
+    print(f"Total de malhas processadas: {len(results)}")
+    print(f"  ✓ Sucesso: {success_count}")
+    print(f"  ✗ Falhas: {fail_count}")
+    print(f"\nTempo total: {total_time:.1f}s ({total_time/60:.1f} minutos)")
+    if success_count > 0:
+        print(f"Tempo médio por malha: {total_time/n_cases:.1f}s")
+    print(f"{'='*60}\n")
+
 def main():
-    """Função principal com processamento paralelo"""
+    """
+    Função principal com processamento paralelo
+    
+    Com --resume, casos já concluídos (sweep_journal.jsonl do diretório, com
+    os arquivos de resultado íntegros) não são executados de novo.
+    Com --archive, os resultados de cada caso concluído são comprimidos em
+    .aedz (artifact_store.py) e os originais removidos.
+    """
+    resume = '--resume' in sys.argv[1:]
+    archive = '--archive' in sys.argv[1:]
+    
     print("\n" + "="*60)
     print("Script de Execução Automatizada do SU2 (PARALELO)")
+    if resume:
+        print("Modo: retomada (--resume)")
     print("="*60 + "\n")
     
     # Verifica se o SU2 existe
-    if not os.path.exists(SU2_PATH):
+    su2_path = find_su2()
+    if su2_path is None:
         print(f"✗ ERRO: SU2_CFD.exe não encontrado!")
-        print(f"  Caminho: {SU2_PATH}")
+        print(f"  Caminho configurado: {SU2_PATH}")
+        print("  Registre com: python tool_registry.py set su2 <caminho do SU2_CFD>")
         return
+    print(f"✓ SU2: {su2_path}")
     
     # Verifica se o arquivo de configuração existe
     if not os.path.exists(CONFIG_FILE):
@@ -177,17 +442,17 @@ def main():
         print(f"  Crie o diretório primeiro ou gere as malhas.")
         return
     
-    # Obtém lista de malhas
-    mesh_files = get_mesh_files(work_dir)
-    
+    plan = plan_batch(work_dir, resume)
+    if plan is None:
+        return
+    mesh_files, rejected = plan['mesh_files'], plan['rejected']
     if not mesh_files:
-        print(f"\n✗ Nenhuma malha encontrada no padrão 'mesh_d*.su2' em {work_dir}")
+        # Nada a simular; malhas rejeitadas ainda são registradas como falhas
+        if rejected:
+            results, total_time = execute_batch(plan, work_dir, 1)
+            print_report(results, total_time, 0)
         return
     
-    print(f"Malhas encontradas: {len(mesh_files)}")
-    for i, mesh in enumerate(mesh_files, 1):
-        print(f"  {i}. {mesh}")
-    
     # Detecta número de CPUs
     num_cpus = cpu_count()
     print(f"\nNúmero de CPUs disponíveis: {num_cpus}")
@@ -216,7 +481,10 @@ def main():
     print(f"\n{'='*60}")
     print(f"Configuração:")
     print(f"  Malhas: {len(mesh_files)}")
-    print(f"  Processos paralelos: {num_processes}")
+    if rejected:
+        print(f"  Rejeitadas na verificação: {len(rejected)}")
+    print(f"  Processos paralelos (máximo): {num_processes}")
+    print(f"  Admissão por memória: casos só iniciam se couberem na RAM disponível")
     print(f"{'='*60}")
     response = input("\nDeseja iniciar o processamento? (s/n): ")
     if response.lower() != 's':
@@ -228,48 +496,8 @@ def main():
     print(f"INICIANDO PROCESSAMENTO PARALELO")
     print(f"{'='*60}\n")
     
-    start_time_total = time.time()
-    
-    # Prepara argumentos para cada malha (mesh_file, output_dir)
-    mesh_args = [(mesh_file, work_dir) for mesh_file in mesh_files]
-    
-    # Usa Pool para executar em paralelo
-    with Pool(processes=num_processes) as pool:
-        results = pool.map(process_single_mesh, mesh_args)
-    
-    total_time = time.time() - start_time_total
-    
-    # Processa resultados
-    success_count = sum(1 for r in results if r['success'])
-    fail_count = len(results) - success_count
-    
-    # Relatório detalhado
-    print(f"\n\n{'='*60}")
-    print(f"RELATÓRIO DETALHADO")
-    print(f"{'='*60}")
-    
-    print("\nSimulações bem-sucedidas:")
-    for r in results:
-        if r['success']:
-            print(f"  ✓ {r['mesh']}: {r['time']:.1f}s")
-    
-    if fail_count > 0:
-        print("\nSimulações com falha:")
-        for r in results:
-            if not r['success']:
-                print(f"  ✗ {r['mesh']}: {r['message']}")
-    
-    # Relatório final
-    print(f"\n{'='*60}")
-    print(f"RELATÓRIO FINAL")
-    print(f"{'='*60}")
-    print(f"Total de malhas processadas: {len(mesh_files)}")
-    print(f"  ✓ Sucesso: {success_count}")
-    print(f"  ✗ Falhas: {fail_count}")
-    print(f"\nTempo total: {total_time:.1f}s ({total_time/60:.1f} minutos)")
-    if success_count > 0:
-        print(f"Tempo médio por malha: {total_time/len(mesh_files):.1f}s")
-    print(f"{'='*60}\n")
+    results, total_time = execute_batch(plan, work_dir, num_processes, archive)
+    print_report(results, total_time, len(mesh_files))
 
 if __name__ == "__main__":
     main()
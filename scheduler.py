@@ -0,0 +1,182 @@
+"""
+Controle de admissão dos casos do SU2 por memória e núcleos disponíveis
+Autor: Script automatizado
+Data: 2025
+
+O Pool do run_su2_batch rodava sempre N casos ao mesmo tempo, qualquer que
+fosse o tamanho das malhas; em varreduras grandes (modo combinado) isso
+pode esgotar a RAM e levar o sistema ao swap. Aqui cada caso tem uma
+estimativa de memória:
+- pico medido em execuções anteriores da mesma malha (performance_log.jsonl
+  do solver_profiler), ou
+- modelo por número de nós do mesh_planner, calibrado pelos picos medidos
+  de outras malhas quando houver
+
+e um novo caso só é admitido enquanto a memória comprometida pelos casos em
+execução mais a dele couber no orçamento e a memória livre no momento
+(/proc/meminfo) também comportar o caso. A concorrência se adapta durante a
+execução: casos grandes rodam com menos vizinhos, casos pequenos preenchem
+os núcleos livres.
+"""
+
+import os
+import queue
+from multiprocessing import Pool
+
+import numpy as np
+
+from mesh_planner import estimate_memory
+from solver_profiler import load_performance_log
+
+# Fração da memória disponível no início que pode ser comprometida
+MEMORY_FRACTION = 0.85
+# Memória mantida livre para o sistema (MB)
+MEMORY_RESERVE_MB = 512
+# Núcleos por caso (SU2_CFD serial)
+CORES_PER_CASE = 1
+
+
+def read_meminfo():
+    """MemTotal e MemAvailable (MB) do /proc/meminfo, ou None sem /proc"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            text = f.read()
+    except OSError:
+        return None
+    values = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(':')
+        if key in ('MemTotal', 'MemAvailable'):
+            values[key] = int(rest.split()[0]) / 1024
+    return values if 'MemAvailable' in values else None
+
+
+def available_cores():
+    """Núcleos que este processo pode usar (afinidade, se disponível)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def estimate_case_memory(mesh_ids, n_points, directories=()):
+    """
+    Memória estimada (MB) de cada caso
+
+    Args:
+        mesh_ids: ID de cada caso (como no performance_log)
+        n_points: número de nós de cada malha
+        directories: diretórios com performance_log.jsonl de execuções anteriores
+
+    Returns:
+        estimates: array [caso] em MB
+        measured: array [caso] bool (True se veio de um pico medido)
+    """
+    import pandas as pd
+
+    n_points = np.asarray(n_points, dtype=float)
+    model = estimate_memory(n_points) / 1024**2
+
+    logs = [load_performance_log(d) for d in directories]
+    logs = [log for log in logs if not log.empty and 'peak_memory_mb' in log]
+    peaks = {}
+    factors = []
+    if logs:
+        log = pd.concat(logs, ignore_index=True)
+        log = log[pd.to_numeric(log['peak_memory_mb'], errors='coerce') > 0]
+        for mesh_id, group in log.groupby('mesh_id'):
+            peaks[mesh_id] = float(group['peak_memory_mb'].max())
+        # Calibração do modelo: razão pico medido / estimado pelo número de nós
+        if 'n_points' in log:
+            nodes = pd.to_numeric(log['n_points'], errors='coerce')
+            ok = nodes > 0
+            if ok.any():
+                factors = (log.loc[ok, 'peak_memory_mb'] /
+                           (estimate_memory(nodes[ok]) / 1024**2)).to_numpy()
+
+    factor = float(np.median(factors)) if len(factors) else 1.0
+    estimates = model * factor
+    measured = np.zeros(len(estimates), dtype=bool)
+    for k, mesh_id in enumerate(mesh_ids):
+        if mesh_id in peaks:
+            estimates[k] = peaks[mesh_id]
+            measured[k] = True
+    return estimates, measured
+
+
+def run_with_admission(func, tasks, memory_mb, max_workers=None, memory_budget_mb=None,
+                       reserve_mb=MEMORY_RESERVE_MB, poll_interval=0.5, log=print,
+                       on_result=None):
+    """
+    Executa func(task) em paralelo admitindo casos por memória e núcleos
+
+    A ordem de 'tasks' é a ordem de preferência (ex.: maior custo primeiro);
+    quando o próximo caso não cabe, casos menores da fila podem entrar antes
+    dele. Um caso maior que o orçamento roda sozinho.
+
+    Args:
+        func: função executada em outro processo (picklável)
+        tasks: lista de argumentos
+        memory_mb: memória estimada de cada tarefa (MB)
+        max_workers: limite de casos simultâneos (padrão: núcleos / CORES_PER_CASE)
+        memory_budget_mb: memória total que pode ser comprometida (padrão:
+                          MEMORY_FRACTION da memória disponível no início)
+        reserve_mb: memória livre mínima exigida a cada admissão
+        on_result: chamada com (índice, resultado) assim que cada caso termina
+
+    Returns:
+        resultados na mesma ordem de 'tasks'
+    """
+    memory_mb = [float(m) for m in memory_mb]
+    if max_workers is None:
+        max_workers = max(1, available_cores() // CORES_PER_CASE)
+
+    meminfo = read_meminfo()
+    if memory_budget_mb is None:
+        memory_budget_mb = meminfo['MemAvailable'] * MEMORY_FRACTION if meminfo else np.inf
+
+    pending = list(range(len(tasks)))
+    running = {}
+    results = [None] * len(tasks)
+    done = queue.Queue()
+    peak_concurrency = 0
+
+    def fits(k):
+        committed = sum(memory_mb[j] for j in running)
+        if committed + memory_mb[k] > memory_budget_mb:
+            return False
+        live = read_meminfo()
+        return live is None or live['MemAvailable'] - reserve_mb >= memory_mb[k]
+
+    with Pool(processes=max_workers) as pool:
+        while pending or running:
+            admitted = True
+            while pending and len(running) < max_workers and admitted:
+                admitted = False
+                for position, k in enumerate(pending):
+                    if not running or fits(k):
+                        if not running and memory_mb[k] > memory_budget_mb:
+                            log(f"  ⚠ Caso {k + 1} estimado em {memory_mb[k]:.0f} MB "
+                                f"(acima do orçamento de {memory_budget_mb:.0f} MB): rodando sozinho")
+                        pending.pop(position)
+                        running[k] = pool.apply_async(
+                            func, (tasks[k],),
+                            callback=lambda result, k=k: done.put((k, result, None)),
+                            error_callback=lambda error, k=k: done.put((k, None, error)))
+                        admitted = True
+                        break
+            peak_concurrency = max(peak_concurrency, len(running))
+
+            try:
+                k, result, error = done.get(timeout=poll_interval)
+            except queue.Empty:
+                continue
+            running.pop(k, None)
+            if error is not None:
+                raise error
+            results[k] = result
+            if on_result is not None:
+                on_result(k, result)
+
+    log(f"  Concorrência máxima atingida: {peak_concurrency} caso(s) "
+        f"(limite: {max_workers}, orçamento: {memory_budget_mb:.0f} MB)")
+    return results
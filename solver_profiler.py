@@ -0,0 +1,350 @@
+"""
+Perfil de desempenho do SU2 por caso (throughput, memória, CPU)
+Autor: Script automatizado
+Data: 2025
+
+Executa o SU2_CFD com Popen e, enquanto ele roda, lê /proc do processo e
+dos filhos (mpirun) para medir o pico de memória (VmHWM / soma de VmRSS).
+O tempo de CPU vem do rusage devolvido por os.wait4 ao recolher o processo
+(inclui os filhos já recolhidos por ele, como os ranks do mpirun). A saída
+de tela é analisada para obter a coluna Time(sec) (WALL_TIME do
+SCREEN_OUTPUT, média acumulada por iteração) e o número de iterações.
+
+Cada execução acrescenta uma linha em performance_log.jsonl no diretório
+de saída; o relatório compara cada caso com as execuções anteriores da
+mesma malha e configuração (hash canônico do .cfg) e aponta regressões de
+throughput. Em sistemas sem /proc e os.wait4 (Windows) memória e CPU
+ficam vazias.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import subprocess
+
+import numpy as np
+
+PERFORMANCE_LOG = "performance_log.jsonl"
+POLL_INTERVAL = 0.2
+
+# Aumento relativo do tempo por iteração por célula considerado regressão
+REGRESSION_TOLERANCE = 0.10
+
+_CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+# ============================================================================
+# LEITURA DO /proc
+# ============================================================================
+
+def _proc_status(pid):
+    """VmRSS e VmHWM (bytes) de um processo, ou None se indisponível"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            text = f.read()
+    except OSError:
+        return None
+    values = {}
+    for key in ('VmRSS', 'VmHWM'):
+        match = re.search(rf'^{key}:\s*(\d+)\s*kB', text, re.MULTILINE)
+        values[key] = int(match.group(1)) * 1024 if match else 0
+    return values
+
+
+def _proc_stat(pid):
+    """(ppid, tempo de CPU em s) de um processo, ou None se indisponível"""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            text = f.read()
+    except OSError:
+        return None
+    # O nome do processo (campo 2) pode conter espaços: divide após o último ')'
+    fields = text[text.rfind(')') + 2:].split()
+    ppid = int(fields[1])
+    # utime + stime (sem cutime/cstime: os filhos já são medidos individualmente)
+    cpu = (int(fields[11]) + int(fields[12])) / _CLK_TCK
+    return ppid, cpu
+
+
+def process_tree(pid):
+    """PIDs do processo e de todos os descendentes (varredura do /proc)"""
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return [pid]
+    for entry in entries:
+        if entry.isdigit():
+            stat = _proc_stat(int(entry))
+            if stat is not None:
+                children.setdefault(stat[0], []).append(int(entry))
+
+    tree = [pid]
+    k = 0
+    while k < len(tree):
+        tree.extend(children.get(tree[k], []))
+        k += 1
+    return tree
+
+
+# ============================================================================
+# SAÍDA DE TELA DO SU2
+# ============================================================================
+
+def parse_screen_output(text):
+    """
+    Tabela de iterações da saída de tela do SU2
+
+    As linhas têm o formato "|  Inner_Iter|   Time(sec)|    rms[Rho]|...";
+    usa o último cabeçalho encontrado.
+
+    Returns:
+        DataFrame com as colunas da tabela (vazio se nada for encontrado)
+    """
+    import pandas as pd
+
+    header = None
+    rows = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not (line.startswith('|') and line.endswith('|')):
+            continue
+        cells = [cell.strip() for cell in line.strip('|').split('|')]
+        if 'Inner_Iter' in cells or 'Time(sec)' in cells:
+            header = cells
+            rows = []
+            continue
+        if header is None or len(cells) != len(header):
+            continue
+        try:
+            rows.append([float(cell) for cell in cells])
+        except ValueError:
+            continue
+
+    if header is None:
+        return pd.DataFrame()
+    return pd.DataFrame(rows, columns=header)
+
+
+# ============================================================================
+# EXECUÇÃO INSTRUMENTADA
+# ============================================================================
+
+def run_profiled(cmd, poll_interval=POLL_INTERVAL, cwd=None):
+    """
+    Executa um comando medindo memória pelo /proc e CPU pelo os.wait4
+
+    Returns:
+        dict com returncode, stdout, stderr, wall_time (s), cpu_time (s),
+        cpu_percent (100 = um núcleo ocupado), peak_rss_mb (maior soma de
+        VmRSS da árvore de processos) e peak_hwm_mb (maior VmHWM individual)
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, cwd=cwd)
+
+    # stdout/stderr lidos por threads para não bloquear o processo filho
+    output = {'stdout': [], 'stderr': []}
+
+    def drain(stream, key):
+        for line in stream:
+            output[key].append(line)
+
+    readers = [threading.Thread(target=drain, args=(process.stdout, 'stdout'), daemon=True),
+               threading.Thread(target=drain, args=(process.stderr, 'stderr'), daemon=True)]
+    for reader in readers:
+        reader.start()
+
+    has_proc = os.path.isdir('/proc')
+    has_wait4 = hasattr(os, 'wait4')
+    peak_rss = 0
+    peak_hwm = 0
+    cpu_time = None
+
+    while True:
+        if has_wait4:
+            # Recolhe o processo aqui (e não com poll) para obter o rusage completo
+            pid, wait_status, usage = os.wait4(process.pid, os.WNOHANG)
+            if pid == process.pid:
+                process.returncode = os.waitstatus_to_exitcode(wait_status)
+                cpu_time = usage.ru_utime + usage.ru_stime
+                break
+        elif process.poll() is not None:
+            break
+
+        if has_proc:
+            rss = 0
+            for pid in process_tree(process.pid):
+                status = _proc_status(pid)
+                if status is not None:
+                    rss += status['VmRSS']
+                    peak_hwm = max(peak_hwm, status['VmHWM'])
+            peak_rss = max(peak_rss, rss)
+        time.sleep(poll_interval)
+
+    for reader in readers:
+        reader.join()
+    wall_time = time.perf_counter() - start
+
+    return {
+        'returncode': process.returncode,
+        'stdout': ''.join(output['stdout']),
+        'stderr': ''.join(output['stderr']),
+        'wall_time': wall_time,
+        'cpu_time': cpu_time,
+        'cpu_percent': 100.0 * cpu_time / wall_time if cpu_time is not None and wall_time > 0 else None,
+        'peak_rss_mb': peak_rss / 1024**2 if has_proc else None,
+        'peak_hwm_mb': peak_hwm / 1024**2 if has_proc else None,
+    }
+
+
+def throughput_metrics(run, n_cells=None):
+    """
+    Métricas de throughput a partir de uma execução (run_profiled)
+
+    Returns:
+        dict com iterations, su2_time_per_iter (último valor da coluna Time(sec)),
+        iterations_per_s, time_per_iter_per_cell (s), cpu_percent e
+        peak_memory_mb
+    """
+    table = parse_screen_output(run['stdout'])
+    iterations = None
+    su2_time_per_iter = None
+
+    if len(table):
+        if 'Inner_Iter' in table:
+            iterations = int(table['Inner_Iter'].iloc[-1]) + 1
+        else:
+            iterations = len(table)
+        if 'Time(sec)' in table:
+            # O SU2 já informa a média acumulada por iteração: vale a última linha
+            su2_time_per_iter = float(table['Time(sec)'].iloc[-1])
+
+    time_per_iter = su2_time_per_iter
+    if time_per_iter is None and iterations:
+        time_per_iter = run['wall_time'] / iterations
+
+    peak = [v for v in (run['peak_rss_mb'], run['peak_hwm_mb']) if v is not None]
+
+    return {
+        'iterations': iterations,
+        'wall_time': run['wall_time'],
+        'su2_time_per_iter': su2_time_per_iter,
+        'iterations_per_s': iterations / run['wall_time'] if iterations and run['wall_time'] > 0 else None,
+        'time_per_iter_per_cell': time_per_iter / n_cells if time_per_iter and n_cells else None,
+        'cpu_percent': run['cpu_percent'],
+        'peak_memory_mb': max(peak) if peak else None,
+    }
+
+
+# ============================================================================
+# REGISTRO E RELATÓRIO
+# ============================================================================
+
+def append_performance_log(output_dir, record):
+    """Acrescenta uma linha ao performance_log.jsonl do diretório"""
+    with open(os.path.join(output_dir, PERFORMANCE_LOG), 'a') as f:
+        f.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def load_performance_log(directory):
+    """Todas as execuções registradas em um diretório (DataFrame, vazio se não houver)"""
+    import pandas as pd
+
+    log_file = os.path.join(directory, PERFORMANCE_LOG)
+    if not os.path.exists(log_file):
+        return pd.DataFrame()
+    records = []
+    with open(log_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return pd.DataFrame(records)
+
+
+def performance_report(log, tolerance=REGRESSION_TOLERANCE):
+    """
+    Última execução de cada caso comparada com as anteriores
+
+    Casos são comparados só com execuções da mesma malha (mesh_id e
+    n_cells) e da mesma configuração (config_hash). Regressão: tempo por
+    iteração por célula maior que o melhor anterior em mais de 'tolerance'.
+
+    Returns:
+        DataFrame com uma linha por caso
+    """
+    import pandas as pd
+
+    if log.empty:
+        return log
+
+    log = log.sort_values('timestamp')
+    key = ['case_id', 'mesh_id', 'n_cells', 'config_hash']
+    metric = 'time_per_iter_per_cell'
+
+    rows = []
+    for _, group in log.groupby(key, dropna=False, sort=False):
+        last = group.iloc[-1].to_dict()
+        previous = pd.to_numeric(group[metric].iloc[:-1], errors='coerce').dropna()
+        best = previous.min() if len(previous) else np.nan
+        current = last.get(metric)
+        last['n_runs'] = len(group)
+        last['best_previous'] = best
+        if current is not None and np.isfinite(best) and best > 0:
+            last['change'] = current / best - 1.0
+        else:
+            last['change'] = np.nan
+        last['regression'] = bool(np.isfinite(last['change']) and last['change'] > tolerance)
+        rows.append(last)
+
+    columns = ['case_id', 'mesh_id', 'n_cells', 'config_hash', 'success', 'iterations',
+               'wall_time', 'iterations_per_s', 'time_per_iter_per_cell', 'peak_memory_mb',
+               'cpu_percent', 'n_runs', 'best_previous', 'change', 'regression']
+    report = pd.DataFrame(rows)
+    return report[[c for c in columns if c in report.columns]]
+
+
+def main():
+    """Função principal - relatório de desempenho de um diretório de resultados"""
+    import sys
+
+    import pandas as pd
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else '.'
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "DESEMPENHO DO SU2 POR CASO")
+    print("=" * 70)
+
+    log = load_performance_log(directory)
+    if log.empty:
+        print(f"\n✗ Nenhum registro em {os.path.join(directory, PERFORMANCE_LOG)}")
+        print("  Rode o run_su2_batch.py para gerar os registros.")
+        return
+
+    report = performance_report(log)
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(report.to_string(index=False))
+
+    output_csv = os.path.join(directory, 'performance_report.csv')
+    report.to_csv(output_csv, index=False)
+
+    regressions = report[report['regression']]
+    if len(regressions):
+        print(f"\n⚠ {len(regressions)} caso(s) com regressão de throughput "
+              f"(> {REGRESSION_TOLERANCE:.0%} mais lento por iteração por célula):")
+        for _, row in regressions.iterrows():
+            print(f"  • {row['case_id']}: {row['change']:+.1%}")
+    else:
+        print("\n✓ Nenhuma regressão de throughput")
+    print(f"✓ Relatório salvo em: {output_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Varredura de parâmetros do solver (CFL, multigrid, solver linear, esquema...)
+Autor: Script automatizado
+Data: 2025
+
+As varreduras de domínio variam só x_inlet e H_dom. Aqui os eixos são
+chaves quaisquer do lam_flatplate.cfg (CFL_NUMBER, CFL_ADAPT_PARAM,
+LINEAR_SOLVER_ITER, MGLEVEL, CONV_NUM_METHOD_FLOW, ...), combinadas em
+produto cartesiano ou amostradas, e cada combinação roda em todas as
+malhas da família pelo run_su2_batch. Para cada caso são medidos as
+iterações até a convergência e o tempo de parede; o relatório ordena as
+combinações das mais rápidas para as mais lentas.
+
+Os casos passam pelas mesmas etapas do run_su2_batch: verificação de
+qualidade das malhas (malhas rejeitadas não vão para o SU2), ordem de
+maior custo primeiro e admissão por memória e núcleos
+(scheduler.run_with_admission), para a varredura não esgotar a RAM.
+"""
+
+import os
+import itertools
+
+import numpy as np
+
+from artifact_store import artifact_exists
+from analyze_results import load_history
+from su2_config import load_config, OUTPUT_KEYS
+from solver_profiler import load_performance_log
+
+# Eixos padrão (chave do .cfg -> valores)
+SOLVER_AXES = {
+    'CFL_NUMBER': [5.0, 10.0, 20.0, 50.0],
+    'CFL_ADAPT_PARAM': [(0.1, 1.25, 1.0, 200), (0.5, 1.5, 1.0, 1000)],
+    'LINEAR_SOLVER_ITER': [10, 20, 40],
+    'MGLEVEL': [0, 2, 3],
+    'CONV_NUM_METHOD_FLOW': ['ROE', 'JST'],
+}
+
+RESIDUAL_COLUMN = 'rms[Rho]'
+SWEEP_DIR = "solver_sweep"
+CASES_FILE = "solver_sweep_cases.csv"
+
+# Colunas do performance_log.jsonl copiadas para a tabela de casos
+PROFILE_COLUMNS = ['iterations_per_s', 'time_per_iter_per_cell', 'peak_memory_mb', 'cpu_percent']
+
+
+def expand_spec(axes, mode='cartesian', n_samples=None, seed=0):
+    """
+    Lista de combinações (dicts chave -> valor) a partir dos eixos
+
+    Args:
+        axes: dict chave do .cfg -> lista de valores
+        mode: 'cartesian' (todas as combinações) ou 'sampled' (n_samples
+              combinações distintas sorteadas do produto, sem montá-lo)
+        seed: semente do sorteio
+    """
+    keys = list(axes)
+    values = [list(axes[key]) for key in keys]
+
+    if mode == 'cartesian':
+        return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+    if mode != 'sampled':
+        raise ValueError(f"Modo desconhecido: {mode}")
+
+    sizes = np.array([len(v) for v in values], dtype=np.int64)
+    total = int(np.prod(sizes))
+    n = total if n_samples is None else min(int(n_samples), total)
+    flat = np.random.default_rng(seed).choice(total, size=n, replace=False)
+
+    # Índice linear -> índice em cada eixo (base mista, último eixo mais rápido)
+    strides = np.concatenate((np.cumprod(sizes[::-1])[::-1][1:], [1]))
+    digits = (flat[:, None] // strides) % sizes
+    return [{key: values[k][d] for k, (key, d) in enumerate(zip(keys, row))} for row in digits]
+
+
+def settings_id(overrides, config=None):
+    """Identificador curto e estável de uma combinação (hash canônico do .cfg efetivo)"""
+    config = config or load_config()
+    return config.canonical_hash(overrides, exclude=OUTPUT_KEYS + ('MESH_FILENAME',))[:8]
+
+
+def history_metrics(history_file, residual_column=RESIDUAL_COLUMN, target=None):
+    """
+    Iterações e resíduo final de um caso
+
+    Args:
+        target: resíduo (log10) de convergência; padrão CONV_RESIDUAL_MINVAL do .cfg
+
+    Returns:
+        dict com iterations, final_residual, converged e diverged
+    """
+    import pandas as pd
+
+    if target is None:
+        target = float(load_config().get('CONV_RESIDUAL_MINVAL', -12))
+
+    empty = {'iterations': np.nan, 'final_residual': np.nan, 'converged': False, 'diverged': False}
+    if not artifact_exists(history_file):
+        return empty
+    df = load_history(history_file)
+    if df is None or len(df) == 0:
+        return empty
+
+    columns = [col.strip('"').strip() for col in df.columns]
+    df.columns = columns
+    residual_cols = [col for col in columns if col == residual_column] or \
+        [col for col in columns if col.startswith('rms')]
+    iter_cols = [col for col in columns if col == 'Inner_Iter'] or columns[:1]
+
+    residual = pd.to_numeric(df[residual_cols[0]], errors='coerce').to_numpy() if residual_cols else None
+    iterations = int(pd.to_numeric(df[iter_cols[0]], errors='coerce').iloc[-1]) + 1
+
+    if residual is None:
+        return {**empty, 'iterations': iterations}
+
+    final = residual[-1]
+    converged = bool(np.isfinite(final) and final <= target)
+    # Divergência: resíduo não finito ou acima do valor inicial
+    diverged = bool(not np.isfinite(final) or final > residual[0])
+
+    return {'iterations': iterations, 'final_residual': float(final),
+            'converged': converged, 'diverged': diverged}
+
+
+def run_solver_sweep(mesh_files, settings, output_dir=SWEEP_DIR, processes=None, skip_existing=True):
+    """
+    Roda todas as combinações em todas as malhas pelo run_su2_batch
+
+    Cada caso tem ID [mesh_id]_s[hash] e saídas em output_dir; casos com
+    history já existente são reaproveitados, com o tempo gravado na
+    execução anterior (solver_sweep_cases.csv). Malhas rejeitadas na
+    verificação de qualidade entram como falhas, sem rodar o SU2.
+
+    Args:
+        processes: limite de casos simultâneos (padrão: núcleos); a
+                   admissão por memória pode rodar menos
+
+    Returns:
+        DataFrame com uma linha por (malha, combinação): valores dos eixos,
+        settings_id, tempo de parede e métricas de convergência
+    """
+    import pandas as pd
+    from run_su2_batch import CONFIG_FILE, process_single_mesh, order_by_cost
+    from mesh_quality import preflight_all, print_reports
+    from scheduler import estimate_case_memory, run_with_admission
+
+    config = load_config()
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Mesmas etapas do run_su2_batch: maior custo primeiro e verificação de qualidade
+    mesh_files, mesh_stats = order_by_cost(list(mesh_files))
+    print("\nVerificação de qualidade das malhas:")
+    accepted, quality = preflight_all(mesh_files, CONFIG_FILE)
+    print_reports(quality)
+    rejected = {m: 'Rejeitada na verificação de qualidade: ' + '; '.join(quality[m]['errors'])
+                for m in mesh_files if m not in accepted}
+    if rejected:
+        print(f"\n✗ {len(rejected)} malha(s) rejeitada(s) não serão simuladas")
+
+    cases = []
+    for overrides in settings:
+        sid = settings_id(overrides, config)
+        for mesh_file in mesh_files:
+            mesh_id = os.path.basename(mesh_file).replace('mesh_', '').replace('.su2', '')
+            cases.append((mesh_file, mesh_id, sid, overrides, f"{mesh_id}_s{sid}"))
+
+    history = lambda case_id: os.path.join(output_dir, f"history_{case_id}.csv")
+    pending = [case for case in cases if case[0] not in rejected and
+               not (skip_existing and artifact_exists(history(case[4])))]
+    args = [(mesh_file, output_dir, overrides, case_id) for mesh_file, _, _, overrides, case_id in pending]
+
+    cases_csv = os.path.join(output_dir, CASES_FILE)
+    times = {}
+    if os.path.exists(cases_csv):
+        previous = pd.read_csv(cases_csv)
+        times = {cid: (t, ok) for cid, t, ok in
+                 zip(previous['case_id'], previous['wall_time'], previous['run_ok'])}
+
+    if args:
+        # Memória por caso: picos medidos da mesma malha (qualquer combinação) ou modelo por nós
+        n_points = [mesh_stats.get(case[0], {}).get('n_points', 0) for case in pending]
+        directories = [output_dir] + sorted({os.path.dirname(case[0]) or '.' for case in pending})
+        memory_mb, _ = estimate_case_memory([case[1] for case in pending], n_points, directories)
+        results = run_with_admission(process_single_mesh, args, memory_mb, max_workers=processes)
+        times.update({r['case_id']: (r['time'], r['success']) for r in results})
+
+    rows = []
+    for mesh_file, mesh_id, sid, overrides, case_id in cases:
+        elapsed, success = times.get(case_id, (np.nan, True))
+        if mesh_file in rejected:
+            elapsed, success = 0.0, False
+        row = {'mesh_id': mesh_id, 'settings_id': sid, 'case_id': case_id}
+        row.update({key: str(value) for key, value in overrides.items()})
+        row['wall_time'] = elapsed
+        row['run_ok'] = success
+        row['message'] = rejected.get(mesh_file, '')
+        row.update(history_metrics(history(case_id)))
+        rows.append(row)
+
+    df = pd.DataFrame(rows)
+
+    # Métricas de desempenho da última execução de cada caso (solver_profiler)
+    log = load_performance_log(output_dir)
+    if not log.empty:
+        latest = log.sort_values('timestamp').groupby('case_id').last()
+        for column in PROFILE_COLUMNS:
+            if column in latest:
+                df[column] = df['case_id'].map(latest[column])
+        if 'iterations' in latest:
+            # Sem history: usa as iterações lidas da saída de tela
+            df['iterations'] = df['iterations'].fillna(df['case_id'].map(latest['iterations']))
+
+    # Acumula com os casos de execuções anteriores (outras combinações)
+    if os.path.exists(cases_csv):
+        previous = pd.read_csv(cases_csv)
+        previous = previous[~previous['case_id'].isin(df['case_id'])]
+        pd.concat([previous, df], ignore_index=True).to_csv(cases_csv, index=False)
+    else:
+        df.to_csv(cases_csv, index=False)
+
+    return df
+
+
+def rank_settings(df, axes):
+    """
+    Ordena as combinações: todas as malhas convergidas primeiro, depois menor
+    tempo médio e menos iterações
+
+    Returns:
+        DataFrame com uma linha por combinação
+    """
+    keys = list(axes)
+    ranked = df.groupby('settings_id').agg(
+        **{key: (key, 'first') for key in keys},
+        n_cases=('case_id', 'count'),
+        n_converged=('converged', 'sum'),
+        n_diverged=('diverged', 'sum'),
+        mean_iterations=('iterations', 'mean'),
+        mean_wall_time=('wall_time', 'mean'),
+        total_wall_time=('wall_time', 'sum'),
+    ).reset_index()
+
+    if 'time_per_iter_per_cell' in df:
+        profile = df.groupby('settings_id').agg(
+            mean_time_per_iter_per_cell=('time_per_iter_per_cell', 'mean'),
+            max_peak_memory_mb=('peak_memory_mb', 'max'),
+        )
+        ranked = ranked.merge(profile, left_on='settings_id', right_index=True, how='left')
+
+    ranked['all_converged'] = ranked['n_converged'] == ranked['n_cases']
+    ranked = ranked.sort_values(['all_converged', 'n_converged', 'mean_wall_time', 'mean_iterations'],
+                                ascending=[False, False, True, True], na_position='last')
+    ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+    return ranked.reset_index(drop=True)
+
+
+def _read_axes():
+    """Lê eixos do usuário: 'CHAVE=v1;v2;v3' por linha (tuplas como '(a, b)')"""
+    from su2_config import parse_value
+
+    print("\nDigite um eixo por linha no formato CHAVE=v1;v2;... (linha vazia para encerrar)")
+    print("  ex.: CFL_NUMBER=5;10;20   CFL_ADAPT_PARAM=(0.1, 1.25, 1.0, 200);(0.5, 1.5, 1.0, 1000)")
+    axes = {}
+    while True:
+        line = input("Eixo: ").strip()
+        if not line:
+            break
+        if '=' not in line:
+            print("  ✗ Formato inválido")
+            continue
+        key, values = line.split('=', 1)
+        axes[key.strip().upper()] = [parse_value(v) for v in values.split(';') if v.strip()]
+    return axes
+
+
+def main():
+    """Função principal - varredura de parâmetros do solver"""
+    import time
+    from run_su2_batch import SU2_PATH, find_su2, get_mesh_files
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "VARREDURA DE PARÂMETROS DO SOLVER")
+    print("=" * 70 + "\n")
+
+    if find_su2() is None:
+        print(f"✗ SU2 não encontrado (nem em: {SU2_PATH})")
+        return
+
+    directory = input("Diretório das malhas [padrão: .]: ").strip() or '.'
+    mesh_files = get_mesh_files(directory)
+    if not mesh_files:
+        print(f"✗ Nenhuma malha 'mesh_d*.su2' em {directory}")
+        return
+    print(f"✓ Malhas: {len(mesh_files)}")
+
+    print("\nEixos padrão:")
+    for key, values in SOLVER_AXES.items():
+        print(f"  {key}: {values}")
+    axes = SOLVER_AXES if input("Usar eixos padrão? (s/n): ").strip().lower() == 's' else _read_axes()
+    if not axes:
+        print("Nenhum eixo definido!")
+        return
+
+    total = int(np.prod([len(v) for v in axes.values()]))
+    print(f"\nProduto cartesiano: {total} combinações × {len(mesh_files)} malhas")
+    n_str = input("Número de combinações sorteadas [padrão: todas]: ").strip()
+    if n_str and int(n_str) < total:
+        settings = expand_spec(axes, 'sampled', n_samples=int(n_str))
+    else:
+        settings = expand_spec(axes)
+
+    n_str = input("Máximo de casos simultâneos [padrão: núcleos, limitado pela memória]: ").strip()
+    processes = int(n_str) if n_str else None
+    response = input(f"\nRodar {len(settings) * len(mesh_files)} casos? (s/n): ").strip().lower()
+    if response != 's':
+        print("Operação cancelada.")
+        return
+
+    start = time.time()
+    df = run_solver_sweep(mesh_files, settings, processes=processes)
+    ranked = rank_settings(df, axes)
+    total_time = time.time() - start
+
+    ranked.to_csv(os.path.join(SWEEP_DIR, 'solver_sweep_ranking.csv'), index=False)
+
+    print(f"\n{'='*70}")
+    print("RANKING DAS COMBINAÇÕES (mais rápidas primeiro)")
+    print(f"{'='*70}")
+    print(ranked.head(15).to_string(index=False))
+    print(f"\n✓ Resultados em {SWEEP_DIR}/solver_sweep_cases.csv e solver_sweep_ranking.csv")
+    print(f"Tempo total: {total_time:.1f}s ({total_time/60:.1f} minutos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+Recuperação da topologia estruturada (i, j) das malhas transfinitas
+Autor: Script automatizado
+Data: 2025
+
+As malhas geradas por generate_meshes.create_geo_file são quadriláteros
+transfinitos: as curvas inferior e superior têm a mesma distribuição de
+pontos, então cada linha i tem x constante. Este módulo reordena a tabela
+de pontos do read_vtu em matrizes 2D [i, j] (i ao longo de x, j ao longo
+de y) para que as análises usem indexação direta em vez de busca do ponto
+mais próximo.
+
+Duas formas de recuperação:
+- recover_ij_from_coordinates: agrupa linhas de x constante (rápido, só
+  para a família de malhas de um bloco do create_geo_file)
+- recover_blocks: usa a conectividade das células e funciona para malhas
+  com vários blocos transfinitos (uma matriz [i, j] por bloco)
+"""
+
+import numpy as np
+
+
+def _cluster_coordinates(values, tol):
+    """
+    Agrupa coordenadas próximas (|dx| <= tol) e retorna o id do grupo de cada valor
+
+    Returns:
+        labels: array com o índice do grupo de cada valor (grupos em ordem crescente)
+        n_groups: número de grupos
+    """
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    new_group = np.diff(sorted_values) > tol
+    group_sorted = np.concatenate(([0], np.cumsum(new_group)))
+
+    labels = np.empty(len(values), dtype=np.int64)
+    labels[order] = group_sorted
+    return labels, int(group_sorted[-1]) + 1 if len(values) else 0
+
+
+def recover_ij_from_coordinates(x, y, tol=1e-7):
+    """
+    Recupera a ordem (i, j) agrupando os pontos em linhas de x constante
+
+    Args:
+        x, y: coordenadas dos pontos (ordem arbitrária, como no read_vtu)
+        tol: tolerância para considerar dois x iguais (os VTU são Float32)
+
+    Returns:
+        index: matriz [i, j] com o índice de cada ponto na tabela original
+
+    Raises:
+        ValueError: se as linhas de x constante não tiverem o mesmo número de pontos
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    i_label, n_i = _cluster_coordinates(x, tol)
+    counts = np.bincount(i_label, minlength=n_i)
+
+    if n_i == 0 or np.any(counts != counts[0]):
+        raise ValueError("Malha não estruturada: linhas de x constante com "
+                         "números diferentes de pontos")
+
+    # Ordena por linha i e, dentro de cada linha, por y
+    order = np.lexsort((y, i_label))
+    return order.reshape(n_i, counts[0])
+
+
+def structured_from_dataframe(df, columns=None, index=None):
+    """
+    Converte um DataFrame do read_vtu em arrays estruturados [i, j]
+
+    Args:
+        df: DataFrame com colunas X, Y e variáveis
+        columns: colunas de variáveis a incluir (padrão: todas exceto X, Y, Z)
+        index: matriz [i, j] já calculada (evita recalcular a topologia)
+
+    Returns:
+        dict com 'X', 'Y' (matrizes [i, j]), 'fields' (matriz [i, j, campo]),
+        'columns' (nomes dos campos) e 'index'
+    """
+    if columns is None:
+        columns = [c for c in df.columns if c not in ('X', 'Y', 'Z')]
+    columns = list(columns)
+
+    if index is None:
+        index = recover_ij_from_coordinates(df['X'].values, df['Y'].values)
+
+    values = df[columns].to_numpy(dtype=float)
+
+    return {
+        'X': df['X'].to_numpy(dtype=float)[index],
+        'Y': df['Y'].to_numpy(dtype=float)[index],
+        'fields': values[index],
+        'columns': columns,
+        'index': index,
+    }
+
+
+# ============================================================================
+# RECUPERAÇÃO PELA CONECTIVIDADE (BLOCOS TRANSFINITOS)
+# ============================================================================
+
+VTK_QUAD = 9
+
+
+def quad_cells(connectivity, offsets, types=None):
+    """
+    Extrai as células quadriláteras como matriz [célula, 4]
+
+    Returns:
+        cells: matriz [célula, 4] com os nós de cada quadrilátero
+        cell_ids: índice de cada quadrilátero na lista original de células
+    """
+    connectivity = np.asarray(connectivity, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+
+    sizes = np.diff(offsets)
+    is_quad = sizes == 4
+    if types is not None:
+        is_quad &= np.asarray(types) == VTK_QUAD
+
+    cell_ids = np.nonzero(is_quad)[0]
+    starts = offsets[cell_ids]
+    cells = connectivity[starts[:, None] + np.arange(4)]
+    return cells, cell_ids
+
+
+class _EdgeLookup:
+    """Tabela ordenada aresta -> (célula, aresta local) para buscas vetorizadas"""
+
+    def __init__(self, cells, n_nodes):
+        self.cells = cells
+        self.n_nodes = n_nodes
+
+        a = cells.ravel()
+        b = np.roll(cells, -1, axis=1).ravel()
+        keys = np.minimum(a, b) * n_nodes + np.maximum(a, b)
+
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.cell = order // 4
+        self.local = order % 4
+
+    def step(self, row, prev_cells, available):
+        """
+        Atravessa as arestas (row[k], row[k+1]) para o lado oposto a prev_cells
+
+        Args:
+            row: nós da linha atual (n + 1)
+            prev_cells: célula de cada aresta do lado já percorrido (n)
+            available: máscara booleana das células que podem ser usadas
+
+        Returns:
+            (next_cells, up_row) ou None se alguma aresta não tiver vizinho
+            válido (fronteira do bloco)
+        """
+        a = row[:-1]
+        b = row[1:]
+        keys = np.minimum(a, b) * self.n_nodes + np.maximum(a, b)
+
+        pos = np.searchsorted(self.keys, keys)
+        n_keys = len(self.keys)
+        found = (pos < n_keys) & (self.keys[np.minimum(pos, n_keys - 1)] == keys)
+        if not np.all(found):
+            return None
+
+        # Cada aresta interna pertence a duas células: escolhe a que não é prev
+        first = self.cell[pos]
+        second_pos = np.minimum(pos + 1, n_keys - 1)
+        has_second = (pos + 1 < n_keys) & (self.keys[second_pos] == keys)
+        use_second = first == prev_cells
+        if np.any(use_second & ~has_second):
+            return None
+
+        slot = np.where(use_second, second_pos, pos)
+        next_cells = self.cell[slot]
+        if not np.all(available[next_cells]):
+            return None
+
+        local = self.local[slot]
+        nodes = self.cells[next_cells]
+        rows = np.arange(len(next_cells))
+        n_k = nodes[rows, local]
+        n_k2 = nodes[rows, (local + 2) % 4]
+        n_k3 = nodes[rows, (local + 3) % 4]
+
+        # Nó oposto a 'a' é o vizinho de 'a' fora da aresta compartilhada
+        forward = n_k == a
+        up_a = np.where(forward, n_k3, n_k2)
+        up_b = np.where(forward, n_k2, n_k3)
+
+        # Malha conforme: o nó "de cima" de b deve coincidir na aresta seguinte
+        if len(row) > 2 and np.any(up_b[:-1] != up_a[1:]):
+            return None
+
+        up_row = np.append(up_a, up_b[-1])
+        return next_cells, up_row
+
+
+def _march_single(lookup, a, b, cell, available):
+    """Avança célula a célula atravessando (a, b) até a fronteira do bloco"""
+    while True:
+        stepped = lookup.step(np.array([a, b]), np.array([cell]), available)
+        if stepped is None:
+            return a, b, cell
+        next_cells, up_row = stepped
+        cell = next_cells[0]
+        a, b = up_row
+
+
+def _block_orientation(nodes, points):
+    """
+    Determina a transformação que faz i crescer com x e j crescer com y
+
+    Returns:
+        (transpose, flip_i, flip_j) a aplicar com _apply_orientation
+    """
+    P = points[nodes][..., :2]
+    d_i = np.mean(P[1:] - P[:-1], axis=(0, 1))
+    d_j = np.mean(P[:, 1:] - P[:, :-1], axis=(0, 1))
+
+    transpose = abs(d_i[0]) < abs(d_i[1])
+    if transpose:
+        d_i, d_j = d_j, d_i
+    return transpose, d_i[0] < 0, d_j[1] < 0
+
+
+def _apply_orientation(array, orientation):
+    """Aplica (transpose, flip_i, flip_j) a uma matriz [i, j]"""
+    transpose, flip_i, flip_j = orientation
+    if transpose:
+        array = array.T
+    if flip_i:
+        array = array[::-1, :]
+    if flip_j:
+        array = array[:, ::-1]
+    return np.ascontiguousarray(array)
+
+
+def recover_blocks(points, connectivity, offsets, types=None):
+    """
+    Reordena os nós em matrizes (i, j), uma por bloco transfinito
+
+    A partir de uma célula ainda não atribuída, anda até o canto do bloco e
+    então avança linha a linha; cada avanço é uma busca vetorizada de todas
+    as arestas da linha na tabela de arestas. O bloco termina quando alguma
+    aresta da linha chega à fronteira ou a uma célula de outro bloco.
+
+    Args:
+        points: matriz [nó, 2 ou 3] com as coordenadas
+        connectivity, offsets, types: conectividade (ver read_vtu.read_vtu_cells)
+
+    Returns:
+        lista de dicts com 'nodes' (matriz [i, j] de índices de nós) e
+        'cells' (matriz [i, j] de índices de células, na numeração original)
+    """
+    points = np.asarray(points, dtype=float)
+    cells, cell_ids = quad_cells(connectivity, offsets, types)
+    lookup = _EdgeLookup(cells, len(points))
+    available = np.ones(len(cells), dtype=bool)
+
+    blocks = []
+    while np.any(available):
+        seed = int(np.argmax(available))
+        n0, n1, n2, n3 = cells[seed]
+
+        # Desce até a fronteira atravessando (n0, n1) e depois vai à esquerda
+        a, b, cell = _march_single(lookup, n0, n1, seed, available)
+        row = cells[cell]
+        k = int(np.nonzero(row == a)[0][0])
+        a_up = row[(k + 3) % 4] if row[(k + 1) % 4] == b else row[(k + 1) % 4]
+        corner_a, corner_a_up, corner = _march_single(lookup, a, a_up, cell, available)
+
+        # Linha inferior: atravessa as arestas verticais a partir do canto
+        row = cells[corner]
+        k = int(np.nonzero(row == corner_a)[0][0])
+        bottom_b = row[(k + 1) % 4] if row[(k + 3) % 4] == corner_a_up else row[(k + 3) % 4]
+
+        bottom_nodes = [corner_a]
+        upper_nodes = [corner_a_up]
+        bottom_cells = [corner]
+        a, cell = bottom_b, corner
+        a_up = row[(k + 2) % 4]
+        while True:
+            bottom_nodes.append(a)
+            upper_nodes.append(a_up)
+            stepped = lookup.step(np.array([a, a_up]), np.array([cell]), available)
+            if stepped is None:
+                break
+            next_cells, (a, a_up) = stepped
+            cell = next_cells[0]
+            bottom_cells.append(cell)
+
+        node_rows = [np.array(bottom_nodes), np.array(upper_nodes)]
+        cell_rows = [np.array(bottom_cells)]
+        available[cell_rows[0]] = False
+
+        # Avança linha a linha (vetorizado ao longo de cada linha)
+        while True:
+            stepped = lookup.step(node_rows[-1], cell_rows[-1], available)
+            if stepped is None:
+                break
+            next_cells, up_row = stepped
+            available[next_cells] = False
+            cell_rows.append(next_cells)
+            node_rows.append(up_row)
+
+        nodes = np.array(node_rows).T
+        block_cells = cell_ids[np.array(cell_rows).T]
+
+        orientation = _block_orientation(nodes, points)
+        blocks.append({
+            'nodes': _apply_orientation(nodes, orientation),
+            'cells': _apply_orientation(block_cells, orientation),
+        })
+
+    return blocks
+
+
+def structured_blocks_from_vtu(filename, columns=None):
+    """
+    Lê um arquivo VTU e retorna os blocos estruturados com os campos em [i, j]
+
+    Args:
+        filename: arquivo .vtu
+        columns: colunas de variáveis a incluir (padrão: todas)
+
+    Returns:
+        lista de dicts (um por bloco) no formato de structured_from_dataframe,
+        com a chave adicional 'cells'
+    """
+    from read_vtu import read_vtu, read_vtu_cells
+
+    df = read_vtu(filename)
+    connectivity, offsets, types = read_vtu_cells(filename)
+    points = df[['X', 'Y']].to_numpy(dtype=float)
+
+    grids = []
+    for block in recover_blocks(points, connectivity, offsets, types):
+        grid = structured_from_dataframe(df, columns=columns, index=block['nodes'])
+        grid['cells'] = block['cells']
+        grids.append(grid)
+
+    return grids
+
+
+# ============================================================================
+# OPERAÇÕES COM ESTÊNCIL SOBRE OS BLOCOS
+# ============================================================================
+
+def wall_gradient(grid, column, j_wall=0):
+    """
+    Derivada normal d(campo)/dy na linha j = j_wall, para todos os i de uma vez
+
+    Diferença unilateral de 2a ordem em malha não uniforme (pontos j, j+1, j+2,
+    ou j, j-1, j-2 se j_wall for a última linha).
+
+    Args:
+        grid: bloco estruturado (structured_from_dataframe/structured_blocks_from_vtu)
+        column: nome do campo
+        j_wall: índice j da parede (0 ou -1)
+
+    Returns:
+        array [i] com a derivada
+    """
+    k = grid['columns'].index(column)
+    F = grid['fields'][..., k]
+    Y = grid['Y']
+
+    step = 1 if j_wall == 0 else -1
+    j0 = j_wall if j_wall >= 0 else Y.shape[1] + j_wall
+    j1, j2 = j0 + step, j0 + 2 * step
+
+    h1 = Y[:, j1] - Y[:, j0]
+    h2 = Y[:, j2] - Y[:, j0]
+    f0, f1, f2 = F[:, j0], F[:, j1], F[:, j2]
+
+    return (-(h1 + h2) / (h1 * h2) * f0
+            + h2 / (h1 * (h2 - h1)) * f1
+            - h1 / (h2 * (h2 - h1)) * f2)
+
+
+def find_i_line(grid, x):
+    """Índice da linha i mais próxima de cada x (busca binária, sem varredura)"""
+    x_lines = grid['X'][:, 0]
+    x = np.asarray(x, dtype=float)
+    right = np.clip(np.searchsorted(x_lines, x), 1, len(x_lines) - 1)
+    left = right - 1
+    return np.where(np.abs(x - x_lines[left]) <= np.abs(x_lines[right] - x), left, right)
+
+
+def same_grid(grid_a, grid_b, atol=1e-9):
+    """Verifica se dois blocos têm exatamente os mesmos nós (mesma malha)"""
+    return (grid_a['X'].shape == grid_b['X'].shape
+            and np.allclose(grid_a['X'], grid_b['X'], atol=atol)
+            and np.allclose(grid_a['Y'], grid_b['Y'], atol=atol))
+
+
+def difference_identical_grids(grid_a, grid_b, atol=1e-9):
+    """
+    Diferença campo a campo (b - a) entre dois casos com malhas idênticas
+
+    Raises:
+        ValueError: se as malhas não forem idênticas ou os campos diferirem
+    """
+    if not same_grid(grid_a, grid_b, atol):
+        raise ValueError("As malhas dos dois casos não são idênticas")
+    if grid_a['columns'] != grid_b['columns']:
+        raise ValueError("Os dois casos não têm os mesmos campos")
+    return grid_b['fields'] - grid_a['fields']
@@ -0,0 +1,285 @@
+"""
+Modelo estruturado do arquivo de configuração do SU2 (lam_flatplate.cfg)
+Autor: Script automatizado
+Data: 2025
+
+O arquivo é lido e analisado uma única vez (cache por caminho, tamanho e
+data de modificação). Cada linha "CHAVE= valor" vira uma entrada com o
+valor já convertido (números, YES/NO, listas "( a, b )" como tuplas); os
+comentários e a formatação original são preservados. Uma chave repetida
+é erro (ValueError), como no próprio SU2.
+
+A renderização com alterações por caso (malha, arquivos de saída, CFL...)
+só reescreve as linhas alteradas: o texto entre chaves é pré-montado em
+blocos, então gerar o .cfg de um caso leva microssegundos e nunca altera o
+arquivo original (seguro para execuções paralelas).
+
+canonical_hash() identifica a configuração efetiva (independente de
+comentários, espaços e ordem das chaves) para uso como chave de cache.
+"""
+
+import os
+import re
+import hashlib
+
+CONFIG_FILE = "lam_flatplate.cfg"
+
+# Chaves de arquivos de saída: mudam por caso, mas não alteram a solução
+OUTPUT_KEYS = (
+    'CONV_FILENAME', 'RESTART_FILENAME', 'VOLUME_FILENAME', 'SURFACE_FILENAME',
+    'RESTART_ADJ_FILENAME', 'VOLUME_ADJ_FILENAME', 'SURFACE_ADJ_FILENAME',
+    'GRAD_OBJFUNC_FILENAME', 'MESH_OUT_FILENAME',
+)
+
+_LINE = re.compile(r'^([ \t]*)([A-Za-z_][A-Za-z0-9_]*)([ \t]*=[ \t]*)(.*?)([ \t]*)$')
+_CACHE = {}
+
+
+# ============================================================================
+# CONVERSÃO DE VALORES
+# ============================================================================
+
+def _parse_scalar(text):
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_value(text):
+    """
+    Converte o texto de um valor do .cfg
+
+    "( plate, 0.0 )" -> ('plate', 0.0); "10.0" -> 10.0; "20" -> 20;
+    "YES" -> 'YES' (YES/NO ficam como texto, como no SU2)
+    """
+    text = text.strip()
+    if text.startswith('(') and text.endswith(')'):
+        items = [item for item in re.split(r'[,\s]+', text[1:-1]) if item]
+        return tuple(_parse_scalar(item) for item in items)
+    return _parse_scalar(text)
+
+
+def format_value(value):
+    """Texto de um valor no formato do .cfg (tuplas como "( a, b )", bool como YES/NO)"""
+    if isinstance(value, bool):
+        return 'YES' if value else 'NO'
+    if isinstance(value, (tuple, list)):
+        return '( ' + ', '.join(format_value(v) for v in value) + ' )'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+class SU2Config:
+    """
+    Configuração do SU2 analisada, com renderização rápida por caso
+
+    Uso:
+        config = load_config('lam_flatplate.cfg')
+        config['CFL_NUMBER']                      # 10.0
+        text = config.render({'CFL_NUMBER': 20})  # .cfg do caso
+        config.write('caso.cfg', {'MESH_FILENAME': 'mesh_d016_H03.su2'})
+    """
+
+    __slots__ = ('filename', '_chunks', '_keys', '_raw', '_values')
+
+    def __init__(self, text, filename=None):
+        self.filename = filename
+        self._keys = []      # chaves na ordem do arquivo
+        self._raw = {}       # chave -> (prefixo "CHAVE= ", texto original do valor, sufixo)
+        self._values = {}    # chave -> valor convertido
+        chunks = []          # texto fixo entre as linhas com chave
+        static = []
+
+        first_line = {}      # chave -> número da linha (mensagens de erro)
+
+        for number, line in enumerate(text.splitlines(keepends=True), 1):
+            body = line.rstrip('\r\n')
+            match = None if body.lstrip().startswith('%') else _LINE.match(body)
+            if match is None:
+                static.append(line)
+                continue
+
+            indent, key, equals, value, trailing = match.groups()
+            if key in first_line:
+                # O SU2 recusa um .cfg com a mesma opção repetida
+                where = f"{filename}: " if filename else ""
+                raise ValueError(f"{where}chave {key} repetida (linhas {first_line[key]} e {number})")
+            first_line[key] = number
+
+            chunks.append(''.join(static))
+            static = []
+            newline = line[len(body):]
+            self._keys.append(key)
+            self._raw[key] = (indent + key + equals, value, trailing + newline)
+            self._values[key] = parse_value(value)
+
+        chunks.append(''.join(static))
+        self._chunks = chunks
+
+    # ------------------------------------------------------------------
+    # Acesso
+    # ------------------------------------------------------------------
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def keys(self):
+        return list(self._keys)
+
+    def raw(self, key):
+        """Texto original do valor de uma chave"""
+        return self._raw[key][1]
+
+    # ------------------------------------------------------------------
+    # Renderização
+    # ------------------------------------------------------------------
+
+    def render(self, overrides=None):
+        """
+        Texto do .cfg com as alterações aplicadas
+
+        Args:
+            overrides: dict chave -> valor (convertido por format_value);
+                       chaves que não existem no arquivo são acrescentadas
+                       ao final
+
+        Returns:
+            texto completo do arquivo de configuração
+        """
+        overrides = overrides or {}
+        parts = [self._chunks[0]]
+        for key, chunk in zip(self._keys, self._chunks[1:]):
+            prefix, value, suffix = self._raw[key]
+            if key in overrides:
+                value = format_value(overrides[key])
+            parts.append(prefix)
+            parts.append(value)
+            parts.append(suffix)
+            parts.append(chunk)
+
+        extra = [key for key in overrides if key not in self._raw]
+        if extra:
+            if parts[-1] and not parts[-1].endswith('\n'):
+                parts.append('\n')
+            parts.extend(f"{key}= {format_value(overrides[key])}\n" for key in extra)
+
+        return ''.join(parts)
+
+    def write(self, filename, overrides=None):
+        """Grava o .cfg de um caso (nunca altera o arquivo original)"""
+        with open(filename, 'w') as f:
+            f.write(self.render(overrides))
+        return filename
+
+    def with_overrides(self, overrides):
+        """Nova configuração com as alterações incorporadas (o original não muda)"""
+        return SU2Config(self.render(overrides), self.filename)
+
+    def effective(self, overrides=None):
+        """Valores efetivos (dict chave -> valor) com as alterações aplicadas"""
+        values = dict(self._values)
+        if overrides:
+            values.update({key: parse_value(format_value(value)) for key, value in overrides.items()})
+        return values
+
+    def canonical_hash(self, overrides=None, exclude=()):
+        """
+        Hash da configuração efetiva (sha1)
+
+        Independe de comentários, espaços e da ordem das chaves; valores
+        equivalentes ("10", "10.0", "1E1") têm o mesmo hash.
+
+        Args:
+            overrides: alterações a considerar
+            exclude: chaves ignoradas (ex.: OUTPUT_KEYS)
+        """
+        values = self.effective(overrides)
+        h = hashlib.sha1()
+        for key in sorted(values):
+            if key in exclude:
+                continue
+            value = values[key]
+            if isinstance(value, tuple):
+                text = '(' + ','.join(_canonical(v) for v in value) + ')'
+            else:
+                text = _canonical(value)
+            h.update(f"{key}={text}\n".encode())
+        return h.hexdigest()
+
+
+def _canonical(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(float(value))
+    return str(value)
+
+
+def load_config(config_file=CONFIG_FILE):
+    """
+    Lê e analisa o .cfg uma única vez por processo
+
+    A entrada do cache é descartada se o tamanho ou a data de modificação
+    do arquivo mudarem.
+    """
+    path = os.path.abspath(config_file)
+    st = os.stat(path)
+    signature = (st.st_size, st.st_mtime_ns)
+
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with open(path, 'r') as f:
+        config = SU2Config(f.read(), config_file)
+    _CACHE[path] = (signature, config)
+    return config
+
+
+def case_overrides(mesh_filename, mesh_id, output_dir=''):
+    """
+    Alterações por caso: malha e arquivos de saída com o ID da malha
+
+    Mesmos nomes usados pelos scripts de análise (history_[ID].csv,
+    flow_[ID].vtu, surface_flow_[ID].vtu, restart_flow_[ID].dat).
+    """
+    return {
+        'MESH_FILENAME': mesh_filename,
+        'CONV_FILENAME': os.path.join(output_dir, f"history_{mesh_id}"),
+        'RESTART_FILENAME': os.path.join(output_dir, f"restart_flow_{mesh_id}.dat"),
+        'VOLUME_FILENAME': os.path.join(output_dir, f"flow_{mesh_id}"),
+        'SURFACE_FILENAME': os.path.join(output_dir, f"surface_flow_{mesh_id}"),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    config_file = sys.argv[1] if len(sys.argv) > 1 else CONFIG_FILE
+    config = load_config(config_file)
+    print(f"✓ {config_file}: {len(config.keys())} chaves")
+
+    overrides = case_overrides('mesh_d016_H03.su2', 'd016_H03')
+    n = 10000
+    start = time.perf_counter()
+    for _ in range(n):
+        config.render(overrides)
+    elapsed = time.perf_counter() - start
+    print(f"  Renderização com alterações: {elapsed / n * 1e6:.1f} µs por caso")
+    print(f"  Hash canônico: {config.canonical_hash(exclude=OUTPUT_KEYS)}")
@@ -0,0 +1,399 @@
+"""
+Leitor rápido de malhas no formato nativo do SU2 e índice de estatísticas
+Autor: Script automatizado
+Data: 2025
+
+Lê os arquivos mesh_*.su2 (seções NDIME, NELEM, NPOIN e NMARK) sem GMSH
+nem SU2: o arquivo é mapeado em memória, as seções são localizadas por
+expressão regular e cada bloco numérico é convertido de uma vez pelo NumPy
+(sem laço por linha).
+
+As células são devolvidas como no read_vtu_cells (connectivity, offsets,
+types com os tipos VTK, que são os mesmos do SU2), então quad_cells e
+recover_blocks do structured_grid funcionam diretamente.
+
+O índice (mesh_index.json, no diretório das malhas) guarda por malha o
+número de nós/células, o menor espaçamento na parede, a maior razão de
+aspecto e a maior razão de expansão entre células vizinhas, e é usado
+pelo run_su2_batch para prever o custo de cada caso.
+"""
+
+import os
+import re
+import mmap
+import json
+
+import numpy as np
+
+# Nós por tipo de elemento (numeração VTK, usada também pelo SU2)
+NODES_PER_ELEMENT = {
+    3: 2,   # linha
+    5: 3,   # triângulo
+    9: 4,   # quadrilátero
+    10: 4,  # tetraedro
+    12: 8,  # hexaedro
+    13: 6,  # prisma
+    14: 5,  # pirâmide
+}
+
+WALL_MARKER = "plate"
+MESH_INDEX_FILE = "mesh_index.json"
+
+_KEYWORD = re.compile(rb'^[ \t]*(NDIME|NELEM|NPOIN|NMARK|MARKER_TAG|MARKER_ELEMS)[ \t]*=[ \t]*(\S+)[^\n]*\n?',
+                      re.MULTILINE)
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+def _parse_elements(block, n_elements):
+    """
+    Converte um bloco de elementos ("tipo n1 n2 ... [índice]" por linha)
+
+    Quando todas as linhas têm o mesmo tipo (caso das malhas transfinitas do
+    create_geo_file) a conversão é uma única chamada ao NumPy; malhas mistas
+    caem na leitura por linha.
+
+    Returns:
+        connectivity, offsets (n + 1), types
+    """
+    if n_elements == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+
+    values = np.fromstring(block, dtype=np.int64, sep=' ')
+    first_type = int(values[0])
+    n_nodes = NODES_PER_ELEMENT.get(first_type)
+
+    if n_nodes is not None and len(values) % n_elements == 0:
+        width = len(values) // n_elements
+        if width in (n_nodes + 1, n_nodes + 2):
+            table = values.reshape(n_elements, width)
+            if np.all(table[:, 0] == first_type):
+                connectivity = np.ascontiguousarray(table[:, 1:1 + n_nodes]).ravel()
+                offsets = np.arange(n_elements + 1, dtype=np.int64) * n_nodes
+                types = np.full(n_elements, first_type, dtype=np.uint8)
+                return connectivity, offsets, types
+
+    # Elementos de tipos diferentes: uma linha por elemento
+    lines = [line.split() for line in block.splitlines() if line.strip()][:n_elements]
+    types = np.array([int(tokens[0]) for tokens in lines], dtype=np.uint8)
+    sizes = np.array([NODES_PER_ELEMENT[int(t)] for t in types], dtype=np.int64)
+    connectivity = np.array([int(v) for tokens, k in zip(lines, sizes) for v in tokens[1:1 + k]],
+                            dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    return connectivity, offsets, types
+
+
+def read_su2_mesh(filename):
+    """
+    Lê uma malha no formato nativo do SU2
+
+    Args:
+        filename: caminho do arquivo .su2
+
+    Returns:
+        dict com:
+            'ndime': dimensão
+            'points': matriz [nó, ndime]
+            'connectivity', 'offsets', 'types': células (como read_vtu_cells)
+            'markers': dict nome -> (connectivity, offsets, types) dos
+                       elementos de contorno
+    """
+    with open(filename, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            matches = list(_KEYWORD.finditer(mm))
+            if not matches:
+                raise ValueError(f"Arquivo não está no formato SU2: {filename}")
+
+            mesh = {'ndime': None, 'points': None, 'markers': {}}
+            marker_tag = None
+
+            for k, match in enumerate(matches):
+                key = match.group(1).decode()
+                value = match.group(2).decode()
+                start = match.end()
+                end = matches[k + 1].start() if k + 1 < len(matches) else len(mm)
+
+                if key == 'NDIME':
+                    mesh['ndime'] = int(value)
+                elif key == 'NELEM':
+                    (mesh['connectivity'], mesh['offsets'],
+                     mesh['types']) = _parse_elements(mm[start:end], int(value))
+                elif key == 'NPOIN':
+                    n_points = int(value)
+                    coords = np.fromstring(mm[start:end], dtype=np.float64, sep=' ')
+                    width = len(coords) // n_points
+                    mesh['points'] = coords[:n_points * width].reshape(n_points, width)
+                elif key == 'MARKER_TAG':
+                    marker_tag = value
+                elif key == 'MARKER_ELEMS':
+                    mesh['markers'][marker_tag] = _parse_elements(mm[start:end], int(value))
+
+    ndime = mesh['ndime'] or 2
+    mesh['ndime'] = ndime
+    mesh['points'] = np.ascontiguousarray(mesh['points'][:, :ndime])
+    return mesh
+
+
+def marker_nodes(mesh, tag):
+    """Índices (únicos, ordenados) dos nós de um marcador de contorno"""
+    connectivity, _, _ = mesh['markers'][tag]
+    return np.unique(connectivity)
+
+
+# ============================================================================
+# GEOMETRIA DAS CÉLULAS
+# ============================================================================
+
+def cell_groups(mesh):
+    """
+    Agrupa as células por número de nós
+
+    Returns:
+        lista de (cell_ids, nodes[célula, k]) - um item por número de nós k
+    """
+    offsets = mesh['offsets']
+    sizes = np.diff(offsets)
+    groups = []
+    for k in np.unique(sizes):
+        cell_ids = np.nonzero(sizes == k)[0]
+        nodes = mesh['connectivity'][offsets[cell_ids][:, None] + np.arange(k)]
+        groups.append((cell_ids, nodes))
+    return groups
+
+
+def edge_lengths(points, nodes):
+    """Comprimento das arestas [célula, k] (aresta m liga os nós m e m+1)"""
+    p = points[nodes]
+    return np.linalg.norm(np.roll(p, -1, axis=1) - p, axis=-1)
+
+
+def polygon_area(points, nodes):
+    """Área (com sinal, fórmula do laço) de cada polígono [célula]"""
+    x = points[nodes, 0]
+    y = points[nodes, 1]
+    return 0.5 * np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1)
+
+
+def cell_adjacency(mesh):
+    """
+    Pares de células que compartilham uma aresta
+
+    Returns:
+        matriz [par, 2] com os índices das duas células
+    """
+    edges = []
+    owners = []
+    for cell_ids, nodes in cell_groups(mesh):
+        a = nodes
+        b = np.roll(nodes, -1, axis=1)
+        edges.append(np.stack((np.minimum(a, b), np.maximum(a, b)), axis=-1).reshape(-1, 2))
+        owners.append(np.repeat(cell_ids, nodes.shape[1]))
+
+    edges = np.concatenate(edges)
+    owners = np.concatenate(owners)
+    order = np.lexsort((edges[:, 1], edges[:, 0]))
+    edges = edges[order]
+    owners = owners[order]
+
+    shared = np.all(edges[1:] == edges[:-1], axis=1)
+    return np.column_stack((owners[:-1][shared], owners[1:][shared]))
+
+
+def wall_spacing(mesh, wall=WALL_MARKER):
+    """
+    Altura da primeira célula em cada nó da parede
+
+    Para cada nó do marcador 'wall', é o comprimento da menor aresta que o
+    liga a um nó fora da parede.
+
+    Returns:
+        wall_nodes: índices dos nós da parede
+        spacing: espaçamento normal à parede em cada um (NaN se isolado)
+    """
+    wall_nodes = marker_nodes(mesh, wall)
+    on_wall = np.zeros(len(mesh['points']), dtype=bool)
+    on_wall[wall_nodes] = True
+
+    spacing = np.full(len(mesh['points']), np.inf)
+    for _, nodes in cell_groups(mesh):
+        a = nodes.ravel()
+        b = np.roll(nodes, -1, axis=1).ravel()
+        length = np.linalg.norm(mesh['points'][b] - mesh['points'][a], axis=1)
+        for wall_end, other in ((a, b), (b, a)):
+            crossing = on_wall[wall_end] & ~on_wall[other]
+            np.minimum.at(spacing, wall_end[crossing], length[crossing])
+
+    spacing = spacing[wall_nodes]
+    return wall_nodes, np.where(np.isfinite(spacing), spacing, np.nan)
+
+
+# ============================================================================
+# ESTATÍSTICAS E ÍNDICE
+# ============================================================================
+
+def mesh_statistics(mesh, wall=WALL_MARKER):
+    """
+    Estatísticas usadas para prever o custo de um caso
+
+    Returns:
+        dict com n_points, n_cells, n_quads, n_triangles, markers (nome ->
+        número de elementos), min_wall_spacing, max_aspect_ratio,
+        max_expansion_ratio e mean_expansion_ratio
+    """
+    aspect = []
+    size = np.zeros(len(mesh['types']))
+    for cell_ids, nodes in cell_groups(mesh):
+        lengths = edge_lengths(mesh['points'], nodes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            aspect.append(lengths.max(axis=1) / lengths.min(axis=1))
+        size[cell_ids] = np.sqrt(np.abs(polygon_area(mesh['points'], nodes)))
+
+    pairs = cell_adjacency(mesh)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expansion = np.maximum(size[pairs[:, 0]], size[pairs[:, 1]]) / \
+            np.minimum(size[pairs[:, 0]], size[pairs[:, 1]])
+    expansion = expansion[np.isfinite(expansion)]
+
+    if wall in mesh['markers']:
+        _, spacing = wall_spacing(mesh, wall)
+        min_wall = float(np.nanmin(spacing)) if np.any(np.isfinite(spacing)) else None
+    else:
+        min_wall = None
+
+    aspect = np.concatenate(aspect) if aspect else np.zeros(0)
+    aspect = aspect[np.isfinite(aspect)]
+
+    return {
+        'n_points': int(len(mesh['points'])),
+        'n_cells': int(len(mesh['types'])),
+        'n_quads': int(np.sum(mesh['types'] == 9)),
+        'n_triangles': int(np.sum(mesh['types'] == 5)),
+        'markers': {tag: int(len(elements[2])) for tag, elements in mesh['markers'].items()},
+        'min_wall_spacing': min_wall,
+        'max_aspect_ratio': float(aspect.max()) if len(aspect) else None,
+        'max_expansion_ratio': float(expansion.max()) if len(expansion) else None,
+        'mean_expansion_ratio': float(expansion.mean()) if len(expansion) else None,
+    }
+
+
+def predicted_cost(stats):
+    """
+    Custo relativo previsto de um caso
+
+    O trabalho por iteração do SU2 é proporcional ao número de nós; a
+    razão de aspecto não entra porque o número de iterações é fixo no
+    lam_flatplate.cfg.
+    """
+    return float(stats['n_points'])
+
+
+def _file_signature(filename):
+    st = os.stat(filename)
+    return {'size': st.st_size, 'mtime': st.st_mtime}
+
+
+def load_index(directory):
+    """Lê o índice de um diretório (dict vazio se não existir ou estiver corrompido)"""
+    index_file = os.path.join(directory, MESH_INDEX_FILE)
+    if not os.path.exists(index_file):
+        return {}
+    try:
+        with open(index_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(directory, index):
+    """Grava o índice de forma atômica"""
+    index_file = os.path.join(directory, MESH_INDEX_FILE)
+    tmp = index_file + f".{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, index_file)
+
+
+def index_meshes(mesh_files, wall=WALL_MARKER):
+    """
+    Estatísticas de várias malhas, usando o índice do diretório como cache
+
+    As entradas são reaproveitadas enquanto o tamanho e a data de
+    modificação do arquivo não mudarem; malhas novas ou alteradas são lidas
+    e o índice é regravado.
+
+    Returns:
+        dict caminho -> estatísticas (mesh_statistics)
+    """
+    by_directory = {}
+    for mesh_file in mesh_files:
+        by_directory.setdefault(os.path.dirname(os.path.abspath(mesh_file)), []).append(mesh_file)
+
+    result = {}
+    for directory, files in by_directory.items():
+        index = load_index(directory)
+        changed = False
+
+        for mesh_file in files:
+            name = os.path.basename(mesh_file)
+            signature = _file_signature(mesh_file)
+            entry = index.get(name)
+            if entry is None or entry.get('signature') != signature:
+                stats = mesh_statistics(read_su2_mesh(mesh_file), wall)
+                entry = {'signature': signature, 'stats': stats}
+                index[name] = entry
+                changed = True
+            result[mesh_file] = entry['stats']
+
+        if changed:
+            try:
+                save_index(directory, index)
+            except OSError:
+                pass
+
+    return result
+
+
+def print_statistics(stats_by_file):
+    """Tabela com as estatísticas de cada malha"""
+    print(f"\n{'Malha':<28} {'Nós':>8} {'Células':>8} {'Δy parede':>11} {'AR máx':>9} {'Expansão':>9}")
+    print("-" * 78)
+    for mesh_file, stats in stats_by_file.items():
+        dy = stats['min_wall_spacing']
+        ar = stats['max_aspect_ratio']
+        ex = stats['max_expansion_ratio']
+        print(f"{os.path.basename(mesh_file):<28} {stats['n_points']:>8} {stats['n_cells']:>8} "
+              f"{dy if dy is not None else float('nan'):>11.3e} "
+              f"{ar if ar is not None else float('nan'):>9.1f} "
+              f"{ex if ex is not None else float('nan'):>9.3f}")
+
+
+def main():
+    """Função principal - estatísticas das malhas mesh_*.su2 de um diretório"""
+    import sys
+    import glob
+    import time
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else '.'
+    mesh_files = sorted(glob.glob(os.path.join(directory, 'mesh_*.su2')))
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "ESTATÍSTICAS DAS MALHAS SU2")
+    print("=" * 70)
+
+    if not mesh_files:
+        print(f"\n✗ Nenhuma malha 'mesh_*.su2' encontrada em {directory}")
+        return
+
+    start = time.perf_counter()
+    stats = index_meshes(mesh_files)
+    elapsed = time.perf_counter() - start
+
+    print_statistics(stats)
+    print(f"\n✓ {len(stats)} malhas indexadas em {elapsed*1000:.0f} ms "
+          f"({os.path.join(directory, MESH_INDEX_FILE)})")
+
+
+if __name__ == "__main__":
+    main()
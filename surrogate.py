@@ -0,0 +1,382 @@
+"""
+Modelo substituto (processo gaussiano / RBF) sobre o espaço x_inlet × H_dom
+Autor: Script automatizado
+Data: 2025
+
+Ajusta um processo gaussiano com núcleo RBF anisotrópico aos casos já
+resolvidos (Cd, Cf nas estações, pressões de prova) e prevê combinações
+ainda não simuladas, com incerteza, em microssegundos. Novos casos são
+escolhidos onde mais informam o estudo de independência do domínio, para
+que a matriz completa do modo combinado (choice == '3') não precise ser
+resolvida inteira:
+
+- 'delta': casos em que |ΔCd| relativo ao maior domínio está mais perto
+  da tolerância, ponderado pela incerteza (critério "straddle"); são eles
+  que decidem qual é o menor domínio aceitável
+- 'uncertainty': casos com a maior incerteza do modelo (em qualquer saída)
+- 'ei': Expected Improvement de uma saída (otimização genérica)
+"""
+
+import numpy as np
+
+# Grades de hiperparâmetros (entradas normalizadas em [0, 1])
+LENGTH_SCALES = np.logspace(-1.3, 0.7, 12)
+NOISE_LEVELS = np.array([1e-8, 1e-6, 1e-4, 1e-2])
+
+# Diferença relativa ao maior domínio aceita como independente (mesmo
+# critério do 'threshold' de adaptive_sweep)
+DELTA_TOLERANCE = 0.01
+
+OBJECTIVES = ('delta', 'uncertainty', 'ei')
+
+
+class GaussianProcessSurrogate:
+    """
+    Processo gaussiano multi-saída com núcleo RBF anisotrópico
+
+    As entradas são normalizadas pelos limites informados (ou dos dados) e
+    cada saída é padronizada; todas as saídas compartilham os comprimentos de
+    correlação, escolhidos pela máxima verossimilhança marginal somada.
+
+    Uso:
+        model = GaussianProcessSurrogate().fit(X, Y, output_names)
+        mean, std = model.predict(X_novo)
+    """
+
+    __slots__ = ('lower', 'scale', 'y_mean', 'y_std', 'length', 'noise',
+                 'X', 'Y', 'chol', 'alpha', 'output_names')
+
+    def __init__(self, bounds=None):
+        if bounds is not None:
+            bounds = np.asarray(bounds, dtype=float)
+            self.lower = bounds[:, 0]
+            self.scale = bounds[:, 1] - bounds[:, 0]
+        else:
+            self.lower = None
+            self.scale = None
+        self.output_names = None
+
+    # ------------------------------------------------------------------
+    # Ajuste
+    # ------------------------------------------------------------------
+
+    def _normalize(self, X):
+        return (np.asarray(X, dtype=float) - self.lower) / self.scale
+
+    @staticmethod
+    def _kernel(A, B, length):
+        d = (A[:, None, :] - B[None, :, :]) / length
+        return np.exp(-0.5 * np.sum(d * d, axis=-1))
+
+    def _factorize(self, X, Y, length, noise):
+        K = self._kernel(X, X, length) + noise * np.eye(len(X))
+        chol = np.linalg.cholesky(K)
+        alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, Y))
+        return chol, alpha
+
+    def _log_marginal_likelihood(self, X, Y, length, noise):
+        try:
+            chol, alpha = self._factorize(X, Y, length, noise)
+        except np.linalg.LinAlgError:
+            return -np.inf
+        n, m = Y.shape
+        return (-0.5 * np.sum(Y * alpha)
+                - m * np.sum(np.log(np.diag(chol)))
+                - 0.5 * n * m * np.log(2 * np.pi))
+
+    def fit(self, X, Y, output_names=None):
+        """
+        Ajusta o modelo
+
+        Args:
+            X: matriz [caso, 2] com (x_inlet, H_dom)
+            Y: matriz [caso, saída]
+            output_names: nomes das saídas (opcional)
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        if Y.ndim == 1:
+            Y = Y[:, None]
+
+        if self.lower is None:
+            self.lower = X.min(axis=0)
+            self.scale = np.where(np.ptp(X, axis=0) > 0, np.ptp(X, axis=0), 1.0)
+
+        self.y_mean = Y.mean(axis=0)
+        self.y_std = np.where(Y.std(axis=0) > 0, Y.std(axis=0), 1.0)
+        Xn = self._normalize(X)
+        Yn = (Y - self.y_mean) / self.y_std
+
+        best = (-np.inf, None, None)
+        for l0 in LENGTH_SCALES:
+            for l1 in LENGTH_SCALES:
+                length = np.array([l0, l1])[:Xn.shape[1]]
+                for noise in NOISE_LEVELS:
+                    lml = self._log_marginal_likelihood(Xn, Yn, length, noise)
+                    if lml > best[0]:
+                        best = (lml, length, noise)
+
+        _, self.length, self.noise = best
+        self.X = Xn
+        self.Y = Yn
+        self.chol, self.alpha = self._factorize(Xn, Yn, self.length, self.noise)
+        self.output_names = list(output_names) if output_names is not None else None
+        return self
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def predict(self, X, return_std=True):
+        """
+        Prevê as saídas em novos pontos
+
+        Args:
+            X: matriz [ponto, 2] (ou um único ponto [2])
+
+        Returns:
+            mean: matriz [ponto, saída]
+            std: matriz [ponto, saída] (se return_std)
+        """
+        Xq = np.atleast_2d(self._normalize(X))
+        Ks = self._kernel(Xq, self.X, self.length)
+        mean = Ks @ self.alpha * self.y_std + self.y_mean
+
+        if not return_std:
+            return mean
+
+        v = np.linalg.solve(self.chol, Ks.T)
+        var = np.maximum(1.0 - np.sum(v * v, axis=0), 0.0)
+        std = np.sqrt(var)[:, None] * self.y_std
+        return mean, std
+
+    def predict_difference(self, X, reference):
+        """
+        Prevê f(X) - f(reference), com a covariância entre os dois pontos
+
+        Args:
+            X: matriz [ponto, 2]
+            reference: um ponto [2] (ex.: o maior domínio)
+
+        Returns:
+            mean, std: matrizes [ponto, saída]
+        """
+        Xq = np.atleast_2d(self._normalize(X))
+        Xr = np.atleast_2d(self._normalize(reference))
+        Ks = self._kernel(Xq, self.X, self.length)
+        Kr = self._kernel(Xr, self.X, self.length)
+        mean = (Ks - Kr) @ self.alpha * self.y_std
+
+        v = np.linalg.solve(self.chol, Ks.T)
+        vr = np.linalg.solve(self.chol, Kr.T)
+        cov = self._kernel(Xq, Xr, self.length)[:, 0] - v.T @ vr[:, 0]
+        var = (1.0 - np.sum(v * v, axis=0)) + (1.0 - np.sum(vr * vr)) - 2.0 * cov
+        std = np.sqrt(np.maximum(var, 0.0))[:, None] * self.y_std
+        return mean, std
+
+    def largest_domain(self, candidates=()):
+        """Maior domínio entre os casos de treino e os candidatos (menor x_inlet, maior H_dom)"""
+        points = self.X * self.scale + self.lower
+        if len(candidates):
+            points = np.vstack((points, np.asarray(candidates, dtype=float)))
+        return np.array([points[:, 0].min(), points[:, 1].max()])
+
+    def output_index(self, output):
+        """Índice de uma saída pelo nome (ou o próprio índice)"""
+        if isinstance(output, str):
+            return self.output_names.index(output)
+        return int(output)
+
+    def expected_improvement(self, X, output=0, minimize=True, best=None, xi=0.0):
+        """
+        Expected Improvement de uma saída nos pontos X
+
+        Args:
+            output: nome ou índice da saída usada como objetivo
+            minimize: True para minimizar o objetivo, False para maximizar
+            best: melhor valor observado (padrão: dos dados de treino)
+            xi: margem de exploração
+        """
+        from scipy.special import ndtr
+
+        k = self.output_index(output)
+        mean, std = self.predict(X)
+        mu = mean[:, k]
+        sigma = std[:, k]
+
+        observed = self.Y[:, k] * self.y_std[k] + self.y_mean[k]
+        sign = 1.0 if minimize else -1.0
+        if best is None:
+            best = observed.min() if minimize else observed.max()
+
+        improvement = sign * (best - mu) - xi
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(sigma > 0, improvement / sigma, 0.0)
+        pdf = np.exp(-0.5 * z * z) / np.sqrt(2 * np.pi)
+        ei = improvement * ndtr(z) + sigma * pdf
+        return np.where(sigma > 0, ei, np.maximum(improvement, 0.0))
+
+    def acquisition(self, candidates, output=0, objective='delta', reference=None,
+                    tol=DELTA_TOLERANCE, minimize=True, best=None, xi=0.0):
+        """
+        Valor de cada candidato para o objetivo escolhido (maior é melhor)
+
+        Args:
+            output: saída usada por 'delta' e 'ei' (ex.: 'Cd')
+            objective: 'delta', 'uncertainty' ou 'ei' (ver docstring do módulo)
+            reference: ponto do maior domínio para 'delta' (padrão: largest_domain)
+            tol: tolerância de |ΔCd| relativo para 'delta'
+            minimize, best, xi: parâmetros de 'ei'
+        """
+        if objective == 'delta':
+            k = self.output_index(output)
+            if reference is None:
+                reference = self.largest_domain(candidates)
+            mean, std = self.predict_difference(candidates, reference)
+            q_ref = self.predict(reference, return_std=False)[0, k]
+            scale = max(abs(q_ref), 1e-12)
+            # Straddle: incerteza alta e diferença prevista perto da tolerância
+            return 1.96 * std[:, k] / scale - np.abs(np.abs(mean[:, k]) / scale - tol)
+        if objective == 'uncertainty':
+            _, std = self.predict(candidates)
+            return np.max(std / self.y_std, axis=1)
+        if objective == 'ei':
+            return self.expected_improvement(candidates, output, minimize, best, xi)
+        raise ValueError(f"Objetivo desconhecido: {objective} (use {', '.join(OBJECTIVES)})")
+
+    def suggest(self, candidates, n=1, output=0, objective='delta', reference=None,
+                tol=DELTA_TOLERANCE, minimize=True, xi=0.0):
+        """
+        Escolhe n novos casos pelo objetivo informado (lote guloso)
+
+        Após cada escolha o ponto é incorporado com o valor previsto
+        ("kriging believer"), sem reajustar os hiperparâmetros, para que os
+        próximos casos do lote não se concentrem no mesmo lugar.
+
+        Args:
+            objective: 'delta' (|ΔCd| ao maior domínio), 'uncertainty' ou 'ei'
+            reference, tol: ver acquisition
+
+        Returns:
+            índices dos candidatos escolhidos, em ordem de escolha
+        """
+        candidates = np.asarray(candidates, dtype=float)
+        X0, Y0, chol0, alpha0 = self.X, self.Y, self.chol, self.alpha
+        k = self.output_index(output)
+        if objective == 'delta' and reference is None:
+            reference = self.largest_domain(candidates)
+
+        observed = Y0[:, k] * self.y_std[k] + self.y_mean[k]
+        best = observed.min() if minimize else observed.max()
+
+        chosen = []
+        try:
+            for _ in range(min(n, len(candidates))):
+                score = self.acquisition(candidates, k, objective, reference, tol, minimize, best, xi)
+                score[chosen] = -np.inf
+                idx = int(np.argmax(score))
+                chosen.append(idx)
+
+                mean = self.predict(candidates[idx], return_std=False)
+                self.X = np.vstack((self.X, self._normalize(candidates[idx])[None, :]))
+                self.Y = np.vstack((self.Y, (mean - self.y_mean) / self.y_std))
+                self.chol, self.alpha = self._factorize(self.X, self.Y, self.length, self.noise)
+        finally:
+            self.X, self.Y, self.chol, self.alpha = X0, Y0, chol0, alpha0
+
+        return chosen
+
+
+def fit_from_catalog(catalog, quantities, bounds=None):
+    """
+    Ajusta o modelo aos casos do catálogo de domain_convergence
+
+    Cada componente de cada grandeza vira uma saída (ex.: 'Cd', 'Cf[0]', ...);
+    componentes com NaN em algum caso são descartadas.
+
+    Returns:
+        model: GaussianProcessSurrogate ajustado
+    """
+    X = np.array([[case['x_inlet'], case['H_dom']] for case in catalog])
+    columns = []
+    names = []
+    for name, values in quantities.items():
+        for k in range(values.shape[1]):
+            if np.all(np.isfinite(values[:, k])):
+                columns.append(values[:, k])
+                names.append(name if values.shape[1] == 1 else f'{name}[{k}]')
+
+    if not columns:
+        raise ValueError("Nenhuma grandeza disponível em todos os casos")
+
+    return GaussianProcessSurrogate(bounds).fit(X, np.column_stack(columns), names)
+
+
+def main():
+    """Função principal - ajusta o modelo e sugere os próximos casos"""
+    import time
+    from domain_convergence import build_catalog, extract_quantities
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "MODELO SUBSTITUTO - x_inlet × H_dom")
+    print("=" * 70 + "\n")
+
+    catalog = build_catalog('.')
+    if len(catalog) < 3:
+        print("✗ São necessários pelo menos 3 casos resolvidos (history_d*.csv)!")
+        return
+
+    print(f"✓ Casos resolvidos: {len(catalog)}")
+    model = fit_from_catalog(catalog, extract_quantities(catalog))
+    print(f"✓ Saídas do modelo: {', '.join(model.output_names)}")
+    print(f"  Comprimentos de correlação: {model.length}, ruído: {model.noise:g}")
+
+    # Matriz do modo combinado (generate_meshes, choice == '3')
+    from generate_meshes import X_INLET_MATRIX, H_DOM_MATRIX
+    grid = np.array([[x, h] for x in X_INLET_MATRIX for h in H_DOM_MATRIX])
+
+    solved = {(round(c['x_inlet'], 4), round(c['H_dom'], 4)) for c in catalog}
+    untried = np.array([p for p in grid if (round(p[0], 4), round(p[1], 4)) not in solved])
+    if len(untried) == 0:
+        print("\n✓ Todos os casos da matriz já foram resolvidos")
+        return
+
+    start = time.perf_counter()
+    mean, std = model.predict(untried)
+    elapsed = time.perf_counter() - start
+    print(f"\nPrevisão de {len(untried)} casos em {elapsed*1e6:.0f} µs")
+
+    output = 'Cd' if 'Cd' in model.output_names else model.output_names[0]
+    k = model.output_index(output)
+    reference = model.largest_domain(grid)
+    delta, _ = model.predict_difference(untried, reference)
+    q_ref = model.predict(reference, return_std=False)[0, k]
+    relative = np.abs(delta[:, k]) / max(abs(q_ref), 1e-12)
+
+    print(f"Maior domínio (referência): x_inlet={reference[0]:.4f}, H_dom={reference[1]:.4f}")
+    print(f"\n{'x_inlet':<10} {'H_dom':<10} {output + ' (previsto)':<22} {'± std':<12} {'|Δ| ao maior':<12}")
+    print("-" * 70)
+    for p, m, s, r in zip(untried, mean[:, k], std[:, k], relative):
+        print(f"{p[0]:<10.4f} {p[1]:<10.4f} {m:<22.6g} {s:<12.3g} {r:<12.2%}")
+
+    print("\nObjetivo da escolha:")
+    print(f"  [1] |Δ{output}| ao maior domínio perto da tolerância ({DELTA_TOLERANCE:.0%}) - padrão")
+    print("  [2] Maior incerteza do modelo")
+    objective = 'uncertainty' if input("Escolha [1/2]: ").strip() == '2' else 'delta'
+
+    n_str = input("\nQuantos novos casos sugerir? [padrão: 3]: ").strip()
+    n = int(n_str) if n_str else 3
+    chosen = model.suggest(untried, n=n, output=output, objective=objective, reference=reference)
+
+    label = f"|Δ{output}| ao maior domínio" if objective == 'delta' else "maior incerteza"
+    print(f"\nPróximos casos ({label}):")
+    for idx in chosen:
+        x, h = untried[idx]
+        print(f"  • d{int(abs(x)*100):03d}_H{int(h*100):02d}  (x_inlet={x:.4f}, H_dom={h:.4f})")
+
+
+if __name__ == "__main__":
+    main()
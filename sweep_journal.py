@@ -0,0 +1,278 @@
+"""
+Diário de estados dos casos de uma varredura (retomada após interrupção)
+Autor: Script automatizado
+Data: 2025
+
+Cada mudança de estado de um caso é acrescentada como uma linha JSON em
+sweep_journal.jsonl, com fsync antes de seguir adiante. O arquivo nunca é
+reescrito: se o processo for interrompido (Ctrl-C, queda de energia), no
+máximo a última linha fica incompleta e é ignorada na leitura; o próximo
+registro termina essa linha antes de acrescentar o seu.
+
+Estados, em ordem:
+    planned -> meshed -> solving -> solved -> analysed
+    (failed pode aparecer em qualquer etapa)
+
+Ao registrar 'meshed' e 'solved' o diário guarda tamanho e data de
+modificação dos arquivos produzidos. Na retomada (--resume) um caso só é
+considerado pronto se esses arquivos ainda existirem iguais e parecerem
+completos (VTU terminando em </VTKFile>, CSV terminando em quebra de
+linha, malha com a seção NMARK); caso contrário volta a ser executado.
+"""
+
+import os
+import json
+import time
+import socket
+
+JOURNAL_FILE = "sweep_journal.jsonl"
+
+STATES = ('planned', 'meshed', 'solving', 'solved', 'analysed')
+FAILED = 'failed'
+_RANK = {state: k for k, state in enumerate(STATES)}
+
+
+# ============================================================================
+# GRAVAÇÃO E LEITURA
+# ============================================================================
+
+def journal_path(directory):
+    return os.path.join(directory, JOURNAL_FILE)
+
+
+def record_state(directory, case_id, state, artifacts=None, **info):
+    """
+    Acrescenta uma transição de estado ao diário (com fsync)
+
+    Args:
+        directory: diretório da varredura (onde fica o sweep_journal.jsonl)
+        state: um de STATES ou 'failed'
+        artifacts: arquivos produzidos nesta etapa (tamanho e mtime são gravados)
+        info: campos adicionais (parâmetros do caso, mensagem de erro...)
+    """
+    if state not in _RANK and state != FAILED:
+        raise ValueError(f"Estado desconhecido: {state}")
+
+    entry = {'case_id': case_id, 'state': state, 'time': time.time(),
+             'host': socket.gethostname(), 'pid': os.getpid()}
+    if artifacts:
+        entry['artifacts'] = file_signatures(artifacts)
+    entry.update(info)
+
+    # Uma única escrita em modo append: linhas de processos paralelos não se misturam
+    line = (json.dumps(entry, sort_keys=True) + '\n').encode()
+    fd = os.open(journal_path(directory), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if not _ends_with_newline(fd):
+            # Última linha cortada por uma interrupção: termina-a para não colar
+            # este registro nela (uma linha vazia extra é ignorada na leitura)
+            line = b'\n' + line
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return entry
+
+
+def _ends_with_newline(fd):
+    """True se o arquivo aberto em fd estiver vazio ou terminar em quebra de linha"""
+    size = os.fstat(fd).st_size
+    if size == 0:
+        return True
+    if hasattr(os, 'pread'):
+        return os.pread(fd, 1, size - 1) == b'\n'
+    os.lseek(fd, size - 1, os.SEEK_SET)  # Windows (sem pread); O_APPEND escreve no fim mesmo assim
+    return os.read(fd, 1) == b'\n'
+
+
+def load_journal(directory):
+    """
+    Estado atual de cada caso a partir do diário
+
+    Returns:
+        dict case_id -> {'state', 'time', 'artifacts' (acumulados de todas as
+        etapas), 'info' (campos extras acumulados), 'history' (estados)}
+    """
+    cases = {}
+    path = journal_path(directory)
+    if not os.path.exists(path):
+        return cases
+
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # linha incompleta (interrupção durante a escrita)
+            case = cases.setdefault(entry['case_id'], {'state': None, 'time': None,
+                                                       'artifacts': {}, 'info': {},
+                                                       'history': []})
+            state = entry.pop('state')
+            case['state'] = state
+            case['time'] = entry.pop('time', None)
+            case['history'].append(state)
+            if state == 'planned' or state == 'solving':
+                # Nova execução: artefatos de etapas posteriores deixam de valer
+                keep = ('meshed',) if state == 'solving' else ()
+                case['artifacts'] = {p: s for p, s in case['artifacts'].items() if s[2] in keep}
+            for artifact, (size, mtime_ns) in entry.pop('artifacts', {}).items():
+                case['artifacts'][artifact] = (size, mtime_ns, state)
+            for key in ('case_id', 'host', 'pid'):
+                entry.pop(key, None)
+            case['info'].update(entry)
+    return cases
+
+
+# ============================================================================
+# VERIFICAÇÃO DOS ARQUIVOS
+# ============================================================================
+
+def file_signatures(paths):
+    """dict caminho -> [tamanho, mtime_ns] dos arquivos existentes"""
+    signatures = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        signatures[os.path.abspath(path)] = [st.st_size, st.st_mtime_ns]
+    return signatures
+
+
+def _tail(path, size=256):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - size))
+        return f.read()
+
+
+def looks_complete(path):
+    """Verificação barata de arquivo truncado pelo formato (fim do arquivo)"""
+    try:
+        if os.path.getsize(path) == 0:
+            return False
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.vtu':
+            return b'</VTKFile>' in _tail(path)
+        if ext == '.csv':
+            return _tail(path, 1) == b'\n'
+        if ext == '.dat':
+            from restart_reader import restart_is_complete
+            return restart_is_complete(path)
+        if ext == '.su2':
+            # Os marcadores ficam no fim da malha; NMARK antes deles
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - (1 << 20)))
+                return b'NMARK' in f.read() and _tail(path, 1) in (b'\n', b' ')
+        return True
+    except OSError:
+        return False
+
+
+def verify_artifacts(case, stages=None):
+    """
+    Problemas nos arquivos registrados para um caso
+
+    Args:
+        stages: verifica só os arquivos registrados nestes estados (ex.: ('meshed',))
+
+    Returns:
+        lista de mensagens (vazia se todos existirem iguais e completos)
+    """
+    problems = []
+    for path, (size, mtime_ns, stage) in case['artifacts'].items():
+        if stages is not None and stage not in stages:
+            continue
+        name = os.path.basename(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            # Arquivado pelo artifact_store: vale se o original era o registrado
+            from artifact_store import archived_signature
+            if archived_signature(path) != (size, mtime_ns):
+                problems.append(f"{name} não existe mais")
+            continue
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            problems.append(f"{name} foi alterado depois de registrado")
+        elif not looks_complete(path):
+            problems.append(f"{name} parece incompleto")
+    return problems
+
+
+def case_outputs(output_dir, case_id):
+    """Arquivos de resultado do SU2 de um caso (nomes do su2_config.case_overrides)"""
+    names = (f"history_{case_id}.csv", f"flow_{case_id}.vtu",
+             f"surface_flow_{case_id}.vtu", f"surface_flow_{case_id}.csv",
+             f"restart_flow_{case_id}.dat")
+    return [os.path.join(output_dir, name) for name in names]
+
+
+def resume_status(directory, case_ids, target='solved'):
+    """
+    Classifica os casos para retomada
+
+    Args:
+        case_ids: casos da varredura atual
+        target: estado que conta como concluído ('solved' ou 'analysed')
+
+    Returns:
+        dict case_id -> (estado a partir do qual retomar, mensagens); o
+        estado é 'done' para casos concluídos com arquivos íntegros, ou
+        o último estado confiável ('planned', 'meshed') para os demais
+    """
+    journal = load_journal(directory)
+    status = {}
+    for case_id in case_ids:
+        case = journal.get(case_id)
+        if case is None or case['state'] is None:
+            status[case_id] = ('planned', [])
+            continue
+
+        state = case['state']
+        problems = verify_artifacts(case)
+
+        if state in _RANK and _RANK[state] >= _RANK[target] and not problems:
+            status[case_id] = ('done', [])
+            continue
+
+        messages = list(problems)
+        if state == 'solving':
+            partial = [os.path.basename(p) for p in case_outputs(directory, case_id)
+                       if os.path.exists(p)]
+            messages.append("interrompido durante a simulação" +
+                            (f" (arquivos parciais: {', '.join(partial)})" if partial else ""))
+        elif state == FAILED:
+            messages.append(f"falhou: {case['info'].get('message', 'sem mensagem')}")
+
+        # A malha registrada continua valendo se estiver íntegra
+        has_mesh = any(stage == 'meshed' for _, _, stage in case['artifacts'].values())
+        mesh_ok = has_mesh and not verify_artifacts(case, ('meshed',))
+        status[case_id] = ('meshed' if mesh_ok else 'planned', messages)
+    return status
+
+
+def print_resume_status(status):
+    """Resumo da retomada: concluídos e casos que serão refeitos"""
+    done = [c for c, (state, _) in status.items() if state == 'done']
+    todo = [c for c, (state, _) in status.items() if state != 'done']
+    print(f"  ✓ {len(done)} caso(s) já concluído(s) com arquivos íntegros")
+    print(f"  → {len(todo)} caso(s) a executar")
+    for case_id in todo:
+        state, messages = status[case_id]
+        start = "a partir da malha existente" if state == 'meshed' else "desde o início"
+        print(f"    • {case_id}: {start}")
+        for message in messages:
+            print(f"        ⚠ {message}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else '.'
+    journal = load_journal(directory)
+    if not journal:
+        print(f"✗ Nenhum diário em {journal_path(directory)}")
+    else:
+        print(f"✓ {journal_path(directory)}: {len(journal)} caso(s)")
+        print_resume_status(resume_status(directory, sorted(journal)))
@@ -0,0 +1,140 @@
+"""
+Testes da fila em sistema de arquivos (work_queue.py)
+Autor: Script automatizado
+Data: 2025
+
+Executar com:
+    python -m pytest tests/test_work_queue.py
+"""
+
+import os
+import sys
+import time
+import signal
+import multiprocessing
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import work_queue  # noqa: E402
+from work_queue import (publish, claim, complete, reclaim_expired, worker_loop,  # noqa: E402
+                        queue_status, STATES)
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason="usa processos com fork")
+
+
+def _publish_demo(queue_dir, n_cases, seconds=0.05, max_attempts=3):
+    tasks = [(f"caso{k:02d}", seconds) for k in range(n_cases)]
+    publish(queue_dir, tasks, [t[0] for t in tasks], function="work_queue:_demo_task",
+            max_attempts=max_attempts)
+    return [t[0] for t in tasks]
+
+
+def _expire(queue_dir, lease):
+    """Envelhece os tickets em running/ além do lease"""
+    old = time.time() - 10 * lease
+    for name in os.listdir(os.path.join(queue_dir, 'running')):
+        os.utime(os.path.join(queue_dir, 'running', name), (old, old))
+
+
+def _cases_by_state(queue_dir):
+    """case_id de cada arquivo de cada estado (inclui nomes privados em running/)"""
+    found = {}
+    for state in STATES:
+        for name in os.listdir(os.path.join(queue_dir, state)):
+            if name.endswith('.tmp'):
+                continue
+            case_id = name.split('_', 1)[1].split('.json')[0]
+            found.setdefault(case_id, []).append(state)
+    return found
+
+
+def _claim_and_hang(queue_dir, claimed):
+    """Worker que reserva um caso e trava até ser morto"""
+    name = claim(queue_dir)
+    claimed.put(name)
+    while True:
+        time.sleep(1.0)
+
+
+def _quiet_worker(queue_dir, lease):
+    worker_loop(queue_dir, lease=lease, poll_interval=0.05, log=lambda message: None)
+
+
+def test_killed_worker_every_ticket_done_once(tmp_path):
+    queue_dir = str(tmp_path)
+    lease = 1.0
+    case_ids = _publish_demo(queue_dir, 24)
+    ctx = multiprocessing.get_context('fork')
+
+    claimed = ctx.Queue()
+    victim = ctx.Process(target=_claim_and_hang, args=(queue_dir, claimed))
+    victim.start()
+    hung = claimed.get(timeout=10)
+    assert hung is not None
+
+    workers = [ctx.Process(target=_quiet_worker, args=(queue_dir, lease)) for _ in range(4)]
+    for w in workers:
+        w.start()
+
+    time.sleep(0.2)
+    os.kill(victim.pid, signal.SIGKILL)
+    victim.join()
+
+    for w in workers:
+        w.join(timeout=60)
+        assert w.exitcode == 0
+
+    found = _cases_by_state(queue_dir)
+    assert sorted(found) == sorted(case_ids)
+    assert all(states == ['done'] for states in found.values()), found
+    assert queue_status(queue_dir) == {'pending': 0, 'running': 0, 'done': len(case_ids), 'failed': 0}
+
+    # O caso do worker morto foi recuperado com a tentativa contada
+    ticket = work_queue._read(os.path.join(queue_dir, 'done', hung))
+    assert ticket['attempts'] == 2
+
+
+def test_complete_after_reclaim_is_discarded(tmp_path):
+    queue_dir = str(tmp_path)
+    _publish_demo(queue_dir, 1)
+    name = claim(queue_dir)
+
+    _expire(queue_dir, 1.0)
+    assert reclaim_expired(queue_dir, 1.0) == [(name, 'pending')]
+
+    # O worker lento tenta concluir depois de perder o lease
+    assert complete(queue_dir, name, {'success': True}, True) is False
+    assert _cases_by_state(queue_dir) == {'caso00': ['pending']}
+
+
+def test_reclaim_counts_attempts_until_failed(tmp_path):
+    queue_dir = str(tmp_path)
+    _publish_demo(queue_dir, 1, max_attempts=2)
+
+    name = claim(queue_dir)
+    _expire(queue_dir, 1.0)
+    assert reclaim_expired(queue_dir, 1.0) == [(name, 'pending')]
+
+    assert claim(queue_dir) == name
+    _expire(queue_dir, 1.0)
+    assert reclaim_expired(queue_dir, 1.0) == [(name, 'failed')]
+
+    ticket = work_queue._read(os.path.join(queue_dir, 'failed', name))
+    assert ticket['attempts'] == 2
+    assert ticket['result']['success'] is False
+
+
+def test_orphaned_commit_is_reclaimed(tmp_path):
+    queue_dir = str(tmp_path)
+    _publish_demo(queue_dir, 1)
+    name = claim(queue_dir)
+
+    # Worker morto entre o rename privado e a conclusão
+    running = os.path.join(queue_dir, 'running', name)
+    os.rename(running, f"{running}.outra-maquina.123.commit")
+    _expire(queue_dir, 1.0)
+
+    assert reclaim_expired(queue_dir, 1.0) == [(name, 'pending')]
+    assert _cases_by_state(queue_dir) == {'caso00': ['pending']}
@@ -0,0 +1,276 @@
+"""
+Registro persistente dos executáveis externos (GMSH, SU2, mpirun)
+Autor: Script automatizado
+Data: 2025
+
+Os scripts não procuram mais os executáveis a cada execução: o caminho e a
+versão de cada ferramenta são descobertos uma vez e guardados em um
+arquivo JSON pequeno (~/.aed_tools.json, ou AED_TOOLS_FILE), separado por
+máquina. Nas execuções seguintes basta um os.stat: se o executável ainda
+existir com o mesmo tamanho e data de modificação, o registro vale; se foi
+removido ou atualizado, é redescoberto (e a versão lida de novo).
+
+Ordem de busca de cada ferramenta:
+    1. variável de ambiente (GMSH_PATH, SU2_PATH, MPIRUN_PATH)
+    2. caminho configurado no script (GMSH_PATH/SU2_PATH), se existir
+    3. registro em cache, se ainda válido
+    4. PATH do sistema (shutil.which, sem executar nada)
+    5. locais de instalação conhecidos (lista única, abaixo)
+    6. com deep=True: varredura de diretórios (find_executables.py)
+
+Uso:
+    python tool_registry.py                 # mostra o registro (descobre o que faltar)
+    python tool_registry.py --refresh       # redescobre tudo
+    python tool_registry.py --deep          # inclui varredura de diretórios
+    python tool_registry.py set gmsh <caminho>
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import socket
+import subprocess
+
+REGISTRY_FILE = os.environ.get('AED_TOOLS_FILE') or os.path.join(os.path.expanduser('~'),
+                                                                 '.aed_tools.json')
+VERSION_TIMEOUT = 10
+
+# Ferramenta -> nomes no PATH, variável de ambiente, argumento que imprime a
+# versão, padrões de busca da varredura e locais conhecidos (glob)
+TOOLS = {
+    'gmsh': {
+        'names': ['gmsh'],
+        'env': 'GMSH_PATH',
+        'version_args': ['--version'],
+        'search': ['gmsh'],
+        'locations': [
+            r"C:\Users\*\OneDrive\Desktop\ITA_2025\AED_26\Lab 3\gmsh-*-Windows64\gmsh.exe",
+            r"C:\Program Files\gmsh-*-Windows64\gmsh.exe",
+            r"C:\Program Files (x86)\gmsh-*-Windows64\gmsh.exe",
+            r"C:\gmsh\gmsh.exe",
+            "/usr/local/bin/gmsh",
+            "/opt/gmsh*/bin/gmsh",
+            "~/gmsh*/bin/gmsh",
+        ],
+    },
+    'su2': {
+        'names': ['SU2_CFD'],
+        'env': 'SU2_PATH',
+        'version_args': ['-h'],
+        'search': ['su2'],
+        # SU2_RUN é a variável definida pelo instalador do SU2
+        'locations': ([os.path.join(os.environ['SU2_RUN'], 'SU2_CFD*')]
+                      if os.environ.get('SU2_RUN') else []) + [
+            r"C:\Users\*\OneDrive\Documents\SU2-*\win64*\bin\SU2_CFD.exe",
+            r"C:\Users\*\Documents\SU2-*\win64*\bin\SU2_CFD.exe",
+            r"C:\Program Files\SU2*\bin\SU2_CFD.exe",
+            "/usr/local/bin/SU2_CFD",
+            "/opt/su2*/bin/SU2_CFD",
+            "~/SU2*/bin/SU2_CFD",
+        ],
+    },
+    'mpirun': {
+        'names': ['mpirun', 'mpiexec'],
+        'env': 'MPIRUN_PATH',
+        'version_args': ['--version'],
+        'search': ['mpi'],
+        'locations': [
+            r"C:\Program Files\Microsoft MPI\Bin\mpiexec.exe",
+            "/usr/bin/mpirun",
+            "/usr/local/bin/mpirun",
+            "/opt/openmpi*/bin/mpirun",
+        ],
+    },
+}
+
+_VERSION = re.compile(r'(\d+\.\d+(?:\.\d+)?)')
+
+
+# ============================================================================
+# ARQUIVO DO REGISTRO
+# ============================================================================
+
+def load_registry(path=REGISTRY_FILE):
+    """Registro completo: dict máquina -> ferramenta -> entrada (vazio se não existir)"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_registry(registry, path=REGISTRY_FILE):
+    """Grava o registro de forma atômica (arquivo temporário + rename)"""
+    tmp = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(registry, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError as e:
+        # Sem permissão de escrita: funciona, só não fica em cache
+        print(f"⚠ Não foi possível gravar {path}: {e}")
+
+
+def _signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def is_valid(entry):
+    """True se o executável registrado ainda existe igual (mesmo tamanho e mtime)"""
+    try:
+        return _signature(entry['path']) == (entry['size'], entry['mtime_ns'])
+    except (OSError, KeyError, TypeError):
+        return False
+
+
+# ============================================================================
+# DESCOBERTA
+# ============================================================================
+
+def _is_executable(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def probe_version(path, version_args):
+    """Primeira versão (x.y[.z]) impressa pelo executável, ou None"""
+    try:
+        result = subprocess.run([path] + list(version_args), capture_output=True,
+                                text=True, timeout=VERSION_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION.search(result.stdout + result.stderr)
+    return match.group(1) if match else None
+
+
+def discover(name, deep=False):
+    """Caminho absoluto de uma ferramenta (passos 4 a 6 da busca), ou None"""
+    spec = TOOLS[name]
+    for executable in spec['names']:
+        path = shutil.which(executable)
+        if path:
+            return os.path.abspath(path)
+
+    for pattern in spec['locations']:
+        # Versão mais nova primeiro (gmsh-4.14.0 antes de gmsh-4.11.1)
+        for path in sorted(glob.glob(os.path.expanduser(pattern)), reverse=True):
+            if _is_executable(path):
+                return os.path.abspath(path)
+
+    if deep:
+        from find_executables import search_common_locations
+        names = {n.lower() for n in spec['names']} | {n.lower() + '.exe' for n in spec['names']}
+        for path in search_common_locations(spec['search']):
+            if os.path.basename(path).lower() in names:
+                return os.path.abspath(path)
+    return None
+
+
+def describe(name, path):
+    """Entrada do registro para um executável (executa-o uma vez para a versão)"""
+    size, mtime_ns = _signature(path)
+    return {'path': os.path.abspath(path), 'version': probe_version(path, TOOLS[name]['version_args']),
+            'size': size, 'mtime_ns': mtime_ns, 'checked': time.time()}
+
+
+# ============================================================================
+# CONSULTA
+# ============================================================================
+
+def tool_info(name, preferred=None, refresh=False, deep=False, path=REGISTRY_FILE):
+    """
+    Entrada do registro de uma ferramenta, descobrindo-a se necessário
+
+    Args:
+        name: 'gmsh', 'su2' ou 'mpirun'
+        preferred: caminho configurado no script (usado se existir)
+        refresh: ignora o cache e redescobre
+        deep: permite a varredura lenta de diretórios
+
+    Returns:
+        dict com path, version, size, mtime_ns e checked; None se não encontrada
+    """
+    if name not in TOOLS:
+        raise KeyError(f"Ferramenta desconhecida: {name} (disponíveis: {', '.join(TOOLS)})")
+
+    override = os.environ.get(TOOLS[name]['env'])
+    if not override and preferred and os.path.isfile(preferred):
+        override = preferred
+    if override:
+        override = os.path.abspath(override)
+
+    registry = load_registry(path)
+    host = registry.setdefault(socket.gethostname(), {})
+    entry = host.get(name)
+    if (not refresh and entry and is_valid(entry)
+            and (override is None or entry['path'] == override)):
+        return entry
+
+    found = override or discover(name, deep)
+    if found is None:
+        if entry is not None:
+            del host[name]
+            save_registry(registry, path)
+        return None
+
+    entry = describe(name, found)
+    host[name] = entry
+    save_registry(registry, path)
+    return entry
+
+
+def find_tool(name, preferred=None, refresh=False, deep=False):
+    """Caminho do executável de uma ferramenta (ver tool_info), ou None"""
+    entry = tool_info(name, preferred, refresh, deep)
+    return entry['path'] if entry else None
+
+
+def set_tool(name, tool_path, path=REGISTRY_FILE):
+    """Registra manualmente o caminho de uma ferramenta nesta máquina"""
+    if name not in TOOLS:
+        raise KeyError(f"Ferramenta desconhecida: {name} (disponíveis: {', '.join(TOOLS)})")
+    if not os.path.isfile(tool_path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {tool_path}")
+    registry = load_registry(path)
+    entry = describe(name, tool_path)
+    registry.setdefault(socket.gethostname(), {})[name] = entry
+    save_registry(registry, path)
+    return entry
+
+
+def discover_all(refresh=False, deep=False):
+    """tool_info de todas as ferramentas: dict nome -> entrada (ou None)"""
+    return {name: tool_info(name, refresh=refresh, deep=deep) for name in TOOLS}
+
+
+def print_tools(tools):
+    for name, entry in tools.items():
+        if entry:
+            print(f"  ✓ {name:<7} {entry['version'] or '?':<10} {entry['path']}")
+        else:
+            print(f"  ✗ {name:<7} {'-':<10} não encontrado")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if args and args[0] == 'set':
+        if len(args) != 3:
+            print(__doc__)
+            return
+        entry = set_tool(args[1], args[2])
+        print(f"✓ {args[1]} registrado: {entry['path']} (versão {entry['version'] or '?'})")
+        return
+
+    start = time.perf_counter()
+    tools = discover_all(refresh='--refresh' in sys.argv, deep='--deep' in sys.argv)
+    elapsed = time.perf_counter() - start
+    print(f"Registro: {REGISTRY_FILE}  (máquina: {socket.gethostname()}, {elapsed * 1000:.0f} ms)")
+    print_tools(tools)
+
+
+if __name__ == "__main__":
+    main()
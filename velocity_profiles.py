@@ -0,0 +1,206 @@
+"""
+Extração em lote de perfis de velocidade em várias estações x para todos os casos
+Autor: Script automatizado
+Data: 2025
+
+Usa o layout estruturado (i, j) recuperado por structured_grid: cada estação
+é interpolada entre as duas linhas i vizinhas e, ao longo de cada linha, nos
+valores de y pedidos. Todas as estações e alturas de um caso são calculadas
+em uma única passagem vetorizada.
+
+Os casos podem vir dos arquivos flow_*.vtu ou dos restart_flow_*.dat
+(restart_reader), que dispensam a escrita do VTU durante as varreduras.
+
+Resultado: array 4D [caso, estação, y, campo]
+"""
+
+import os
+
+import numpy as np
+from structured_grid import structured_from_dataframe
+
+# Campos padrão extraídos dos arquivos flow_*.vtu
+DEFAULT_FIELDS = ('Velocity[0]', 'Velocity[1]', 'Pressure')
+
+
+def _interp_rows(y_rows, v_rows, y_targets):
+    """
+    Interpolação linear linha a linha, vetorizada para várias linhas de uma vez
+
+    Cada linha é deslocada por um offset para que todas fiquem em um único
+    vetor crescente; assim um só searchsorted localiza todos os alvos.
+
+    Args:
+        y_rows: matriz [linha, j] com as coordenadas (crescentes em cada linha)
+        v_rows: matriz [linha, j, campo] com os valores
+        y_targets: matriz [linha, k] com os y desejados
+
+    Returns:
+        matriz [linha, k, campo]; NaN para alvos fora do intervalo da linha
+    """
+    n_rows, n_j = y_rows.shape
+    y_min = y_rows[:, :1]
+    y_max = y_rows[:, -1:]
+
+    span = float(np.max(y_max - y_min)) + 1.0
+    offset = (np.arange(n_rows) * span)[:, None]
+
+    flat = (y_rows - y_min + offset).ravel()
+    targets = y_targets - y_min + offset
+
+    pos = np.searchsorted(flat, targets.ravel(), side='right').reshape(targets.shape)
+    row_start = (np.arange(n_rows) * n_j)[:, None]
+    local = np.clip(pos - row_start - 1, 0, n_j - 2)
+    left = row_start + local
+
+    y_left = flat[left]
+    y_right = flat[left + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = np.where(y_right > y_left, (targets - y_left) / (y_right - y_left), 0.0)
+
+    v_flat = v_rows.reshape(n_rows * n_j, -1)
+    result = (1.0 - w)[..., None] * v_flat[left] + w[..., None] * v_flat[left + 1]
+
+    outside = (y_targets < y_min) | (y_targets > y_max)
+    result[outside] = np.nan
+    return result
+
+
+def extract_profiles_structured(grid, x_stations, y_values):
+    """
+    Extrai perfis de um caso já estruturado em todas as estações de uma vez
+
+    Args:
+        grid: dict retornado por structured_grid.structured_from_dataframe
+        x_stations: array [estação] com as posições x
+        y_values: array [y] (mesma distribuição em todas as estações) ou
+                  matriz [estação, y] (distribuição própria por estação)
+
+    Returns:
+        array [estação, y, campo]; NaN fora do domínio do caso
+    """
+    x_stations = np.asarray(x_stations, dtype=float)
+    y_values = np.broadcast_to(np.asarray(y_values, dtype=float),
+                               (len(x_stations), np.shape(y_values)[-1]))
+
+    X, Y, F = grid['X'], grid['Y'], grid['fields']
+    x_lines = X[:, 0]
+    n_i = len(x_lines)
+
+    # Linhas i vizinhas de cada estação e peso da interpolação em x
+    i_left = np.clip(np.searchsorted(x_lines, x_stations, side='right') - 1, 0, n_i - 2)
+    x0 = x_lines[i_left]
+    x1 = x_lines[i_left + 1]
+    wx = np.where(x1 > x0, (x_stations - x0) / (x1 - x0), 0.0)
+
+    # Interpola as duas linhas vizinhas de todas as estações de uma vez
+    lines = np.concatenate((i_left, i_left + 1))
+    targets = np.concatenate((y_values, y_values))
+    on_lines = _interp_rows(Y[lines], F[lines], targets)
+
+    n_s = len(x_stations)
+    profiles = ((1.0 - wx)[:, None, None] * on_lines[:n_s]
+                + wx[:, None, None] * on_lines[n_s:])
+
+    outside = (x_stations < x_lines[0]) | (x_stations > x_lines[-1])
+    profiles[outside] = np.nan
+    return profiles
+
+
+def load_solution(filename, columns=None):
+    """DataFrame de um caso a partir do flow_*.vtu ou do restart_flow_*.dat"""
+    from read_vtu import read_vtu
+    from restart_reader import read_restart, restart_to_dataframe
+
+    if os.path.basename(filename).startswith('restart'):
+        return restart_to_dataframe(read_restart(filename), columns)
+    return read_vtu(filename, columns)
+
+
+def extract_profiles(vtu_files, x_stations, y_values, fields=DEFAULT_FIELDS, u_inf=None):
+    """
+    Extrai perfis em várias estações para vários casos
+
+    Args:
+        vtu_files: lista de arquivos flow_*.vtu ou restart_flow_*.dat (um por caso)
+        x_stations: posições x das estações
+        y_values: distribuição normal à parede, [y] ou [estação, y]
+        fields: colunas do read_vtu a extrair
+        u_inf: se informado, campos 'Velocity[...]' são divididos por u_inf
+
+    Returns:
+        profiles: array 4D [caso, estação, y, campo]
+        fields: lista com os nomes dos campos (última dimensão)
+    """
+    fields = list(fields)
+    x_stations = np.asarray(x_stations, dtype=float)
+    n_y = np.shape(y_values)[-1]
+
+    profiles = np.empty((len(vtu_files), len(x_stations), n_y, len(fields)))
+
+    for c, vtu_file in enumerate(vtu_files):
+        df = load_solution(vtu_file, fields)
+        grid = structured_from_dataframe(df, columns=fields)
+        profiles[c] = extract_profiles_structured(grid, x_stations, y_values)
+
+    if u_inf is not None:
+        velocity = [k for k, name in enumerate(fields) if name.startswith('Velocity')]
+        profiles[..., velocity] /= u_inf
+
+    return profiles, fields
+
+
+def main():
+    """Função principal - perfis u/U_inf em estações ao longo da placa"""
+    import matplotlib.pyplot as plt
+
+    print("\n" + "=" * 70)
+    print(" " * 15 + "PERFIS DE VELOCIDADE - TODOS OS CASOS")
+    print("=" * 70 + "\n")
+
+    from artifact_store import find_artifacts
+
+    # Inclui os arquivados pelo artifact_store (.aedz)
+    vtu_files = find_artifacts('flow_d*.vtu')
+    if not vtu_files:
+        vtu_files = find_artifacts('restart_flow_d*.dat')
+    if not vtu_files:
+        print("✗ Nenhum arquivo flow_d*.vtu ou restart_flow_d*.dat encontrado!")
+        return
+
+    print(f"✓ Arquivos encontrados: {len(vtu_files)}")
+
+    x_stations = np.array([0.05, 0.10, 0.15, 0.20, 0.25, 0.30])
+    y_values = np.linspace(0.0, 0.005, 60)
+
+    profiles, fields = extract_profiles(vtu_files, x_stations, y_values,
+                                        fields=('Velocity[0]',))
+
+    # Normaliza cada perfil pela velocidade no topo da distribuição
+    u = profiles[..., 0]
+    u_norm = u / u[:, :, -1:]
+
+    labels = [os.path.basename(f).replace('restart_', '').replace('flow_', '')
+              .replace('.vtu', '').replace('.dat', '') for f in vtu_files]
+
+    fig, axes = plt.subplots(1, len(x_stations), figsize=(3 * len(x_stations), 5), sharey=True)
+    for s, ax in enumerate(np.atleast_1d(axes)):
+        for c, label in enumerate(labels):
+            ax.plot(u_norm[c, s], y_values * 1000, linewidth=1.5, label=label)
+        ax.set_title(f'x = {x_stations[s]:.2f} m')
+        ax.set_xlabel('u/U∞')
+        ax.grid(True, alpha=0.3)
+    np.atleast_1d(axes)[0].set_ylabel('y (mm)')
+    np.atleast_1d(axes)[-1].legend(fontsize=7)
+
+    plt.tight_layout()
+    output_plot = 'velocity_profiles.png'
+    plt.savefig(output_plot, dpi=150, bbox_inches='tight')
+    plt.close('all')
+    print(f"✓ Gráfico salvo em: {output_plot}")
+
+    return profiles, fields
+
+
+if __name__ == "__main__":
+    main()
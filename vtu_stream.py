@@ -0,0 +1,249 @@
+"""
+Reduções em blocos sobre VTU grandes (memória limitada)
+Autor: Script automatizado
+Data: 2025
+
+Para malhas de produção (milhões de nós) não dá para carregar 20 casos
+inteiros em DataFrames. Aqui cada caso é percorrido em blocos de pontos
+(VTUDataset.iter_chunks, lendo do trecho appended binário ou do .aedz) e
+as reduções são acumuladas bloco a bloco:
+
+- ColumnStats: contagem, mínimo, máximo, média e desvio padrão por coluna
+- Histogram: contagens em intervalos fixos
+- Probes: valores no nó mais próximo de cada ponto de sonda
+
+A memória usada é a de um bloco (chunk_size pontos × colunas pedidas),
+independente do tamanho da malha.
+
+Uso:
+    python vtu_stream.py flow_d016_H03.vtu [--columns Pressure,Mach]
+                         [--chunk 1000000] [--probe -0.01,0.0] [--hist Mach:20]
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from read_vtu import CHUNK_POINTS, open_vtu
+
+
+# ============================================================================
+# REDUTORES
+# ============================================================================
+
+class ColumnStats:
+    """
+    Contagem, mínimo, máximo, média e desvio padrão de colunas em blocos
+
+    Média e variância são combinadas bloco a bloco (Chan et al.), sem
+    somar quadrados grandes: o resultado é igual ao do DataFrame inteiro.
+    """
+
+    __slots__ = ('columns', 'count', 'minimum', 'maximum', 'mean', '_m2')
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        n = len(self.columns)
+        self.count = 0
+        self.minimum = np.full(n, np.inf)
+        self.maximum = np.full(n, -np.inf)
+        self.mean = np.zeros(n)
+        self._m2 = np.zeros(n)
+
+    def update(self, block):
+        values = block[self.columns].to_numpy(dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self._m2 = self._m2 + m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+
+    def result(self):
+        """DataFrame com uma linha por coluna (count, min, max, mean, std)"""
+        std = np.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else np.full(len(self.columns), np.nan)
+        return pd.DataFrame({'count': self.count, 'min': self.minimum, 'max': self.maximum,
+                             'mean': self.mean, 'std': std}, index=self.columns)
+
+
+class Histogram:
+    """Histograma de uma coluna com intervalos fixos (valores fora são contados à parte)"""
+
+    __slots__ = ('columns', 'edges', 'counts', 'below', 'above')
+
+    def __init__(self, column, edges):
+        self.columns = [column]
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.below = 0
+        self.above = 0
+
+    def update(self, block):
+        values = block[self.columns[0]].to_numpy(dtype=np.float64)
+        self.counts += np.histogram(values, bins=self.edges)[0]
+        self.below += int(np.count_nonzero(values < self.edges[0]))
+        self.above += int(np.count_nonzero(values > self.edges[-1]))
+
+    def result(self):
+        """(counts, edges) como no np.histogram"""
+        return self.counts, self.edges
+
+
+class Probes:
+    """
+    Valores no nó mais próximo de cada ponto de sonda (x, y)
+
+    Cada bloco é indexado por uma cKDTree própria; para cada sonda fica o
+    nó mais próximo visto até agora. Como find_nearest_point do
+    compare_pressure.py, sondas sem nó dentro de `tolerance` ficam NaN.
+    """
+
+    __slots__ = ('columns', 'points', 'tolerance', 'distance', 'node', 'values')
+
+    def __init__(self, points, columns, tolerance=None):
+        self.points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        self.columns = list(dict.fromkeys(['X', 'Y'] + list(columns)))
+        self.tolerance = tolerance
+        self.distance = np.full(len(self.points), np.inf)
+        self.node = np.full(len(self.points), -1, dtype=np.int64)
+        self.values = np.full((len(self.points), len(self.columns)), np.nan)
+
+    def update(self, block):
+        from scipy.spatial import cKDTree
+
+        if len(block) == 0:
+            return
+        distance, nearest = cKDTree(block[['X', 'Y']].to_numpy()).query(self.points)
+        closer = distance < self.distance
+        if not closer.any():
+            return
+        self.distance[closer] = distance[closer]
+        self.node[closer] = block.index.to_numpy()[nearest[closer]]
+        self.values[closer] = block[self.columns].to_numpy(dtype=np.float64)[nearest[closer]]
+
+    def result(self):
+        """DataFrame com a sonda (x, y), nó, distância e as colunas no nó"""
+        values = self.values.copy()
+        if self.tolerance is not None:
+            values[self.distance > self.tolerance] = np.nan
+        df = pd.DataFrame(values, columns=self.columns)
+        df.insert(0, 'distance', self.distance)
+        df.insert(0, 'node', self.node)
+        df.insert(0, 'y', self.points[:, 1])
+        df.insert(0, 'x', self.points[:, 0])
+        return df
+
+
+# ============================================================================
+# PERCURSO DOS BLOCOS
+# ============================================================================
+
+def reduce_vtu(filename, reducers, chunk_size=CHUNK_POINTS, dtype=np.float64):
+    """
+    Percorre um VTU uma única vez em blocos, alimentando os redutores
+
+    Args:
+        filename: flow_*.vtu (ou .aedz)
+        reducers: ColumnStats, Histogram, Probes (ou qualquer objeto com
+                  columns, update(bloco) e result())
+        chunk_size: pontos por bloco
+
+    Returns:
+        lista com o result() de cada redutor
+    """
+    columns = list(dict.fromkeys(c for reducer in reducers for c in reducer.columns))
+    with open_vtu(filename, dtype) as ds:
+        for block in ds.iter_chunks(columns, chunk_size):
+            for reducer in reducers:
+                reducer.update(block)
+    return [reducer.result() for reducer in reducers]
+
+
+def column_stats(filename, columns, chunk_size=CHUNK_POINTS):
+    """Estatísticas (count, min, max, mean, std) das colunas, em blocos"""
+    return reduce_vtu(filename, [ColumnStats(columns)], chunk_size)[0]
+
+
+def histogram(filename, column, bins=50, range=None, chunk_size=CHUNK_POINTS):
+    """
+    Histograma de uma coluna em blocos
+
+    Sem `range`, uma primeira passada (só desta coluna) acha mínimo e máximo.
+    """
+    if range is None:
+        stats = column_stats(filename, [column], chunk_size)
+        range = (stats.loc[column, 'min'], stats.loc[column, 'max'])
+    edges = np.linspace(range[0], range[1], bins + 1)
+    return reduce_vtu(filename, [Histogram(column, edges)], chunk_size)[0]
+
+
+def probe(filename, points, columns, tolerance=None, chunk_size=CHUNK_POINTS):
+    """Valores das colunas no nó mais próximo de cada ponto (x, y), em blocos"""
+    return reduce_vtu(filename, [Probes(points, columns, tolerance)], chunk_size)[0]
+
+
+# ============================================================================
+# LINHA DE COMANDO
+# ============================================================================
+
+def _option(name, default=None):
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+def main():
+    options = {'--columns', '--chunk', '--probe', '--hist'}
+    args = [a for k, a in enumerate(sys.argv[1:], 1)
+            if a not in options and sys.argv[k - 1] not in options]
+    if not args:
+        print(__doc__)
+        return
+
+    filename = args[0]
+    chunk_size = int(_option('--chunk', CHUNK_POINTS))
+    columns = _option('--columns')
+    with open_vtu(filename) as ds:
+        n_points = len(ds)
+        if columns:
+            columns = columns.split(',')
+        else:
+            columns = [c for c in ('Pressure', 'Mach', 'Velocity', 'Temperature') if c in ds.arrays]
+        # Nomes de vetores do SU2 ('Velocity') viram as componentes
+        columns = ds.resolve(columns)
+
+    reducers = [ColumnStats(columns)]
+    if _option('--probe'):
+        x, y = (float(v) for v in _option('--probe').split(','))
+        reducers.append(Probes([(x, y)], columns))
+
+    n_blocks = -(-n_points // chunk_size)
+    print(f"Lendo {filename}: {n_points} pontos em {n_blocks} bloco(s) de até {chunk_size}")
+    results = reduce_vtu(filename, reducers, chunk_size)
+
+    print("\nEstatísticas:")
+    print(results[0].to_string(float_format=lambda v: f"{v:.6g}"))
+    if len(results) > 1:
+        print("\nSonda (nó mais próximo):")
+        print(results[1].to_string(index=False, float_format=lambda v: f"{v:.6g}"))
+
+    if _option('--hist'):
+        column, _, bins = _option('--hist').partition(':')
+        counts, edges = histogram(filename, column, int(bins or 20), chunk_size=chunk_size)
+        print(f"\nHistograma de {column}:")
+        scale = 50 / max(counts.max(), 1)
+        for k, count in enumerate(counts):
+            print(f"  [{edges[k]:12.6g}, {edges[k + 1]:12.6g}) {count:10d} "
+                  f"{'#' * int(round(count * scale))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""
+Fila de casos em sistema de arquivos compartilhado (vários computadores)
+Autor: Script automatizado
+Data: 2025
+
+Uma varredura é publicada como um diretório de "tickets" (um .json por
+caso). Qualquer número de workers, em qualquer máquina que enxergue o
+mesmo diretório, retira casos da fila sem servidor central:
+
+    fila/
+      pending/   tickets esperando ([prioridade]_[caso].json)
+      running/   tickets em execução; o mtime é o heartbeat do worker
+      done/      tickets concluídos, com o resultado
+      failed/    tickets que excederam o número máximo de tentativas
+
+- Reserva: os.rename de pending/ para running/ é atômico; só um worker
+  consegue mover cada ticket.
+- Heartbeat: o worker atualiza o mtime do ticket em running/ a cada
+  lease/3 segundos.
+- Recuperação: um ticket em running/ sem heartbeat há mais de 'lease'
+  segundos (worker morto, máquina reiniciada) volta para pending/ com a
+  tentativa contada, ou vai para failed/ ao atingir max_attempts. O
+  tempo de referência é o do servidor de arquivos (mtime de um arquivo
+  tocado na hora), então relógios diferentes entre máquinas não importam.
+- Conclusão e recuperação primeiro renomeiam o ticket para um nome
+  privado do worker (running/X.json.<host>.<pid>.commit ou .reclaim);
+  só quem vence esse rename atualiza e move o ticket, então um worker
+  lento e o que recupera o seu ticket nunca o processam ao mesmo tempo.
+
+Uso:
+    python work_queue.py publish <diretório_das_malhas> <fila>
+    python work_queue.py worker <fila>
+    python work_queue.py status <fila>
+    python work_queue.py demo [n_workers]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import importlib
+import threading
+
+DEFAULT_FUNCTION = "run_su2_batch:process_single_mesh"
+LEASE_SECONDS = 120.0
+MAX_ATTEMPTS = 3
+POLL_INTERVAL = 1.0
+
+STATES = ('pending', 'running', 'done', 'failed')
+
+
+# ============================================================================
+# ARQUIVOS DA FILA
+# ============================================================================
+
+def _write_atomic(path, data):
+    """Grava um JSON de forma atômica (arquivo temporário + rename)"""
+    tmp = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _tickets(queue_dir, state):
+    try:
+        names = os.listdir(os.path.join(queue_dir, state))
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names if name.endswith('.json'))
+
+
+PRIVATE_SUFFIXES = ('.commit', '.reclaim')
+
+
+def _private_path(path, action):
+    """Nome privado deste worker para um ticket em running/ ('commit' ou 'reclaim')"""
+    return f"{path}.{socket.gethostname()}.{os.getpid()}.{action}"
+
+
+def _running_files(queue_dir):
+    """Tickets em running/, incluindo os que estão com nome privado de algum worker"""
+    try:
+        names = os.listdir(os.path.join(queue_dir, 'running'))
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names if name.endswith(('.json',) + PRIVATE_SUFFIXES))
+
+
+def server_time(queue_dir):
+    """Hora atual segundo o sistema de arquivos da fila (mtime de um arquivo tocado agora)"""
+    clock = os.path.join(queue_dir, f".clock.{socket.gethostname()}.{os.getpid()}")
+    with open(clock, 'a'):
+        pass
+    os.utime(clock, None)
+    return os.stat(clock).st_mtime
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ============================================================================
+# PUBLICAÇÃO, RESERVA E CONCLUSÃO
+# ============================================================================
+
+def publish(queue_dir, tasks, case_ids, function=DEFAULT_FUNCTION, max_attempts=MAX_ATTEMPTS):
+    """
+    Publica os casos como tickets em pending/
+
+    A ordem de 'tasks' é a prioridade (o primeiro é reservado primeiro).
+    Casos já presentes na fila (em qualquer estado) não são republicados.
+
+    Args:
+        tasks: argumentos de cada caso (listas/tuplas serializáveis em JSON)
+        case_ids: identificador de cada caso
+        function: "módulo:função" executada pelos workers
+
+    Returns:
+        número de tickets novos
+    """
+    for state in STATES:
+        os.makedirs(os.path.join(queue_dir, state), exist_ok=True)
+
+    existing = {name.split('_', 1)[1][:-5] for state in STATES for name in _tickets(queue_dir, state)}
+    width = max(4, len(str(len(tasks))))
+    published = 0
+
+    for priority, (task, case_id) in enumerate(zip(tasks, case_ids)):
+        if case_id in existing:
+            continue
+        ticket = {
+            'case_id': case_id,
+            'function': function,
+            'args': list(task),
+            'attempts': 0,
+            'max_attempts': max_attempts,
+            'published': time.time(),
+        }
+        name = f"{priority:0{width}d}_{case_id}.json"
+        _write_atomic(os.path.join(queue_dir, 'pending', name), ticket)
+        published += 1
+
+    return published
+
+
+def claim(queue_dir):
+    """
+    Reserva o próximo ticket (menor prioridade numérica)
+
+    Returns:
+        nome do ticket (em running/) ou None se a fila estiver vazia
+    """
+    for name in _tickets(queue_dir, 'pending'):
+        source = os.path.join(queue_dir, 'pending', name)
+        target = os.path.join(queue_dir, 'running', name)
+        try:
+            # O rename preserva o mtime: toca antes para o lease não nascer expirado
+            os.utime(source, None)
+            os.rename(source, target)
+        except (FileNotFoundError, PermissionError):
+            continue  # outro worker reservou antes
+        return name
+    return None
+
+
+def complete(queue_dir, name, result, success):
+    """
+    Move o ticket de running/ para done/ (ou de volta para a fila em caso de falha)
+
+    O ticket é primeiro renomeado para um nome privado deste worker; se
+    reclaim_expired já o tiver levado (ou renomear ao mesmo tempo), só um
+    dos dois vence o rename e o outro desiste.
+
+    Returns:
+        False se o lease foi perdido (ticket recuperado por outro worker)
+    """
+    running = os.path.join(queue_dir, 'running', name)
+    commit = _private_path(running, 'commit')
+    try:
+        os.rename(running, commit)
+        # O rename preserva o mtime: toca para o nome privado não parecer órfão
+        os.utime(commit, None)
+    except FileNotFoundError:
+        return False
+
+    ticket = _read(commit)
+    ticket['attempts'] += 1
+    ticket['worker'] = worker_name()
+    ticket['result'] = result
+    ticket['finished'] = time.time()
+
+    if success:
+        state = 'done'
+    elif ticket['attempts'] < ticket['max_attempts']:
+        state = 'pending'
+    else:
+        state = 'failed'
+
+    # Atualiza o conteúdo sob o nome privado e só então move (o rename é o ponto de commit)
+    _write_atomic(commit, ticket)
+    os.rename(commit, os.path.join(queue_dir, state, name))
+    return True
+
+
+def reclaim_expired(queue_dir, lease=LEASE_SECONDS):
+    """
+    Recupera os tickets sem heartbeat há mais de 'lease' segundos
+
+    A execução interrompida conta como tentativa: o ticket volta para
+    pending/ ou, ao atingir max_attempts, vai para failed/. Nomes privados
+    abandonados (worker morto no meio da conclusão ou da recuperação)
+    também são recuperados.
+
+    Returns:
+        lista de (nome do ticket, estado de destino)
+    """
+    now = server_time(queue_dir)
+    reclaimed = []
+    for filename in _running_files(queue_dir):
+        path = os.path.join(queue_dir, 'running', filename)
+        try:
+            age = now - os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        if age <= lease:
+            continue
+
+        name = filename[:filename.index('.json') + len('.json')]
+        private = _private_path(os.path.join(queue_dir, 'running', name), 'reclaim')
+        try:
+            os.rename(path, private)
+        except FileNotFoundError:
+            continue  # concluído ou recuperado por outro worker
+
+        ticket = _read(private)
+        ticket['attempts'] += 1
+        if ticket['attempts'] < ticket['max_attempts']:
+            state = 'pending'
+        else:
+            state = 'failed'
+            ticket['result'] = {'success': False,
+                                'message': f"Lease expirado em {ticket['attempts']} tentativas"}
+            ticket['finished'] = time.time()
+
+        _write_atomic(private, ticket)
+        os.rename(private, os.path.join(queue_dir, state, name))
+        reclaimed.append((name, state))
+    return reclaimed
+
+
+class Heartbeat:
+    """Atualiza o mtime do ticket em running/ enquanto o caso executa"""
+
+    __slots__ = ('path', 'interval', 'lost', '_stop', '_thread')
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                os.utime(self.path, None)
+            except FileNotFoundError:
+                self.lost = True
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def _resolve(function):
+    module_name, func_name = function.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def worker_loop(queue_dir, lease=LEASE_SECONDS, poll_interval=POLL_INTERVAL, wait=True, log=print):
+    """
+    Retira e executa casos até a fila esvaziar
+
+    Args:
+        lease: segundos sem heartbeat após os quais um ticket é recuperado
+        wait: se True, espera enquanto houver tickets em running/ de outros
+              workers (podem voltar para a fila se o worker morrer)
+
+    Returns:
+        número de casos executados por este worker
+    """
+    me = worker_name()
+    executed = 0
+
+    while True:
+        for name, state in reclaim_expired(queue_dir, lease):
+            if state == 'pending':
+                log(f"[{me}] ⚠ Lease expirado, ticket devolvido à fila: {name}")
+            else:
+                log(f"[{me}] ✗ Lease expirado, tentativas esgotadas: {name}")
+
+        name = claim(queue_dir)
+        if name is None:
+            if wait and _running_files(queue_dir):
+                time.sleep(poll_interval)
+                continue
+            return executed
+
+        path = os.path.join(queue_dir, 'running', name)
+        ticket = _read(path)
+        log(f"[{me}] Executando {ticket['case_id']} (tentativa {ticket['attempts'] + 1})")
+
+        with Heartbeat(path, lease / 3.0) as heartbeat:
+            try:
+                result = _resolve(ticket['function'])(tuple(ticket['args']))
+                success = bool(result.get('success', True)) if isinstance(result, dict) else True
+            except Exception as e:
+                result = {'success': False, 'message': f"Exceção: {e}"}
+                success = False
+
+        executed += 1
+        if heartbeat.lost or not complete(queue_dir, name, result, success):
+            log(f"[{me}] ⚠ Lease perdido para {ticket['case_id']}: resultado descartado")
+        else:
+            log(f"[{me}] {'✓' if success else '✗'} {ticket['case_id']}")
+
+
+def queue_status(queue_dir):
+    """Número de tickets em cada estado"""
+    return {state: len(_tickets(queue_dir, state)) for state in STATES}
+
+
+def collect_results(queue_dir):
+    """Resultados dos tickets concluídos e falhos (lista de dicts)"""
+    results = []
+    for state in ('done', 'failed'):
+        for name in _tickets(queue_dir, state):
+            ticket = _read(os.path.join(queue_dir, state, name))
+            results.append({'case_id': ticket['case_id'], 'state': state,
+                            'attempts': ticket['attempts'], 'worker': ticket.get('worker'),
+                            'result': ticket.get('result')})
+    return results
+
+
+# ============================================================================
+# DEMONSTRAÇÃO LOCAL
+# ============================================================================
+
+def _demo_task(args):
+    """Caso de demonstração: espera alguns décimos de segundo"""
+    case_id, seconds = args
+    time.sleep(seconds)
+    return {'success': True, 'case_id': case_id, 'time': seconds}
+
+
+def _demo_worker(queue_dir, lease, die_after_claim):
+    """Worker da demonstração; o primeiro morre depois de reservar um caso"""
+    if die_after_claim:
+        name = claim(queue_dir)
+        if name is not None:
+            print(f"[{worker_name()}] Reservou {name} e vai morrer sem concluir")
+        os._exit(1)
+    worker_loop(queue_dir, lease=lease, poll_interval=0.1)
+
+
+def demo(n_workers=4, n_cases=20, lease=1.5):
+    """
+    Drena uma fila local com vários processos worker
+
+    Um dos workers morre logo após reservar um caso; o ticket fica sem
+    heartbeat, é recuperado após o lease e executado por outro worker.
+    """
+    import tempfile
+    from multiprocessing import Process
+
+    with tempfile.TemporaryDirectory() as queue_dir:
+        tasks = [(f"caso{k:02d}", 0.1 + 0.05 * (k % 4)) for k in range(n_cases)]
+        publish(queue_dir, tasks, [t[0] for t in tasks], function="work_queue:_demo_task")
+        print(f"✓ {n_cases} tickets publicados em {queue_dir}")
+
+        start = time.time()
+        workers = [Process(target=_demo_worker, args=(queue_dir, lease, k == 0))
+                   for k in range(n_workers)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.time() - start
+
+        status = queue_status(queue_dir)
+        results = collect_results(queue_dir)
+        per_worker = {}
+        for r in results:
+            per_worker[r['worker']] = per_worker.get(r['worker'], 0) + 1
+
+        print(f"\nEstado final: {status}  ({elapsed:.1f}s)")
+        for worker, count in sorted(per_worker.items()):
+            print(f"  {worker}: {count} casos")
+        ok = status['done'] == n_cases and status['pending'] == status['running'] == 0
+        print("✓ Todos os casos concluídos exatamente uma vez" if ok else "✗ Fila incompleta")
+        return ok
+
+
+def main():
+    """Linha de comando: publish / worker / status / demo"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ('publish', 'worker', 'status', 'demo'):
+        print(__doc__)
+        return
+
+    command = sys.argv[1]
+
+    if command == 'demo':
+        demo(int(sys.argv[2]) if len(sys.argv) > 2 else 4)
+
+    elif command == 'publish':
+        if len(sys.argv) < 4:
+            print("Uso: python work_queue.py publish <diretório_das_malhas> <fila>")
+            return
+        from run_su2_batch import get_mesh_files, order_by_cost
+        from mesh_quality import preflight_all
+        work_dir, queue_dir = sys.argv[2], sys.argv[3]
+        mesh_files, _ = order_by_cost(get_mesh_files(work_dir))
+        mesh_files, _ = preflight_all(mesh_files)
+        tasks = [(os.path.abspath(m), os.path.abspath(work_dir)) for m in mesh_files]
+        ids = [os.path.basename(m).replace('mesh_', '').replace('.su2', '') for m in mesh_files]
+        n = publish(queue_dir, tasks, ids)
+        print(f"✓ {n} tickets novos em {queue_dir} ({len(mesh_files) - n} já estavam na fila)")
+
+    elif command == 'worker':
+        queue_dir = sys.argv[2]
+        n = worker_loop(queue_dir)
+        print(f"✓ Worker {worker_name()} encerrado: {n} casos executados")
+
+    elif command == 'status':
+        queue_dir = sys.argv[2]
+        print(queue_status(queue_dir))
+        for r in collect_results(queue_dir):
+            result = r['result'] or {}
+            print(f"  {'✓' if r['state'] == 'done' else '✗'} {r['case_id']:<20} "
+                  f"{r['worker'] or '-':<24} {result.get('message', '')}")
+
+
+if __name__ == "__main__":
+    main()